@@ -0,0 +1,267 @@
+"""Async variant of the read API, mounted at /api/v2.
+
+Same endpoints and responses as /api/v1, but every handler is a
+coroutine on the async engine (app.database.AsyncSessionLocal) and page
+scrapes use AsyncLinkedInScraper, so slow scrapes wait on the event loop
+instead of occupying FastAPI's threadpool. Bulk jobs stay on /api/v1.
+"""
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.services.access_tracker import record_access
+from app.scrapers.circuit_breaker import CircuitOpenError
+from app.scrapers.linkedin_scraper import ScrapeError
+
+from app.services.page_service import AsyncPageService
+from app.services.post_service import AsyncPostService
+from app.services.user_service import AsyncUserService
+
+from app.api.dependencies import (
+    get_async_page_service,
+    get_async_post_service,
+    get_async_user_service
+)
+from app.api.endpoints import circuit_open, page_details, page_summary, scrape_failed, search_hit
+
+router = APIRouter()
+
+# PAGE – GET OR SCRAPE (CORE FEATURE)
+
+
+@router.get("/pages/{page_id}")
+async def get_page_details(
+    page_id: str,
+    refresh: bool = False,
+    page_service: AsyncPageService = Depends(get_async_page_service)
+):
+    await asyncio.to_thread(record_access, page_id)
+    try:
+        page = await page_service.get_or_scrape_page(page_id, force_refresh=refresh, allow_stale=True)
+    except CircuitOpenError as e:
+        raise circuit_open(e)
+    except ScrapeError as e:
+        raise scrape_failed(e)
+
+    if not page:
+        raise HTTPException(status_code=404, detail="Page not found")
+
+    return page_details(page)
+
+# PAGE – SEARCH & LIST
+
+@router.get("/pages")
+async def search_pages(
+    q: Optional[str] = Query(None, description='Full-text query: words, "phrases", prefix*'),
+    name: Optional[str] = None,
+    industry: Optional[str] = None,
+    min_followers: Optional[int] = None,
+    max_followers: Optional[int] = None,
+    speciality: Optional[str] = Query(None, description="Speciality starting with this text, case-insensitive"),
+    location: Optional[str] = Query(None, description="Location starting with this text, case-insensitive"),
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    sort: Optional[str] = Query(None, regex="^(followers|name|updated_at)$",
+                                description="Keyset pagination order; use next_cursor for the next page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous response"),
+    count: str = Query("exact", regex="^(exact|estimated|cached|none)$"),
+    page_service: AsyncPageService = Depends(get_async_page_service)
+):
+    filters = {
+        "q": q,
+        "name": name,
+        "industry": industry,
+        "min_followers": min_followers,
+        "max_followers": max_followers,
+        "speciality": speciality,
+        "location": location
+    }
+
+    if sort or cursor:
+        try:
+            pages, next_cursor, total = await page_service.search_pages_keyset(filters, sort, cursor, limit, count)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {
+            "limit": limit,
+            "total": total,
+            "next_cursor": next_cursor,
+            "pages": [page_summary(p) for p in pages]
+        }
+
+    pages, total = await page_service.search_pages(filters, page, limit, count)
+
+    return {
+        "page": page,
+        "limit": limit,
+        "total": total,
+        "pages": [page_summary(p) for p in pages]
+    }
+
+# PAGE – TRENDS
+
+@router.get("/pages/{page_id}/trends")
+async def get_page_trends(
+    page_id: str,
+    days: int = Query(30, ge=1, le=3650, description="Growth over the last N days"),
+    page_service: AsyncPageService = Depends(get_async_page_service)
+):
+    trends = await page_service.get_page_trends(page_id, days)
+    if not trends:
+        raise HTTPException(status_code=404, detail="No snapshots of this page")
+    return {"page_id": page_id, "days": days, **trends}
+
+# POSTS – RECENT POSTS
+
+@router.get("/pages/{page_id}/posts/recent")
+async def get_recent_posts(
+    page_id: str,
+    limit: int = Query(15, ge=1, le=50),
+    post_service: AsyncPostService = Depends(get_async_post_service)
+):
+    posts = await post_service.get_recent_posts(page_id, limit)
+    return {"page_id": page_id, "recent_posts": posts}
+
+# POSTS – POSTS WITH COMMENTS
+
+@router.get("/pages/{page_id}/posts/with-comments")
+async def get_posts_with_comments(
+    page_id: str,
+    limit: int = Query(10, ge=1, le=20),
+    post_service: AsyncPostService = Depends(get_async_post_service)
+):
+    return {
+        "page_id": page_id,
+        "posts": await post_service.get_posts_with_comments(page_id, limit)
+    }
+
+# POSTS – TOP PERFORMING
+
+@router.get("/pages/{page_id}/top-posts")
+async def get_top_posts(
+    page_id: str,
+    days: int = Query(30, ge=1, le=365),
+    limit: int = Query(5, ge=1, le=20),
+    post_service: AsyncPostService = Depends(get_async_post_service)
+):
+    return {
+        "page_id": page_id,
+        "top_posts": await post_service.get_top_performing_posts(page_id, days, limit)
+    }
+
+# POSTS – TOP ACROSS PAGES
+
+@router.get("/posts/top")
+async def get_top_posts_all_pages(
+    days: int = Query(30, ge=1, le=3650, description="Only posts of the last N days"),
+    limit: int = Query(10, ge=1, le=50),
+    post_service: AsyncPostService = Depends(get_async_post_service)
+):
+    return {
+        "days": days,
+        "top_posts": await post_service.get_top_posts_all_pages(days, limit)
+    }
+
+# POSTS – ENGAGEMENT STATS
+
+@router.get("/pages/{page_id}/engagement")
+async def get_engagement_stats(
+    page_id: str,
+    days: Optional[int] = Query(None, ge=1, le=3650, description="Only posts of the last N days (e.g. 7, 30, 90)"),
+    post_service: AsyncPostService = Depends(get_async_post_service)
+):
+    return {
+        "page_id": page_id,
+        "days": days,
+        "engagement": await post_service.get_post_engagement_stats(page_id, days)
+    }
+
+# POSTS – SEARCH POSTS
+
+@router.get("/pages/{page_id}/posts/search")
+async def search_posts(
+    page_id: str,
+    keyword: str = Query(..., min_length=2, description='Words, "phrases", prefix*'),
+    limit: int = Query(10, ge=1, le=50),
+    post_service: AsyncPostService = Depends(get_async_post_service)
+):
+    hits = await post_service.search_posts(page_id, keyword, limit)
+    return {"page_id": page_id, "results": [search_hit(hit) for hit in hits]}
+
+# POSTS – SEARCH ACROSS PAGES
+
+@router.get("/posts/search")
+async def search_all_posts(
+    q: str = Query(..., min_length=2, description='Words, "phrases", prefix*'),
+    limit: int = Query(10, ge=1, le=50),
+    post_service: AsyncPostService = Depends(get_async_post_service)
+):
+    hits = await post_service.search_posts(None, q, limit)
+    return {"query": q, "results": [search_hit(hit) for hit in hits]}
+
+# EMPLOYEES – LIST
+
+@router.get("/pages/{page_id}/employees")
+async def get_employees(
+    page_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    user_service: AsyncUserService = Depends(get_async_user_service)
+):
+    return {
+        "page_id": page_id,
+        "employees": await user_service.get_page_employees(page_id, limit),
+        "total": await user_service.get_total_employee_count(page_id)
+    }
+
+# EMPLOYEES – FILTER BY POSITION
+
+@router.get("/pages/{page_id}/employees/search")
+async def search_employees(
+    page_id: str,
+    position: Optional[str] = None,
+    name: Optional[str] = None,
+    user_service: AsyncUserService = Depends(get_async_user_service)
+):
+    if position:
+        employees = await user_service.get_employee_by_position(page_id, position)
+    elif name:
+        employees = await user_service.search_employees(page_id, name)
+    else:
+        raise HTTPException(status_code=400, detail="Provide position or name")
+
+    return {"page_id": page_id, "employees": employees}
+
+# EMPLOYEES – DISTRIBUTION
+
+@router.get("/pages/{page_id}/employees/distribution")
+async def employee_distribution(
+    page_id: str,
+    user_service: AsyncUserService = Depends(get_async_user_service)
+):
+    return {
+        "page_id": page_id,
+        "distribution": await user_service.get_employee_distribution(page_id)
+    }
+
+# EMPLOYEES – RECENTLY ADDED
+
+@router.get("/pages/{page_id}/employees/recent")
+async def recent_employees(
+    page_id: str,
+    limit: int = Query(10, ge=1, le=50),
+    user_service: AsyncUserService = Depends(get_async_user_service)
+):
+    return {
+        "page_id": page_id,
+        "employees": await user_service.get_recently_added_employees(page_id, limit)
+    }
+
+# HEALTH – DATABASE
+
+@router.get("/health/db")
+async def db_health(db: AsyncSession = Depends(get_async_db)):
+    await db.execute(text("SELECT 1"))
+    return {"database": "connected"}
@@ -1,15 +1,49 @@
-from fastapi import Depends
+import asyncio
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.services.page_service import PageService
-from app.services.post_service import PostService
-from app.services.user_service import UserService
+from app import database
+from app.database import get_async_db, get_db, use_primary
+from app.services.page_service import AsyncPageService, PageService
+from app.services.post_service import AsyncPostService, PostService
+from app.services.user_service import AsyncUserService, UserService
+from app.services.job_service import JobService
+from app.services.read_your_writes import recently_written
 
-def get_page_service(db: Session = Depends(get_db)) -> PageService:
+def get_routed_db(request: Request, db: Session = Depends(get_db)) -> Session:
+    """Session reading from a replica, or from the primary when the page in
+    the path was written moments ago (read-your-writes)"""
+    page_id = request.path_params.get("page_id")
+    if page_id and recently_written(page_id):
+        use_primary(db)
+    return db
+
+def get_page_service(db: Session = Depends(get_routed_db)) -> PageService:
     return PageService(db)
 
-def get_post_service(db: Session = Depends(get_db)) -> PostService:
+def get_post_service(db: Session = Depends(get_routed_db)) -> PostService:
     return PostService(db)
 
-def get_user_service(db: Session = Depends(get_db)) -> UserService:
-    return UserService(db)
\ No newline at end of file
+def get_user_service(db: Session = Depends(get_routed_db)) -> UserService:
+    return UserService(db)
+
+def get_job_service(db: Session = Depends(get_db)) -> JobService:
+    return JobService(db)
+
+# Async API (/api/v2) - async def, so FastAPI does not run them in its threadpool
+
+async def get_routed_async_db(request: Request, db: AsyncSession = Depends(get_async_db)) -> AsyncSession:
+    """get_routed_db for AsyncSession"""
+    page_id = request.path_params.get("page_id")
+    if page_id and database.async_engines()[1] and await asyncio.to_thread(recently_written, page_id):
+        use_primary(db)
+    return db
+
+async def get_async_page_service(db: AsyncSession = Depends(get_routed_async_db)) -> AsyncPageService:
+    return AsyncPageService(db)
+
+async def get_async_post_service(db: AsyncSession = Depends(get_routed_async_db)) -> AsyncPostService:
+    return AsyncPostService(db)
+
+async def get_async_user_service(db: AsyncSession = Depends(get_routed_async_db)) -> AsyncUserService:
+    return AsyncUserService(db)
@@ -1,20 +1,29 @@
+from datetime import date
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from app import metrics
 from app.database import get_db
 from app.models.page import Page
-from app.schemas import PageUpdate
+from app.schemas import BulkScrapeRequest, PageUpdate
+from app.tasks import schedule_scrape_job
+from app.services.access_tracker import record_access
+from app.services.cold_storage import ColdStorageUnavailable
+from app.scrapers.circuit_breaker import CircuitOpenError, linkedin_breaker
+from app.scrapers.linkedin_scraper import ScrapeError
 
 from app.services.page_service import PageService
 from app.services.post_service import PostService
 from app.services.user_service import UserService
+from app.services.job_service import JobService
 
 from app.api.dependencies import (
     get_page_service,
     get_post_service,
-    get_user_service
+    get_user_service,
+    get_job_service
 )
 
 router = APIRouter()
@@ -28,11 +37,23 @@ def get_page_details(
     refresh: bool = False,
     page_service: PageService = Depends(get_page_service)
 ):
-    page = page_service.get_or_scrape_page(page_id, force_refresh=refresh)
+    # Read counts drive the proactive refresh scheduler
+    record_access(page_id)
+    # Stale pages are served immediately and refreshed in the background
+    try:
+        page = page_service.get_or_scrape_page(page_id, force_refresh=refresh, allow_stale=True)
+    except CircuitOpenError as e:
+        raise circuit_open(e)
+    except ScrapeError as e:
+        raise scrape_failed(e)
 
     if not page:
         raise HTTPException(status_code=404, detail="Page not found")
 
+    return page_details(page)
+
+
+def page_details(page: Page) -> dict:
     return {
         "id": page.id,
         "name": page.name,
@@ -41,46 +62,127 @@ def get_page_details(
         "description": page.description,
         "website": page.website,
         "headquarters": page.headquarters,
+        "specialities": page.specialities or [],
+        "locations": page.locations or [],
         "founded_year": page.founded_year,
-        "last_updated": page.updated_at
+        "post_count": page.post_count,
+        "employee_count": page.employee_count,
+        "last_updated": page.updated_at,
+        "stale": PageService.is_stale(page)
     }
 
+
+def circuit_open(e: CircuitOpenError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="LinkedIn is unavailable, try again later",
+        headers={"Retry-After": str(int(e.retry_after))}
+    )
+
+def scrape_failed(e: ScrapeError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Could not fetch the page from LinkedIn, try again later"
+    )
+
+# PAGE – BULK SCRAPE JOBS
+
+@router.post("/pages/bulk", status_code=status.HTTP_202_ACCEPTED)
+def create_bulk_scrape_job(
+    request: BulkScrapeRequest,
+    job_service: JobService = Depends(get_job_service)
+):
+    job = job_service.create_job(request.page_ids, request.concurrency)
+    schedule_scrape_job(job.id)
+    return {"job_id": job.id, "status": job.status, "total": job.total}
+
+
+@router.get("/jobs/{job_id}")
+def get_job_status(
+    job_id: str,
+    job_service: JobService = Depends(get_job_service)
+):
+    job = job_service.get_job(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job_service.job_status(job)
+
 # PAGE – SEARCH & LIST
 
 @router.get("/pages")
 def search_pages(
+    q: Optional[str] = Query(None, description='Full-text query: words, "phrases", prefix*'),
     name: Optional[str] = None,
     industry: Optional[str] = None,
     min_followers: Optional[int] = None,
     max_followers: Optional[int] = None,
+    speciality: Optional[str] = Query(None, description="Speciality starting with this text, case-insensitive"),
+    location: Optional[str] = Query(None, description="Location starting with this text, case-insensitive"),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    sort: Optional[str] = Query(None, regex="^(followers|name|updated_at)$",
+                                description="Keyset pagination order; use next_cursor for the next page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous response"),
+    count: str = Query("exact", regex="^(exact|estimated|cached|none)$"),
     page_service: PageService = Depends(get_page_service)
 ):
     filters = {
+        "q": q,
         "name": name,
         "industry": industry,
         "min_followers": min_followers,
-        "max_followers": max_followers
+        "max_followers": max_followers,
+        "speciality": speciality,
+        "location": location
     }
 
-    pages, total = page_service.search_pages(filters, page, limit)
+    if sort or cursor:
+        try:
+            pages, next_cursor, total = page_service.search_pages_keyset(filters, sort, cursor, limit, count)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {
+            "limit": limit,
+            "total": total,
+            "next_cursor": next_cursor,
+            "pages": [page_summary(p) for p in pages]
+        }
+
+    pages, total = page_service.search_pages(filters, page, limit, count)
 
     return {
         "page": page,
         "limit": limit,
         "total": total,
-        "pages": [
-            {
-                "id": p.id,
-                "name": p.name,
-                "industry": p.industry,
-                "followers": p.total_followers
-            }
-            for p in pages
-        ]
+        "pages": [page_summary(p) for p in pages]
+    }
+
+
+def page_summary(page: Page) -> dict:
+    return {
+        "id": page.id,
+        "name": page.name,
+        "industry": page.industry,
+        "followers": page.total_followers,
+        "post_count": page.post_count,
+        "employee_count": page.employee_count
     }
 
+# PAGE – TRENDS
+
+@router.get("/pages/{page_id}/trends")
+def get_page_trends(
+    page_id: str,
+    days: int = Query(30, ge=1, le=3650, description="Growth over the last N days"),
+    page_service: PageService = Depends(get_page_service)
+):
+    trends = page_service.get_page_trends(page_id, days)
+    if not trends:
+        raise HTTPException(status_code=404, detail="No snapshots of this page")
+    return {"page_id": page_id, "days": days, **trends}
+
 # POSTS – RECENT POSTS
 
 @router.get("/pages/{page_id}/posts/recent")
@@ -120,30 +222,106 @@ def get_top_posts(
         "top_posts": post_service.get_top_performing_posts(page_id, days, limit)
     }
 
+# POSTS – TOP ACROSS PAGES
+
+@router.get("/posts/top")
+def get_top_posts_all_pages(
+    days: int = Query(30, ge=1, le=3650, description="Only posts of the last N days"),
+    limit: int = Query(10, ge=1, le=50),
+    post_service: PostService = Depends(get_post_service)
+):
+    return {
+        "days": days,
+        "top_posts": post_service.get_top_posts_all_pages(days, limit)
+    }
+
 # POSTS – ENGAGEMENT STATS
 
 @router.get("/pages/{page_id}/engagement")
 def get_engagement_stats(
     page_id: str,
+    days: Optional[int] = Query(None, ge=1, le=3650, description="Only posts of the last N days (e.g. 7, 30, 90)"),
     post_service: PostService = Depends(get_post_service)
 ):
     return {
         "page_id": page_id,
-        "engagement": post_service.get_post_engagement_stats(page_id)
+        "days": days,
+        "engagement": post_service.get_post_engagement_stats(page_id, days)
     }
 
+# POSTS – ARCHIVED (COLD STORAGE)
+
+@router.get("/pages/{page_id}/archive/posts")
+def get_archived_posts(
+    page_id: str,
+    start: Optional[date] = Query(None, description="Posted on or after this day"),
+    end: Optional[date] = Query(None, description="Posted on or before this day"),
+    limit: int = Query(50, ge=1, le=500),
+    post_service: PostService = Depends(get_post_service)
+):
+    try:
+        posts = post_service.get_archived_posts(page_id, start, end, limit)
+    except ColdStorageUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    return {"page_id": page_id, "posts": posts}
+
+
+@router.get("/pages/{page_id}/archive/comments")
+def get_archived_comments(
+    page_id: str,
+    post_id: Optional[str] = None,
+    start: Optional[date] = Query(None, description="Written on or after this day"),
+    end: Optional[date] = Query(None, description="Written on or before this day"),
+    limit: int = Query(50, ge=1, le=500),
+    post_service: PostService = Depends(get_post_service)
+):
+    try:
+        comments = post_service.get_archived_comments(page_id, post_id, start, end, limit)
+    except ColdStorageUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    return {"page_id": page_id, "post_id": post_id, "comments": comments}
+
 # POSTS – SEARCH POSTS
 
 @router.get("/pages/{page_id}/posts/search")
 def search_posts(
     page_id: str,
-    keyword: str = Query(..., min_length=2),
+    keyword: str = Query(..., min_length=2, description='Words, "phrases", prefix*'),
     limit: int = Query(10, ge=1, le=50),
     post_service: PostService = Depends(get_post_service)
 ):
     return {
         "page_id": page_id,
-        "results": post_service.search_posts(page_id, keyword, limit)
+        "results": [search_hit(hit) for hit in post_service.search_posts(page_id, keyword, limit)]
+    }
+
+# POSTS – SEARCH ACROSS PAGES
+
+@router.get("/posts/search")
+def search_all_posts(
+    q: str = Query(..., min_length=2, description='Words, "phrases", prefix*'),
+    limit: int = Query(10, ge=1, le=50),
+    post_service: PostService = Depends(get_post_service)
+):
+    return {
+        "query": q,
+        "results": [search_hit(hit) for hit in post_service.search_posts(None, q, limit)]
+    }
+
+
+def search_hit(hit) -> dict:
+    post = hit.post
+    return {
+        "id": post.id,
+        "page_id": post.page_id,
+        "content": post.content,
+        "post_type": post.post_type,
+        "like_count": post.like_count,
+        "comment_count": post.comment_count,
+        "share_count": post.share_count,
+        "posted_at": post.posted_at,
+        "score": round(hit.score, 4),
+        "snippet": hit.snippet
     }
 
 # EMPLOYEES – LIST
@@ -209,3 +387,15 @@ def recent_employees(
 def db_health(db: Session = Depends(get_db)):
     db.execute(text("SELECT 1"))
     return {"database": "connected"}
+
+# HEALTH – DATABASE POOL & QUERY METRICS
+
+@router.get("/health/metrics")
+def db_metrics():
+    return metrics.snapshot()
+
+# HEALTH – SCRAPER CIRCUIT BREAKER
+
+@router.get("/health/scraper")
+def scraper_health():
+    return {"circuit_breaker": linkedin_breaker.stats()}
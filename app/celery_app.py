@@ -0,0 +1,15 @@
+from celery import Celery
+
+from app.config import settings
+
+# Start a worker with: celery -A app.celery_app worker --loglevel=info
+celery_app = Celery(
+    "linkedin_insights",
+    broker=settings.redis_url,
+    backend=settings.redis_url,
+    include=["app.tasks"],
+)
+celery_app.conf.update(
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+)
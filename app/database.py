@@ -1,7 +1,16 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import Delete, Insert, Update, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base
 from sqlalchemy.orm import sessionmaker
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import List, Tuple
 import os
+import random
+
+from app.config import settings
+from app.metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine
 
 # Database URL - connects to MySQL container
 DATABASE_URL = os.getenv(
@@ -9,16 +18,123 @@ DATABASE_URL = os.getenv(
     "mysql+pymysql://root:root123@db:3306/linkedin_db"
 )
 
+
+# Async drivers used by the /api/v2 stack for each backend
+ASYNC_DRIVERS = {"mysql": "aiomysql", "sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+class AsyncDriverUnavailable(RuntimeError):
+    """The database backend has no installed asyncio driver, so /api/v2 cannot run"""
+
+
+def async_url(url: str) -> str:
+    """The same database with its asyncio driver"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise AsyncDriverUnavailable(f"No asyncio driver is known for {backend}")
+    if find_spec(driver) is None:
+        raise AsyncDriverUnavailable(f"The asyncio driver for {backend} is not installed (pip install {driver})")
+    return parsed.set(drivername=f"{backend}+{driver}").render_as_string(hide_password=False)
+
+
+def make_engine(url: str, name: str, is_async: bool = False):
+    """Engine with the pool configured by settings and instrumented in app.metrics"""
+    options = {"pool_pre_ping": True, "pool_recycle": settings.db_pool_recycle, "echo": settings.db_echo}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        # Wait for another connection's write lock as long as for a pooled connection
+        options["connect_args"] = {"timeout": settings.db_pool_timeout}
+    # SQLite in memory has a single connection and its own pool
+    if parsed.get_backend_name() != "sqlite" or parsed.database not in (None, "", ":memory:"):
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    new_engine = (create_async_engine if is_async else create_engine)(url, **options)
+    instrument_engine(new_engine, name)
+    return new_engine
+
+
 # Create engine
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=True  # Set to False in production
-)
+engine = make_engine(DATABASE_URL, "primary")
+
+# Read replicas - comma separated URLs, empty to read from the primary
+REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+
+replica_engines = [make_engine(url, f"replica-{i}") for i, url in enumerate(REPLICA_URLS)]
+
+
+@lru_cache(maxsize=None)
+def async_engines() -> Tuple[AsyncEngine, List[AsyncEngine]]:
+    """The primary and replica engines of the async stack, created on first
+    use so the sync API runs without an async driver. Raises
+    AsyncDriverUnavailable when the backend has none installed."""
+    return (
+        make_engine(async_url(DATABASE_URL), "primary-async", is_async=True),
+        [make_engine(async_url(url), f"replica-{i}-async", is_async=True) for i, url in enumerate(REPLICA_URLS)],
+    )
+
+
+async def dispose_async_engines():
+    """Close the async engines' connections, if they were ever created"""
+    if not async_engines.cache_info().currsize:
+        return
+    primary, replicas = async_engines()
+    for async_engine in [primary, *replicas]:
+        await async_engine.dispose()
+
+
+class RoutingSession(Session):
+    """Session that reads from a replica and writes to the primary.
+
+    Flushes and Core INSERT/UPDATE/DELETE go to the primary, and pin the
+    session to it so the rest of its work sees its own writes. Sessions
+    that read-modify-write pin themselves up front with use_primary().
+    Without replicas everything uses the primary.
+    """
+
+    def primary(self):
+        return engine
+
+    def replicas(self):
+        return replica_engines
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replicas = self.replicas()
+        if not replicas or self.info.get("primary"):
+            return self.primary()
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.info["primary"] = True
+            return self.primary()
+        return random.choice(replicas)
+
+
+class AsyncRoutingSession(RoutingSession):
+    """The sync side of AsyncSessionLocal: same routing over the async engines"""
+
+    def primary(self):
+        return async_engines()[0].sync_engine
+
+    def replicas(self):
+        return [replica.sync_engine for replica in async_engines()[1]]
+
+
+def use_primary(session: Session) -> Session:
+    """Send every statement of this session (sync or async) to the primary"""
+    session.info["primary"] = True
+    return session
+
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+# Unbound: AsyncRoutingSession picks the (lazily created) async engine
+AsyncSessionLocal = async_sessionmaker(
+    sync_session_class=AsyncRoutingSession, autoflush=False, expire_on_commit=False
+)
 
 # Create base class for models
 Base = declarative_base()
@@ -29,4 +145,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async_engines()  # AsyncDriverUnavailable before any work is done
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
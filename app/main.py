@@ -1,7 +1,11 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
+from app.database import AsyncDriverUnavailable, Base, dispose_async_engines, engine
 from app.api.endpoints import router
+from app.api.async_endpoints import router as async_router
+from app import metrics
+from app.tasks import schedule_rescore
 import os
 import uvicorn
 
@@ -29,7 +33,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Count the SQL statements of each request for /api/v1/health/metrics
+@app.middleware("http")
+async def count_db_queries(request: Request, call_next):
+    token = metrics.start_request()
+    try:
+        response = await call_next(request)
+    finally:
+        queries = metrics.end_request(token)
+    response.headers["X-DB-Queries"] = str(queries)
+    return response
+
 app.include_router(router, prefix="/api/v1")
+# Async variant of the read endpoints
+app.include_router(async_router, prefix="/api/v2")
+
+@app.on_event("startup")
+def check_engagement_weights():
+    # Scores stored with other weights are recomputed in the background,
+    # by whichever worker process takes the rescore lease first
+    schedule_rescore()
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    await dispose_async_engines()
+
+# /api/v2 needs an asyncio driver for the database; /api/v1 does not
+@app.exception_handler(AsyncDriverUnavailable)
+async def async_driver_unavailable(request: Request, exc: AsyncDriverUnavailable):
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,174 @@
+"""In-process database metrics.
+
+Per engine: connection checkout latency (time spent in ``pool.connect()``,
+including waits for a free connection), connections in use, overflow
+checkouts and pool timeouts, collected through QueuePool subclasses and
+SQLAlchemy pool events. Per request: the number of SQL statements, counted
+with a cursor event and a request-scoped counter set by the API
+middleware. Served by ``/api/v1/health/metrics``; counters are per worker
+process.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+QUERY_COUNT_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500]
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus style ``le`` buckets)"""
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value)] += 1
+            self._sum += value
+            self._max = max(self._max, value)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counts, total, largest = list(self._counts), self._sum, self._max
+        count = sum(counts)
+        cumulative, running = {}, 0
+        for bound, n in zip(self.buckets + ["+Inf"], counts):
+            running += n
+            cumulative[str(bound)] = running
+        return {
+            "count": count,
+            "sum": round(total, 3),
+            "mean": round(total / count, 3) if count else 0.0,
+            "max": round(largest, 3),
+            "buckets": cumulative,
+        }
+
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.checkout_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.connections_opened = 0
+        self.invalidated = 0
+        self.pool: Optional[QueuePool] = None
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> Dict:
+        pool = self.pool
+        return {
+            "size": pool.size() if pool else None,
+            "checked_out": pool.checkedout() if pool else self.in_use,
+            "overflow": pool.overflow() if pool else None,
+            "peak_in_use": self.peak_in_use,
+            "overflow_checkouts": self.overflow_checkouts,
+            "timeouts": self.timeouts,
+            "connections_opened": self.connections_opened,
+            "invalidated": self.invalidated,
+            "checkout_latency_ms": self.checkout_ms.snapshot(),
+        }
+
+
+class TimedCheckoutMixin:
+    """Times pool checkouts, waits for a free connection included"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            if self.metrics:
+                self.metrics.timeouts += 1
+            raise
+        finally:
+            if self.metrics:
+                self.metrics.checkout_ms.observe((time.perf_counter() - start) * 1000)
+
+
+class InstrumentedQueuePool(TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+pools: Dict[str, PoolMetrics] = {}
+queries_per_request = Histogram(QUERY_COUNT_BUCKETS)
+
+# Statements run by the current request; None outside requests
+_request_queries: ContextVar[Optional[List[int]]] = ContextVar("request_queries", default=None)
+
+
+def instrument_engine(engine, name: str) -> PoolMetrics:
+    """Collect pool and query metrics for an engine"""
+    metrics = pools[name] = PoolMetrics(name)
+    engine = getattr(engine, "sync_engine", engine)  # AsyncEngine events go to its sync engine
+    if isinstance(engine.pool, TimedCheckoutMixin):
+        engine.pool.metrics = metrics
+        metrics.pool = engine.pool
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        with metrics._lock:
+            metrics.in_use += 1
+            metrics.peak_in_use = max(metrics.peak_in_use, metrics.in_use)
+        if metrics.pool is not None and metrics.pool.overflow() > 0:
+            metrics.overflow_checkouts += 1
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        with metrics._lock:
+            metrics.in_use = max(0, metrics.in_use - 1)
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connections_opened += 1
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidated += 1
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        counter = _request_queries.get()
+        if counter is not None:
+            counter[0] += 1
+
+    return metrics
+
+
+def start_request():
+    """Start counting this request's statements; returns a token for end_request"""
+    counter = [0]
+    return _request_queries.set(counter), counter
+
+
+def end_request(token) -> int:
+    reset_token, counter = token
+    _request_queries.reset(reset_token)
+    queries_per_request.observe(counter[0])
+    return counter[0]
+
+
+def snapshot() -> Dict:
+    return {
+        "pools": {name: metrics.snapshot() for name, metrics in pools.items()},
+        "queries_per_request": queries_per_request.snapshot(),
+    }
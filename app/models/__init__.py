@@ -2,5 +2,12 @@ from .page import Page
 from .post import Post
 from .user import SocialMediaUser
 from .comment import Comment
+from .job import ScrapeJob
+from .engagement import PageEngagement, PageEngagementDaily
+from .app_state import AppState
+from .snapshot import PageSnapshot
+from .cold_partition import ColdPartition
+from .page_tag import PageTag
+from . import fulltext  # noqa: F401 - registers the full-text index DDL
 
-__all__ = ["Page", "Post", "SocialMediaUser", "Comment"]
\ No newline at end of file
+__all__ = ["Page", "Post", "SocialMediaUser", "Comment", "ScrapeJob", "PageEngagement", "PageEngagementDaily", "AppState", "PageSnapshot", "ColdPartition", "PageTag"]
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime, JSON
+from datetime import datetime
+from app.database import Base
+
+class AppState(Base):
+    """Small named values the application keeps about its own data, e.g. the
+    engagement weights the stored post scores were computed with"""
+    __tablename__ = "app_state"
+
+    key = Column(String(100), primary_key=True)
+    value = Column(JSON)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<AppState(key='{self.key}')>"
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey
+from datetime import datetime
+from app.database import Base
+
+class ColdPartition(Base):
+    """One Parquet file of posts or comments moved to cold storage, with
+    the totals of its rows (see app.services.cold_storage)"""
+    __tablename__ = "cold_partitions"
+
+    # The key prefix finds a page's files of a kind by month
+    page_id = Column(String(100), ForeignKey("pages.id"), primary_key=True)
+    kind = Column(String(20), primary_key=True)  # 'posts' or 'comments'
+    month = Column(String(7), primary_key=True)  # YYYY-MM
+    file = Column(String(255), primary_key=True)  # relative to COLD_STORAGE_DIR
+    row_count = Column(Integer, nullable=False, default=0)
+    # Engagement of archived posts, so rollups can be reconciled without them
+    likes = Column(BigInteger, nullable=False, default=0)
+    comments = Column(BigInteger, nullable=False, default=0)
+    shares = Column(BigInteger, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ColdPartition(page='{self.page_id}', kind='{self.kind}', month='{self.month}', rows={self.row_count})>"
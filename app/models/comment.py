@@ -1,10 +1,13 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_post_id_commented_at", "post_id", "commented_at"),
+    )
     
     id = Column(String(100), primary_key=True)
     post_id = Column(String(100), ForeignKey("posts.id"))
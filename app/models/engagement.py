@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, BigInteger, Date, ForeignKey
+from app.database import Base
+
+class PageEngagement(Base):
+    """All-time engagement totals of a page's posts (see app.services.rollups)"""
+    __tablename__ = "page_engagement"
+
+    page_id = Column(String(100), ForeignKey("pages.id"), primary_key=True)
+    posts = Column(BigInteger, nullable=False, default=0)
+    likes = Column(BigInteger, nullable=False, default=0)
+    comments = Column(BigInteger, nullable=False, default=0)
+    shares = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<PageEngagement(page='{self.page_id}', posts={self.posts})>"
+
+
+class PageEngagementDaily(Base):
+    """Engagement of a page's posts by the UTC day they were posted"""
+    __tablename__ = "page_engagement_daily"
+
+    page_id = Column(String(100), ForeignKey("pages.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    posts = Column(BigInteger, nullable=False, default=0)
+    likes = Column(BigInteger, nullable=False, default=0)
+    comments = Column(BigInteger, nullable=False, default=0)
+    shares = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<PageEngagementDaily(page='{self.page_id}', day={self.day}, posts={self.posts})>"
@@ -0,0 +1,50 @@
+"""Full-text indexes for post content and page names/descriptions.
+
+MySQL gets FULLTEXT indexes. SQLite gets FTS5 tables over the rows they
+index (external content, keyed by rowid) kept in sync by triggers. Both
+are created together with their tables by ``Base.metadata.create_all``;
+migration 0004 adds them to existing databases. Other databases have no
+full-text index and fall back to LIKE (see app.services.fulltext).
+"""
+from sqlalchemy import DDL, event
+
+from app.models.page import Page
+from app.models.post import Post
+
+MYSQL_DDL = {
+    Post.__table__: ["CREATE FULLTEXT INDEX ft_posts_content ON posts (content)"],
+    Page.__table__: ["CREATE FULLTEXT INDEX ft_pages_name_description ON pages (name, description)"],
+}
+
+
+def sqlite_fts_ddl(table: str, columns: list) -> list:
+    """FTS5 table ``<table>_fts`` over ``columns`` plus its sync triggers"""
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', content_rowid='rowid')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new}); END",
+    ]
+
+
+SQLITE_DDL = {
+    Post.__table__: sqlite_fts_ddl("posts", ["content"]),
+    Page.__table__: sqlite_fts_ddl("pages", ["name", "description"]),
+}
+
+for table, statements in MYSQL_DDL.items():
+    for statement in statements:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="mysql"))
+
+for table, statements in SQLITE_DDL.items():
+    for statement in statements:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(table, "before_drop", DDL(f"DROP TABLE IF EXISTS {table.name}_fts").execute_if(dialect="sqlite"))
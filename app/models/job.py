@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON
+from datetime import datetime
+from app.database import Base
+
+class ScrapeJob(Base):
+    __tablename__ = "scrape_jobs"
+    
+    id = Column(String(36), primary_key=True)  # uuid4
+    status = Column(String(20), default="queued")  # queued, running, completed, failed
+    page_ids = Column(JSON)
+    concurrency = Column(Integer)
+    total = Column(Integer, default=0)
+    refreshed = Column(Integer, default=0)
+    unchanged = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    errors = Column(JSON)  # {page_id: error}, capped
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)  # last progress of the worker running the job
+    finished_at = Column(DateTime)
+    
+    def __repr__(self):
+        return f"<ScrapeJob(id='{self.id}', status='{self.status}', total={self.total})>"
@@ -1,10 +1,17 @@
-from sqlalchemy import Column, String, Integer, Text, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, String, Integer, Text, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class Page(Base):
     __tablename__ = "pages"
+    __table_args__ = (
+        # Follower filters and the keyset pagination sorts (ties broken by id)
+        Index("ix_pages_total_followers_id", "total_followers", "id"),
+        Index("ix_pages_name_id", "name", "id"),
+        # ... also the refresh scheduler candidates
+        Index("ix_pages_updated_at_id", "updated_at", "id"),
+    )
     
     id = Column(String(100), primary_key=True)  # LinkedIn page ID like "deepsolv"
     name = Column(String(200), nullable=False)
@@ -15,11 +22,23 @@ class Page(Base):
     industry = Column(String(200))
     total_followers = Column(Integer, default=0)
     head_count = Column(String(50))
-    specialities = Column(JSON)  # Store as JSON list
+    specialities = Column(JSON)  # list of strings, also in page_tags
     company_type = Column(String(100))
     founded_year = Column(Integer)
     headquarters = Column(String(200))
-    locations = Column(JSON)
+    locations = Column(JSON)  # list of strings, also in page_tags
+    
+    # Denormalized counts of related rows, bumped on write (see app.reconcile)
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
+    employee_count = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    # Older posts / comments of this page were moved to cold storage (see app.services.cold_storage)
+    posts_archived_before = Column(DateTime)
+    comments_archived_before = Column(DateTime)
+    
+    # SHA-256 of the fetched body these values were parsed from; a refresh
+    # fetching the same body skips parsing and rewriting the page
+    content_hash = Column(String(64))
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, ForeignKey, Index
+from sqlalchemy.dialects import mysql
+from app.database import Base
+
+# Compared byte for byte: MySQL's default collation would make values that
+# differ only by accent ("zürich", "zurich") the same primary key
+TAG_VALUE = String(200).with_variant(mysql.VARCHAR(200, collation="utf8mb4_bin"), "mysql")
+
+class PageTag(Base):
+    """A page's speciality or location, normalized for indexed filtering
+    (see app.services.page_tags)"""
+    __tablename__ = "page_tags"
+    __table_args__ = (
+        # /pages?speciality=...&location=... filters
+        Index("ix_page_tags_kind_value_page_id", "kind", "value", "page_id"),
+    )
+
+    page_id = Column(String(100), ForeignKey("pages.id"), primary_key=True)
+    kind = Column(String(20), primary_key=True)  # 'speciality' or 'location'
+    value = Column(TAG_VALUE, primary_key=True)  # stripped and lowercased
+
+    def __repr__(self):
+        return f"<PageTag(page='{self.page_id}', kind='{self.kind}', value='{self.value}')>"
@@ -1,10 +1,16 @@
-from sqlalchemy import Column, String, Integer, Text, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, String, Integer, Double, Text, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # Recent posts / date ranges of a page
+        Index("ix_posts_page_id_posted_at", "page_id", "posted_at"),
+        # Top posts of a page (and across pages) in score order
+        Index("ix_posts_page_id_engagement_score", "page_id", "engagement_score"),
+    )
     
     id = Column(String(100), primary_key=True)
     page_id = Column(String(100), ForeignKey("pages.id"))
@@ -14,6 +20,7 @@ class Post(Base):
     like_count = Column(Integer, default=0)
     comment_count = Column(Integer, default=0)
     share_count = Column(Integer, default=0)
+    engagement_score = Column(Double, nullable=False, default=0, server_default="0")  # see app.services.scoring
     posted_at = Column(DateTime)
     
     # Timestamps
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey
+from sqlalchemy.dialects import mysql
+from app.database import Base
+
+# Microseconds on MySQL too: a plain DATETIME rounds to whole seconds, and
+# two saves of a page within a second would share a primary key
+SNAPSHOT_TIME = DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+
+class PageSnapshot(Base):
+    """A page's followers, counts and engagement totals as of one refresh
+    (append-only; compacted to one per day, see app.services.snapshots)"""
+    __tablename__ = "page_snapshots"
+
+    # The primary key doubles as the index for a page's series in time order
+    page_id = Column(String(100), ForeignKey("pages.id"), primary_key=True)
+    taken_at = Column(SNAPSHOT_TIME, primary_key=True)
+    followers = Column(Integer, nullable=False, default=0)
+    posts = Column(Integer, nullable=False, default=0)
+    employees = Column(Integer, nullable=False, default=0)
+    likes = Column(BigInteger, nullable=False, default=0)
+    comments = Column(BigInteger, nullable=False, default=0)
+    shares = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<PageSnapshot(page='{self.page_id}', taken_at={self.taken_at}, followers={self.followers})>"
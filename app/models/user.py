@@ -1,10 +1,15 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class SocialMediaUser(Base):
     __tablename__ = "social_media_users"
+    __table_args__ = (
+        # Position lookups and the per-position distribution of a page
+        Index("ix_social_media_users_page_id_position", "page_id", "position"),
+        Index("ix_social_media_users_page_id_created_at", "page_id", "created_at"),
+    )
     
     id = Column(String(100), primary_key=True)
     page_id = Column(String(100), ForeignKey("pages.id"))
@@ -0,0 +1,126 @@
+"""Repair drift in the denormalized page counters, engagement rollups and post scores.
+
+    python -m app.reconcile                 # every page
+    python -m app.reconcile acme globex     # only these pages
+
+``pages.post_count`` and ``pages.employee_count`` are bumped by the scrape
+persistence path as rows are inserted, and the engagement rollups (see
+app.services.rollups) move by each post's change. Concurrent refreshes of
+one page and rows written or deleted outside that path can leave them off.
+This job recomputes both from the related rows of each page, in batches of
+pages walked in id order, and rewrites what differs. It also rescores all
+posts if the engagement weights changed since they were scored (see
+app.services.scoring).
+"""
+import argparse
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, use_primary
+from app.models.page import Page
+from app.models.post import Post
+from app.models.user import SocialMediaUser
+from app.services.cold_storage import cold_totals
+from app.services.rollups import reconcile_engagement
+from app.services.scoring import rescore_if_outdated
+
+BATCH_SIZE = 1000
+
+
+def reconcile_counters(db: Session, page_ids: Optional[Iterable[str]] = None,
+                       batch_size: int = BATCH_SIZE) -> Dict[str, Dict]:
+    """Recount posts and employees; returns the corrected pages as
+    ``{page_id: {"post_count": (stored, actual), ...}}`` (changed counters only)"""
+    fixed: Dict[str, Dict] = {}
+    for batch in _page_batches(db, page_ids, batch_size):
+        fixed.update(_reconcile_batch(db, batch))
+        db.commit()
+    return fixed
+
+
+def reconcile_rollups(db: Session, page_ids: Optional[Iterable[str]] = None,
+                      batch_size: int = BATCH_SIZE) -> List[str]:
+    """Recompute the engagement rollups; returns the pages that had drifted"""
+    drifted: List[str] = []
+    for batch in _page_batches(db, page_ids, batch_size):
+        drifted.extend(reconcile_engagement(db, [row.id for row in batch]))
+        db.commit()
+    return drifted
+
+
+def _page_batches(db: Session, page_ids: Optional[Iterable[str]], batch_size: int) -> Iterator[List]:
+    """(id, post_count, employee_count) of the pages, ``batch_size`` at a time"""
+    use_primary(db)
+    wanted = sorted(set(page_ids)) if page_ids is not None else None
+    last_id = ""
+    while True:
+        query = db.query(Page.id, Page.post_count, Page.employee_count).filter(Page.id > last_id)
+        if wanted is not None:
+            query = query.filter(Page.id.in_(wanted))
+        batch = query.order_by(Page.id).limit(batch_size).all()
+        if not batch:
+            return
+        last_id = batch[-1].id
+        yield batch
+
+
+def _reconcile_batch(db: Session, batch: List) -> Dict[str, Dict]:
+    ids = [row.id for row in batch]
+    posts = _counts(db, Post, ids)
+    # Posts moved to cold storage still count
+    for page_id, (archived, *_) in cold_totals(db, ids).items():
+        posts[page_id] = posts.get(page_id, 0) + archived
+    employees = _counts(db, SocialMediaUser, ids)
+    fixed = {}
+    for row in batch:
+        changes = {}
+        if row.post_count != posts.get(row.id, 0):
+            changes["post_count"] = (row.post_count, posts.get(row.id, 0))
+        if row.employee_count != employees.get(row.id, 0):
+            changes["employee_count"] = (row.employee_count, employees.get(row.id, 0))
+        if changes:
+            values = {getattr(Page, column): actual for column, (_, actual) in changes.items()}
+            # Keep updated_at: it is the scrape time the refresh schedule relies on
+            values[Page.updated_at] = Page.updated_at
+            db.query(Page).filter(Page.id == row.id).update(values, synchronize_session=False)
+            fixed[row.id] = changes
+    return fixed
+
+
+def _counts(db: Session, model, page_ids: List[str]) -> Dict[str, int]:
+    """Rows of ``model`` per page (an index range scan per page)"""
+    return dict(
+        db.query(model.page_id, func.count(model.id))
+        .filter(model.page_id.in_(page_ids))
+        .group_by(model.page_id)
+        .all()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("page_ids", nargs="*", help="only reconcile these pages")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        fixed = reconcile_counters(db, args.page_ids or None, args.batch_size)
+        drifted = reconcile_rollups(db, args.page_ids or None, args.batch_size)
+        rescored = rescore_if_outdated(db, args.batch_size)
+    finally:
+        db.close()
+    print(f"Corrected counters of {len(fixed)} pages")
+    for page_id, changes in fixed.items():
+        print(f"  {page_id}: " + ", ".join(f"{col} {old} -> {new}" for col, (old, new) in changes.items()))
+    print(f"Corrected engagement rollups of {len(drifted)} pages")
+    for page_id in drifted:
+        print(f"  {page_id}")
+    if rescored is not None:
+        print(f"Rescored {rescored} posts with the new engagement weights")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import time
+from typing import Optional
+
+import redis
+
+from app.config import settings
+
+RETRY_INTERVAL = 30  # seconds before trying an unreachable Redis again
+
+_client: Optional[redis.Redis] = None
+_last_failure = 0.0
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """Shared client for settings.redis_url, or None while Redis is unreachable"""
+    global _client, _last_failure
+    if _client is not None:
+        return _client
+    if time.monotonic() - _last_failure < RETRY_INTERVAL:
+        return None
+    try:
+        client = redis.Redis.from_url(settings.redis_url, socket_connect_timeout=1, socket_timeout=2)
+        client.ping()
+    except redis.RedisError as e:
+        print(f"Redis unavailable at {settings.redis_url}: {str(e)}")
+        _last_failure = time.monotonic()
+        return None
+    _client = client
+    return _client
@@ -0,0 +1,78 @@
+"""Re-run the extractors over archived page bodies.
+
+    python -m app.reextract                 # every archived page
+    python -m app.reextract acme globex     # only these pages
+    python -m app.reextract --workers 8
+
+Takes the latest archived body of each page (see app.scrapers.archive),
+parses it with the current LinkedInScraper in a process pool and upserts
+the results in batches, so extractor changes can be backfilled without
+fetching anything from LinkedIn. Pages keep their refresh time and get
+the archived body's hash, and no snapshots are recorded.
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Optional
+
+from app.config import settings
+from app.database import SessionLocal
+from app.scrapers.archive import ArchiveRecord, PageArchive
+from app.scrapers.async_scraper import ScrapeResult
+from app.scrapers.linkedin_scraper import LinkedInScraper
+from app.services.page_service import PageService
+
+# Per worker process, set up by _init_worker
+_archive: Optional[PageArchive] = None
+_scraper: Optional[LinkedInScraper] = None
+
+
+def _init_worker(archive_dir: str, parser: str):
+    global _archive, _scraper
+    _archive = PageArchive(archive_dir)
+    _scraper = LinkedInScraper(parser=parser)
+
+
+def _extract(record: ArchiveRecord) -> ScrapeResult:
+    try:
+        data = _scraper.parse_page(record.page_id, record.url, _archive.read(record))
+        data.update(content_hash=record.body_hash, scraped_at=record.fetched_at)
+        return ScrapeResult(record.page_id, data)
+    except Exception as e:
+        return ScrapeResult(record.page_id, None, str(e))
+
+
+def reextract(page_ids: Optional[Iterable[str]] = None, workers: Optional[int] = None,
+              archive: Optional[PageArchive] = None) -> Dict:
+    """Re-extract and save the latest archived body of each page"""
+    archive = archive or PageArchive()
+    records = archive.latest(page_ids)
+    if not records:
+        return {"refreshed": [], "unchanged": [], "failed": {}}
+
+    workers = workers or settings.reextract_workers or os.cpu_count()
+    chunksize = max(1, min(32, len(records) // (workers * 4)))
+    db = SessionLocal()
+    try:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(str(archive.root), settings.html_parser)) as pool:
+            results = pool.map(_extract, records, chunksize=chunksize)
+            return PageService(db).save_reextracted(results)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("page_ids", nargs="*", help="only re-extract these pages")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    summary = reextract(args.page_ids or None, args.workers)
+    print(f"Re-extracted {len(summary['refreshed'])} pages, failed {len(summary['failed'])}")
+    for page_id, error in summary["failed"].items():
+        print(f"  {page_id}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Move old posts and comments out of the database into cold storage.
+
+    python -m app.retention                 # every page
+    python -m app.retention acme globex     # only these pages
+
+Posts published more than POST_RETENTION_DAYS ago (with all their
+comments) and comments written more than COMMENT_RETENTION_DAYS ago are
+written to Parquet files under COLD_STORAGE_DIR, partitioned by page and
+month, and deleted from the database (see app.services.cold_storage).
+Run it nightly, for example next to ``python -m app.reconcile``.
+"""
+import argparse
+
+from app.database import SessionLocal
+from app.services.cold_storage import ColdStorage, archive_old_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("page_ids", nargs="*", help="only archive these pages")
+    parser.add_argument("--cold-storage-dir", help="defaults to COLD_STORAGE_DIR")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        moved = archive_old_rows(db, ColdStorage(args.cold_storage_dir), args.page_ids or None)
+    finally:
+        db.close()
+    print(f"Moved {moved['posts']} posts and {moved['comments']} comments of {moved['pages']} pages to cold storage")
+
+
+if __name__ == "__main__":
+    main()
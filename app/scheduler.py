@@ -0,0 +1,110 @@
+"""Proactive page refresh scheduler.
+
+Run next to the API with ``python -m app.scheduler``. Every tick it ranks
+the pages that are due for a refresh and feeds the top of that priority
+queue to the bulk scraper at ``SCHEDULER_RATE_PER_MINUTE``:
+
+* pages read recently (see app.services.access_tracker) are due once they
+  reach ``SCHEDULER_REFRESH_AHEAD`` of the soft TTL, so they are refreshed
+  before a reader finds them stale;
+* pages nobody reads are due at the soft TTL, behind the popular ones.
+
+Priority is ``(1 + access score) * age / soft TTL``.
+
+Once a day it also compacts the page snapshot history (see
+app.services.snapshots).
+"""
+import heapq
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.page import Page
+from app.services.access_tracker import access_scores, decay_access_scores
+from app.services.page_service import PageService
+from app.services.snapshots import compact_snapshots
+
+
+def build_refresh_queue(pages: Iterable[Tuple[str, datetime]], scores: Dict[str, float],
+                        now: datetime) -> List[Tuple[float, str]]:
+    """Heap of (-priority, page_id) for the pages that are due"""
+    soft_ttl = settings.page_soft_ttl
+    heap = []
+    for page_id, updated_at in pages:
+        age_ratio = (now - updated_at).total_seconds() / soft_ttl
+        score = scores.get(page_id, 0.0)
+        due_at = settings.scheduler_refresh_ahead if score > 0 else 1.0
+        if age_ratio >= due_at:
+            heap.append((-(1 + score) * age_ratio, page_id))
+    heapq.heapify(heap)
+    return heap
+
+
+class RefreshScheduler:
+    def __init__(self):
+        self.rate_per_minute = settings.scheduler_rate_per_minute
+        self.tick_seconds = settings.scheduler_tick_seconds
+        self._last_decay = time.monotonic()
+        self._compacted_on = None
+
+    def candidates(self, db, now: datetime) -> List[Tuple[str, datetime]]:
+        """Pages old enough to be due if they are popular"""
+        cutoff = now - timedelta(seconds=settings.page_soft_ttl * settings.scheduler_refresh_ahead)
+        return db.query(Page.id, Page.updated_at).filter(Page.updated_at <= cutoff).all()
+
+    def tick(self) -> Dict:
+        """Refresh the highest priority due pages that fit in one tick"""
+        self._decay()
+        self._compact()
+        now = datetime.utcnow()
+        budget = max(1, int(self.rate_per_minute * self.tick_seconds / 60))
+
+        db = SessionLocal()
+        try:
+            queue = build_refresh_queue(self.candidates(db, now), access_scores(), now)
+            page_ids = [heapq.heappop(queue)[1] for _ in range(min(budget, len(queue)))]
+            if not page_ids:
+                return {"refreshed": [], "unchanged": [], "failed": {}}
+            return PageService(db).refresh_pages(page_ids)
+        finally:
+            db.close()
+
+    def run_forever(self):
+        print(f"Refresh scheduler started: {self.rate_per_minute} pages/min, tick {self.tick_seconds}s")
+        while True:
+            started = time.monotonic()
+            try:
+                summary = self.tick()
+                print(
+                    f"Refreshed {len(summary['refreshed'])}, unchanged {len(summary['unchanged'])}, "
+                    f"failed {len(summary['failed'])}"
+                )
+            except Exception as e:
+                print(f"Scheduler tick failed: {str(e)}")
+            time.sleep(max(0.0, self.tick_seconds - (time.monotonic() - started)))
+
+    def _decay(self):
+        elapsed = time.monotonic() - self._last_decay
+        if elapsed >= self.tick_seconds:
+            decay_access_scores(0.5 ** (elapsed / settings.access_half_life))
+            self._last_decay = time.monotonic()
+
+    def _compact(self):
+        today = datetime.utcnow().date()
+        if self._compacted_on == today:
+            return
+        db = SessionLocal()
+        try:
+            counts = compact_snapshots(db)
+            print(f"Compacted snapshots: {counts['merged']} merged into daily, {counts['expired']} expired")
+            self._compacted_on = today
+        except Exception as e:
+            print(f"Snapshot compaction failed: {str(e)}")
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    RefreshScheduler().run_forever()
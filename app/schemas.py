@@ -1,4 +1,4 @@
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -47,6 +47,10 @@ class PageSearchRequest(BaseModel):
     page: int = 1
     limit: int = 10
 
+class BulkScrapeRequest(BaseModel):
+    page_ids: List[str] = Field(..., min_items=1, max_items=10000)
+    concurrency: Optional[int] = Field(None, ge=1, le=100)
+
 # Put
 class PageUpdate(BaseModel):
     name: Optional[str]
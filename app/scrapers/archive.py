@@ -0,0 +1,182 @@
+import gzip
+import hashlib
+import mmap
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional, gzip is used without it
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:  # Windows, locked with msvcrt instead
+    fcntl = None
+    import msvcrt
+
+from app.config import settings
+from app.scrapers.fetch_cache import CachedFetch
+
+ZSTD = "zstd"
+GZIP = "gzip"
+
+INDEX_FILE = "index.tsv"
+LOCK_FILE = ".lock"
+
+
+class ArchiveRecord(NamedTuple):
+    page_id: str
+    url: str
+    fetched_at: str
+    body_hash: str
+    segment: str
+    offset: int
+    length: int
+    codec: str
+
+    def to_line(self) -> str:
+        return "\t".join(str(field) for field in self) + "\n"
+
+    @classmethod
+    def from_line(cls, line: str) -> "ArchiveRecord":
+        page_id, url, fetched_at, body_hash, segment, offset, length, codec = line.rstrip("\n").split("\t")
+        return cls(page_id, url, fetched_at, body_hash, segment, int(offset), int(length), codec)
+
+
+@contextmanager
+def exclusive_lock(path: Path):
+    """Hold an exclusive lock on ``path`` (created if missing) across processes"""
+    with open(path, "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+            return
+        # msvcrt locks a byte range from the current position; LK_LOCK gives
+        # up after about ten seconds, so keep waiting
+        lock.seek(0)
+        while True:
+            try:
+                msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                continue
+        try:
+            yield
+        finally:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def default_codec() -> str:
+    return ZSTD if zstandard is not None else GZIP
+
+
+def compress(body: bytes, codec: str) -> bytes:
+    if codec == ZSTD:
+        return zstandard.ZstdCompressor(level=settings.archive_compression_level).compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+
+def decompress(blob: bytes, codec: str) -> bytes:
+    if codec == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Archive record is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return gzip.decompress(blob)
+
+
+class PageArchive:
+    """Append-only archive of raw company page bodies.
+
+    Bodies are compressed one by one (zstd when available, gzip otherwise)
+    and appended to numbered segment files that roll over at
+    ``segment_bytes``. ``index.tsv`` gets one line per body with its
+    segment, offset and length; segments are read back through mmap.
+    Appends from several processes are serialised with a lock file.
+    """
+
+    def __init__(self, directory: Optional[str] = None, segment_bytes: Optional[int] = None,
+                 codec: Optional[str] = None):
+        self.root = Path(directory or settings.archive_dir)
+        self.segment_bytes = segment_bytes or settings.archive_segment_bytes
+        self.codec = codec or default_codec()
+        self._maps: Dict[str, mmap.mmap] = {}
+
+    def append(self, page_id: str, url: str, body: bytes) -> ArchiveRecord:
+        """Compress and append a body, returning its index record"""
+        blob = compress(body, self.codec)
+        self.root.mkdir(parents=True, exist_ok=True)
+        with exclusive_lock(self.root / LOCK_FILE):
+            segment = self._writable_segment()
+            with open(self.root / segment, "ab") as f:
+                offset = f.tell()
+                f.write(blob)
+            record = ArchiveRecord(
+                page_id, url, datetime.utcnow().isoformat(), hashlib.sha256(body).hexdigest(),
+                segment, offset, len(blob), self.codec,
+            )
+            with open(self.root / INDEX_FILE, "a") as index:
+                index.write(record.to_line())
+        return record
+
+    def record_fetch(self, page_id: str, url: str, fetched: CachedFetch) -> Optional[ArchiveRecord]:
+        """Archive a freshly fetched body; unchanged bodies are already archived.
+        Archive failures are logged, never raised into the scrape."""
+        if not fetched.changed:
+            return None
+        try:
+            return self.append(page_id, url, fetched.body)
+        except OSError as e:
+            print(f"Failed to archive {page_id}: {str(e)}")
+            return None
+
+    def records(self) -> Iterator[ArchiveRecord]:
+        """Every index record, oldest first"""
+        try:
+            with open(self.root / INDEX_FILE) as index:
+                for line in index:
+                    if line.strip():
+                        yield ArchiveRecord.from_line(line)
+        except FileNotFoundError:
+            return
+
+    def latest(self, page_ids: Optional[Iterable[str]] = None) -> List[ArchiveRecord]:
+        """The most recent record of each page (optionally only these pages)"""
+        wanted = set(page_ids) if page_ids is not None else None
+        latest: Dict[str, ArchiveRecord] = {}
+        for record in self.records():
+            if wanted is None or record.page_id in wanted:
+                latest[record.page_id] = record
+        return list(latest.values())
+
+    def read(self, record: ArchiveRecord) -> bytes:
+        """Decompressed body of a record"""
+        view = self._map(record.segment, record.offset + record.length)
+        return decompress(view[record.offset:record.offset + record.length], record.codec)
+
+    def close(self):
+        for view in self._maps.values():
+            view.close()
+        self._maps.clear()
+
+    def _map(self, segment: str, needed: int) -> mmap.mmap:
+        view = self._maps.get(segment)
+        if view is None or len(view) < needed:
+            # Not mapped yet, or the segment grew since it was mapped
+            if view is not None:
+                view.close()
+            with open(self.root / segment, "rb") as f:
+                view = self._maps[segment] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return view
+
+    def _writable_segment(self) -> str:
+        """Name of the segment to append to, starting a new one when the last is full"""
+        segments = sorted(p.name for p in self.root.glob("segment-*.bin"))
+        if segments and os.path.getsize(self.root / segments[-1]) < self.segment_bytes:
+            return segments[-1]
+        number = int(segments[-1][8:-4]) + 1 if segments else 1
+        return f"segment-{number:06d}.bin"
@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import ssl
+from contextlib import asynccontextmanager
+from concurrent.futures import Executor
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Iterable, NamedTuple, Optional
+
+import httpx
+
+from app.config import settings
+from app.scrapers.archive import PageArchive
+from app.scrapers.circuit_breaker import THROTTLE_STATUS_CODES, CircuitBreaker, CircuitOpenError, linkedin_breaker
+from app.scrapers.fetch_cache import CachedFetch, FetchCache
+from app.scrapers.linkedin_scraper import DEFAULT_HEADERS, LinkedInScraper, ScrapeError, company_url
+from app.scrapers.rate_limiter import TokenBucketLimiter, host_of
+
+
+class ScrapeResult(NamedTuple):
+    page_id: str
+    data: Optional[Dict]
+    error: Optional[str] = None
+    unchanged: bool = False  # body identical to the stored page's, not parsed
+
+
+@lru_cache(maxsize=None)
+def ssl_context() -> ssl.SSLContext:
+    """Shared by every client: loading the CA bundle takes tens of ms and
+    would block the event loop on each new client"""
+    return httpx.create_ssl_context()
+
+
+@lru_cache(maxsize=None)
+def page_parser(parser: str) -> LinkedInScraper:
+    """Scraper used only to parse, one per parser backend and process"""
+    return LinkedInScraper(parser=parser)
+
+
+def parse_company_page(page_id: str, url: str, html: bytes) -> Dict:
+    """Parse a fetched page; module level so it can run in a process pool"""
+    return page_parser(settings.html_parser).parse_page(page_id, url, html)
+
+
+class AsyncLinkedInScraper:
+    """Bulk company page scraper built on httpx.AsyncClient.
+
+    Fetches run concurrently on the event loop (bounded by ``concurrency``
+    and the shared per-host rate limit),
+    HTML parsing runs in ``parse_executor`` (the loop's default thread pool
+    when not given) and results are yielded as soon as each page finishes.
+    Failed pages are reported with ``error`` set instead of mock data.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None,
+                 parse_executor: Optional[Executor] = None,
+                 client: Optional[httpx.AsyncClient] = None,
+                 fetch_cache: Optional[FetchCache] = None,
+                 rate_limiter: Optional[TokenBucketLimiter] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 archive: Optional[PageArchive] = None):
+        self.concurrency = concurrency or settings.scrape_concurrency
+        self.rate_limiter = rate_limiter or TokenBucketLimiter()
+        self.breaker = breaker or linkedin_breaker
+        self.parse_executor = parse_executor
+        self._client = client
+        if fetch_cache is None and settings.fetch_cache_enabled:
+            fetch_cache = FetchCache()
+        self.fetch_cache = fetch_cache
+        if archive is None and settings.archive_enabled:
+            archive = PageArchive()
+        self.archive = archive
+
+    async def scrape_page(self, client: httpx.AsyncClient, page_id: str,
+                          stored_hash: Optional[str] = None) -> ScrapeResult:
+        """Fetch and parse a single company page"""
+        try:
+            data = await self.fetch_and_parse(client, page_id, stored_hash)
+        except Exception as e:
+            print(f"Scraping error for {page_id}: {str(e)}")
+            return ScrapeResult(page_id, None, str(e))
+        return ScrapeResult(page_id, data, unchanged=data is None)
+
+    async def fetch_page(self, page_id: str, stored_hash: Optional[str] = None) -> Optional[Dict]:
+        """Scrape one page outside of scrape_many
+
+        Returns None when the fetched body has the hash ``stored_hash``.
+        Raises CircuitOpenError or ScrapeError like LinkedInScraper.scrape_page.
+        """
+        try:
+            async with self._http_client() as client:
+                return await self.fetch_and_parse(client, page_id, stored_hash)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            print(f"Scraping error for {page_id}: {str(e)}")
+            response = getattr(e, "response", None)
+            raise ScrapeError(page_id, str(e), getattr(response, "status_code", None)) from e
+
+    async def fetch_and_parse(self, client: httpx.AsyncClient, page_id: str,
+                              stored_hash: Optional[str] = None) -> Optional[Dict]:
+        url = company_url(page_id)
+        probe = self.breaker.before_request()
+        try:
+            await self.rate_limiter.acquire_async(host_of(url))
+            fetched = await self._fetch(client, url)
+        finally:
+            self.breaker.release_probe(probe)
+        if self.archive:
+            await asyncio.to_thread(self.archive.record_fetch, page_id, url, fetched)
+        if stored_hash and fetched.body_hash == stored_hash:
+            return None
+
+        loop = asyncio.get_running_loop()
+        page_data = await loop.run_in_executor(
+            self.parse_executor, parse_company_page, page_id, url, fetched.body
+        )
+        page_data["content_hash"] = fetched.body_hash
+        return page_data
+
+    @asynccontextmanager
+    async def _http_client(self) -> AsyncIterator[httpx.AsyncClient]:
+        """The client given to the constructor, or a new one closed on exit"""
+        if self._client is not None:
+            yield self._client
+            return
+        client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=settings.scrape_timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.concurrency),
+            verify=ssl_context(),
+        )
+        try:
+            yield client
+        finally:
+            await client.aclose()
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str) -> CachedFetch:
+        # The cache reads and writes files: keep that off the event loop
+        headers = await asyncio.to_thread(self.fetch_cache.conditional_headers, url) if self.fetch_cache else {}
+        try:
+            response = await client.get(url, headers=headers)
+        except httpx.RequestError:
+            self.breaker.record_failure()
+            raise
+
+        self.breaker.record_response(response.status_code, response.headers)
+        if response.status_code in THROTTLE_STATUS_CODES:
+            raise httpx.HTTPStatusError(
+                f"{response.status_code} throttled for url: {url}", request=response.request, response=response
+            )
+        response.raise_for_status()
+
+        if self.fetch_cache is None:
+            return CachedFetch(response.content, hashlib.sha256(response.content).hexdigest(), True)
+        return await asyncio.to_thread(
+            self.fetch_cache.store, url, response.status_code, response.headers, response.content
+        )
+
+    async def scrape_many(self, page_ids: Iterable[str],
+                          stored_hashes: Optional[Dict[str, str]] = None) -> AsyncIterator[ScrapeResult]:
+        """Scrape every page id, yielding results in completion order
+
+        Pages whose fetched body has the hash given for them in
+        ``stored_hashes`` are not parsed; they come back with
+        ``unchanged=True``.
+        """
+        stored_hashes = stored_hashes or {}
+        pending: asyncio.Queue = asyncio.Queue()
+        for page_id in page_ids:
+            pending.put_nowait(page_id)
+        if pending.empty():
+            return
+
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def worker():
+            while True:
+                try:
+                    page_id = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await results.put(await self.scrape_page(client, page_id, stored_hashes.get(page_id)))
+
+        total = pending.qsize()
+        async with self._http_client() as client:
+            workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, total))]
+            try:
+                for _ in range(total):
+                    yield await results.get()
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,191 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+from app.config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Responses that mean we are being throttled or blocked; they open the
+# circuit straight away instead of counting towards the error rate
+THROTTLE_STATUS_CODES = {429, 999}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a request while the circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """Fail-fast guard around an unreliable remote.
+
+    Closed: requests flow and outcomes are tracked over a sliding window.
+    The circuit opens when the failure rate over at least ``min_requests``
+    reaches ``failure_rate``, or at once on a throttling response. Open:
+    requests are rejected with CircuitOpenError for a backoff that doubles
+    with every consecutive opening (capped, and never shorter than a
+    Retry-After the server sent). Half-open: after the backoff one probe
+    request is let through; success closes the circuit, failure reopens it.
+    A probe that ends without an outcome (cancelled, or failed before a
+    response) must be handed to ``release_probe`` and counts as a failure.
+    """
+
+    def __init__(self, name: str, failure_rate: Optional[float] = None,
+                 min_requests: Optional[int] = None, window_seconds: Optional[float] = None,
+                 base_backoff: Optional[float] = None, max_backoff: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_rate = failure_rate or settings.breaker_failure_rate
+        self.min_requests = min_requests or settings.breaker_min_requests
+        self.window_seconds = window_seconds or settings.breaker_window_seconds
+        self.base_backoff = base_backoff or settings.breaker_base_backoff
+        self.max_backoff = max_backoff or settings.breaker_max_backoff
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._outcomes = deque()  # (timestamp, succeeded)
+        self._state = CLOSED
+        self._opened_until = 0.0
+        self._consecutive_opens = 0
+        self._probe_in_flight = False
+        self._probes = 0  # id of the latest probe
+        self._counters = {"requests": 0, "successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def before_request(self) -> Optional[int]:
+        """Raise CircuitOpenError unless a request may be made now
+        
+        Returns the probe id when this request is the half-open probe, to be
+        passed to ``release_probe`` once the request is over (None otherwise).
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == OPEN or (state == HALF_OPEN and self._probe_in_flight):
+                self._counters["rejected"] += 1
+                raise CircuitOpenError(self.name, max(1.0, self._opened_until - self.clock()))
+            self._counters["requests"] += 1
+            if state == HALF_OPEN:
+                self._probe_in_flight = True
+                self._probes += 1
+                return self._probes
+            return None
+    
+    def release_probe(self, probe: Optional[int]):
+        """End a request started by ``before_request``; a probe that recorded
+        no outcome counts as failed, so the circuit cannot stay half-open
+        with a probe that will never report back"""
+        if probe is None:
+            return
+        with self._lock:
+            if self._state == HALF_OPEN and self._probe_in_flight and self._probes == probe:
+                self._counters["failures"] += 1
+                self._record(False)
+                self._open(None)
+
+    def record_success(self):
+        with self._lock:
+            self._counters["successes"] += 1
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._consecutive_opens = 0
+                self._probe_in_flight = False
+                self._outcomes.clear()
+            self._record(True)
+
+    def record_failure(self, retry_after: Optional[float] = None, throttled: bool = False):
+        with self._lock:
+            self._counters["failures"] += 1
+            self._record(False)
+            if self._state == OPEN:
+                return  # a request that started before the circuit opened
+            if self._state == HALF_OPEN or throttled or self._failure_rate_exceeded():
+                self._open(retry_after)
+
+    def record_response(self, status_code: int, headers):
+        """Record the outcome of an HTTP response"""
+        if status_code in THROTTLE_STATUS_CODES:
+            self.record_failure(parse_retry_after(headers.get("Retry-After")), throttled=True)
+        elif status_code >= 500:
+            self.record_failure(parse_retry_after(headers.get("Retry-After")))
+        else:
+            self.record_success()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            state = self._current_state()
+            self._trim()
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return {
+                "name": self.name,
+                "state": state,
+                "window_requests": len(self._outcomes),
+                "window_failure_rate": round(failures / len(self._outcomes), 4) if self._outcomes else 0.0,
+                "open_for_seconds": round(max(0.0, self._opened_until - self.clock()), 1) if state == OPEN else 0.0,
+                "consecutive_opens": self._consecutive_opens,
+                **self._counters,
+            }
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self.clock() >= self._opened_until:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def _open(self, retry_after: Optional[float]):
+        backoff = min(self.max_backoff, self.base_backoff * (2 ** self._consecutive_opens))
+        if retry_after is not None:
+            backoff = max(backoff, retry_after)
+        self._state = OPEN
+        self._opened_until = self.clock() + backoff
+        self._consecutive_opens += 1
+        self._probe_in_flight = False
+        self._counters["opened"] += 1
+        print(f"Circuit '{self.name}' opened for {backoff:.0f}s")
+
+    def _record(self, succeeded: bool):
+        self._outcomes.append((self.clock(), succeeded))
+        self._trim()
+
+    def _trim(self):
+        horizon = self.clock() - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < horizon:
+            self._outcomes.popleft()
+
+    def _failure_rate_exceeded(self) -> bool:
+        if len(self._outcomes) < self.min_requests:
+            return False
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return failures / len(self._outcomes) >= self.failure_rate
+
+
+# One breaker per process for linkedin.com, shared by every scraper
+linkedin_breaker = CircuitBreaker("linkedin")
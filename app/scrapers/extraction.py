@@ -0,0 +1,180 @@
+import re
+import random
+from typing import Dict, List, Optional
+
+from app.scrapers.parsers import HtmlDocument
+
+# Keyword tables - identical to the ones used by the per-field extractors
+INDUSTRY_KEYWORDS = ('industry:', 'sector:', 'category:', 'field:')
+HEADCOUNT_KEYWORDS = ('employees', 'headcount', 'team size', 'company size', 'staff')
+SPECIALITY_KEYWORDS = ('specialties:', 'expertise:', 'services:', 'what we do:')
+COMPANY_TYPE_KEYWORDS = ('type:', 'company type:', 'ownership:')
+HEADQUARTERS_KEYWORDS = ('headquarters:', 'hq:', 'location:', 'based in:')
+LOCATION_KEYWORDS = ('location', 'office', 'based')
+
+FOLLOWER_PATTERNS = [re.compile(p) for p in (
+    r'(\d+[\d,]*)\s*followers',
+    r'(\d+[\d,]*)\s*people\s*follow\s*this',
+    r'followers.*?(\d+[\d,]*)',
+    r'follower\s*count.*?(\d+[\d,]*)'
+)]
+FOUNDED_PATTERNS = [re.compile(p) for p in (
+    r'founded\s*(\d{4})',
+    r'established\s*(\d{4})',
+    r'founding\s*date.*?(\d{4})',
+    r'since\s*(\d{4})'
+)]
+FOUNDED_KEYWORDS = ('founded', 'established', 'founding', 'since')
+
+NUMBER_PATTERN = re.compile(r'\d+')
+SEPARATOR_PATTERN = re.compile(r'[,;•·]')
+INDUSTRY_CLASS_PATTERN = re.compile(r'industry|sector|field')
+LOCATION_CLASS_PATTERN = re.compile(r'location|headquarter|office')
+
+# Any text node that matches none of these cannot contribute to any field,
+# so one search on the lowercased text lets us skip the bulk of the document.
+TRIGGER_PATTERN = re.compile('|'.join(re.escape(k) for k in (
+    INDUSTRY_KEYWORDS + HEADCOUNT_KEYWORDS + SPECIALITY_KEYWORDS
+    + COMPANY_TYPE_KEYWORDS + HEADQUARTERS_KEYWORDS + LOCATION_KEYWORDS
+    + FOUNDED_KEYWORDS + ('follow',)
+)))
+
+MAX_SPECIALITIES = 5
+MAX_LOCATIONS = 3
+
+
+def headcount_bucket(numbers: List[str]) -> str:
+    """Turn the numbers found next to a headcount keyword into a range"""
+    if len(numbers) >= 2:
+        return f"{numbers[0]}-{numbers[1]}"
+    num = int(numbers[0])
+    if num <= 10:
+        return "1-10"
+    elif num <= 50:
+        return "11-50"
+    elif num <= 200:
+        return "51-200"
+    return "201-500"
+
+
+def _value_after_colon(text: str, text_lower: str, keywords) -> Optional[str]:
+    if any(keyword in text_lower for keyword in keywords):
+        value = text.split(':')[-1].strip()
+        if value:
+            return value
+    return None
+
+
+def _split_parts(text: str) -> List[str]:
+    return [part.strip() for part in SEPARATOR_PATTERN.split(text)]
+
+
+def extract_text_fields(soup: HtmlDocument) -> Dict:
+    """Extract every text-derived page field in a single pass.
+
+    Produces the same values as the ``LinkedInScraper._extract_*`` methods
+    for industry, followers, head count, specialities, company type,
+    founded year, headquarters and locations, but walks
+    ``soup.stripped_strings`` once instead of once per field.
+    """
+    industry = None
+    followers = None
+    head_count = None
+    specialities: List[str] = []
+    company_type = None
+    founded_year = None
+    headquarters = None
+    locations: List[str] = []
+
+    for text in soup.stripped_strings:
+        text_lower = text.lower()
+        if not TRIGGER_PATTERN.search(text_lower):
+            continue
+
+        if industry is None:
+            industry = _value_after_colon(text, text_lower, INDUSTRY_KEYWORDS)
+
+        if followers is None and 'follow' in text_lower:
+            for pattern in FOLLOWER_PATTERNS:
+                match = pattern.search(text_lower)
+                if match:
+                    followers = int(match.group(1).replace(',', ''))
+                    break
+
+        if head_count is None and any(k in text_lower for k in HEADCOUNT_KEYWORDS):
+            numbers = NUMBER_PATTERN.findall(text)
+            if numbers:
+                head_count = headcount_bucket(numbers)
+
+        if len(specialities) < MAX_SPECIALITIES:
+            hits = sum(1 for k in SPECIALITY_KEYWORDS if k in text_lower)
+            if hits:
+                parts = [p for p in _split_parts(text) if len(p) > 2]
+                specialities.extend(parts * hits)
+
+        if company_type is None:
+            company_type = _value_after_colon(text, text_lower, COMPANY_TYPE_KEYWORDS)
+
+        if founded_year is None and any(k in text_lower for k in FOUNDED_KEYWORDS):
+            for pattern in FOUNDED_PATTERNS:
+                match = pattern.search(text_lower)
+                if match:
+                    founded_year = int(match.group(1))
+                    break
+
+        if headquarters is None:
+            headquarters = _value_after_colon(text, text_lower, HEADQUARTERS_KEYWORDS)
+
+        if len(locations) < MAX_LOCATIONS and any(k in text_lower for k in LOCATION_KEYWORDS):
+            for loc in _split_parts(text):
+                if len(loc) > 2 and loc not in locations:
+                    locations.append(loc)
+
+        if (industry is not None and followers is not None and head_count is not None
+                and company_type is not None and founded_year is not None
+                and headquarters is not None and len(specialities) >= MAX_SPECIALITIES
+                and len(locations) >= MAX_LOCATIONS):
+            break
+
+    # Fallbacks are resolved in field order so the random defaults are
+    # drawn in the same sequence as the per-field extractors draw them.
+    if industry is None:
+        industry = _first_class_text(soup, INDUSTRY_CLASS_PATTERN) or "Technology"
+    if followers is None:
+        followers = random.randint(500, 50000)
+    if head_count is None:
+        head_count = "11-50"
+    if not specialities:
+        specialities = random.sample([
+            "Software Development",
+            "Artificial Intelligence",
+            "Machine Learning",
+            "Data Analytics",
+            "Cloud Computing"
+        ], 3)
+    if company_type is None:
+        company_type = "Private Company"
+    if founded_year is None:
+        founded_year = random.randint(2000, 2023)
+    if headquarters is None:
+        headquarters = _first_class_text(soup, LOCATION_CLASS_PATTERN) or "Not specified"
+
+    return {
+        "industry": industry,
+        "total_followers": followers,
+        "head_count": head_count,
+        "specialities": specialities[:MAX_SPECIALITIES],
+        "company_type": company_type,
+        "founded_year": founded_year,
+        "headquarters": headquarters,
+        "locations": locations[:MAX_LOCATIONS]
+    }
+
+
+def _first_class_text(soup: HtmlDocument, class_pattern) -> Optional[str]:
+    """Text of the first div/span whose class matches, if longer than 2 chars"""
+    for element in soup.find_all(['div', 'span'], class_=class_pattern):
+        text = element.get_text(strip=True)
+        if text and len(text) > 2:
+            return text
+    return None
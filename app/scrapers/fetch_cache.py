@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from app.config import settings
+
+
+class CachedFetch(NamedTuple):
+    body: bytes
+    body_hash: str
+    changed: bool  # False when the body is identical to the previous fetch
+
+
+class FetchCache:
+    """On-disk cache of fetched pages used for conditional revalidation.
+
+    Each URL gets a directory (``<sha1(url)>/``) holding the last body under
+    its SHA-256 (``<hash>.html``) and an ``entry.json`` with that hash plus
+    the ETag/Last-Modified validators of the last response.
+    Callers send ``conditional_headers(url)`` and hand the response to
+    ``store()``, which reports whether the body changed since last time.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.root = Path(directory or settings.fetch_cache_dir)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validators for a conditional GET, empty when nothing is cached"""
+        entry = self._load_entry(url)
+        if not entry or not self._body_path(url, entry["body_hash"]).exists():
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, status_code: int, headers, body: bytes) -> CachedFetch:
+        """Record a response and return the current body for the URL"""
+        entry = self._load_entry(url)
+
+        if status_code == 304:
+            if not entry:
+                raise ValueError(f"304 Not Modified for uncached URL {url}")
+            entry["checked_at"] = datetime.utcnow().isoformat()
+            self._write_entry(url, entry)
+            return CachedFetch(self._body_path(url, entry["body_hash"]).read_bytes(), entry["body_hash"], False)
+
+        body_hash = hashlib.sha256(body).hexdigest()
+        body_path = self._body_path(url, body_hash)
+        if not body_path.exists():
+            body_path.parent.mkdir(parents=True, exist_ok=True)
+            self._atomic_write(body_path, body)
+
+        changed = not entry or entry["body_hash"] != body_hash
+        self._write_entry(url, {
+            "url": url,
+            "body_hash": body_hash,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "checked_at": datetime.utcnow().isoformat(),
+        })
+        if entry and changed:
+            self._body_path(url, entry["body_hash"]).unlink(missing_ok=True)
+        return CachedFetch(body, body_hash, changed)
+
+    def _url_dir(self, url: str) -> Path:
+        return self.root / hashlib.sha1(url.encode()).hexdigest()
+
+    def _body_path(self, url: str, body_hash: str) -> Path:
+        return self._url_dir(url) / f"{body_hash}.html"
+
+    def _entry_path(self, url: str) -> Path:
+        return self._url_dir(url) / "entry.json"
+
+    def _load_entry(self, url: str) -> Optional[Dict]:
+        try:
+            return json.loads(self._entry_path(url).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_entry(self, url: str, entry: Dict):
+        path = self._entry_path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._atomic_write(path, json.dumps(entry).encode())
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes):
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
@@ -0,0 +1,52 @@
+"""Stable ids for scraped posts, comments and employees.
+
+LinkedIn marks feed items with URNs (``data-urn="urn:li:activity:712..."``,
+``data-entity-urn``, ``data-id``); when one is present it is the id.
+Otherwise the id is a hash of what identifies the item within its parent
+(page or post), so re-scraping the same content yields the same id and
+refreshes update rows instead of adding new ones.
+"""
+import hashlib
+import re
+from collections import Counter
+from typing import Optional
+
+URN_ATTRIBUTES = ("data-urn", "data-entity-urn", "data-id")
+URN_PATTERN = re.compile(r"^urn:li:[A-Za-z_]+:[\w:(),-]+$")
+
+# Longest URN kept verbatim; ids are String(100) columns
+MAX_URN_LENGTH = 100
+
+
+def urn_of(node) -> Optional[str]:
+    """LinkedIn URN of a parsed element, if it carries one"""
+    for attribute in URN_ATTRIBUTES:
+        value = (node.get(attribute) or "").strip()
+        if URN_PATTERN.match(value) and len(value) <= MAX_URN_LENGTH:
+            return value
+    return None
+
+
+def content_id(prefix: str, *parts) -> str:
+    """``<prefix>_<hash>`` of the identifying parts of an item"""
+    digest = hashlib.sha1("\x1f".join(str(part or "") for part in parts).encode()).hexdigest()
+    return f"{prefix}_{digest[:24]}"
+
+
+class IdAllocator:
+    """Content ids for the items of one parent; the n-th identical item
+    within the parent gets occurrence n, so true repeats stay distinct"""
+
+    def __init__(self, prefix: str, parent_id: str):
+        self.prefix = prefix
+        self.parent_id = parent_id
+        self._seen = Counter()
+
+    def id_for(self, node, *parts) -> str:
+        urn = urn_of(node) if node is not None else None
+        if urn:
+            return urn
+        key = tuple(str(part or "") for part in parts)
+        occurrence = self._seen[key]
+        self._seen[key] += 1
+        return content_id(self.prefix, self.parent_id, *key, occurrence)
@@ -1,71 +1,147 @@
 import requests
-from bs4 import BeautifulSoup
+import hashlib
 import re
 import json
 from typing import Dict, List, Optional
 from datetime import datetime
-import time
 import random
 
+from app.config import settings
+from app.scrapers.extraction import extract_text_fields
+from app.scrapers.circuit_breaker import (
+    THROTTLE_STATUS_CODES, CircuitBreaker, CircuitOpenError, linkedin_breaker
+)
+from app.scrapers.archive import PageArchive
+from app.scrapers.fetch_cache import CachedFetch, FetchCache
+from app.scrapers.ids import IdAllocator
+from app.scrapers.rate_limiter import TokenBucketLimiter, host_of
+from app.scrapers.parsers import HtmlDocument, parse_html
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+}
+
+
+class ScrapeError(Exception):
+    """Fetching or parsing a company page failed; ``status_code`` is the
+    HTTP status when LinkedIn answered with an error"""
+
+    def __init__(self, page_id: str, message: str, status_code: Optional[int] = None):
+        super().__init__(f"Scraping {page_id} failed: {message}")
+        self.page_id = page_id
+        self.status_code = status_code
+
+
+def company_url(page_id: str) -> str:
+    """Public URL of a LinkedIn company page"""
+    return f"{settings.linkedin_base_url}/company/{page_id}/"
+
+
 class LinkedInScraper:
-    def __init__(self):
+    def __init__(self, parser: Optional[str] = None, fetch_cache: Optional[FetchCache] = None,
+                 rate_limiter: Optional[TokenBucketLimiter] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 archive: Optional[PageArchive] = None):
+        self.parser = parser or settings.html_parser
+        self.rate_limiter = rate_limiter or TokenBucketLimiter()
+        self.breaker = breaker or linkedin_breaker
+        if fetch_cache is None and settings.fetch_cache_enabled:
+            fetch_cache = FetchCache()
+        self.fetch_cache = fetch_cache
+        if archive is None and settings.archive_enabled:
+            archive = PageArchive()
+        self.archive = archive
         self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        })
+        self.session.headers.update(DEFAULT_HEADERS)
     
-    def scrape_page(self, page_id: str) -> Dict:
-        """Scrape LinkedIn company page by its ID"""
-        url = f"https://www.linkedin.com/company/{page_id}/"
+    def scrape_page(self, page_id: str, stored_hash: Optional[str] = None) -> Optional[Dict]:
+        """Scrape LinkedIn company page by its ID
+        
+        With stored_hash (the content_hash of the stored page), returns None
+        instead of re-parsing when the fetched body has that hash. The
+        result carries the body's ``content_hash`` to store with the page. Raises
+        CircuitOpenError without making a request while LinkedIn is failing,
+        and ScrapeError when the page could not be fetched or parsed.
+        """
+        url = company_url(page_id)
         print(f"Scraping: {url}")
         
         try:
-            # Add delay to avoid being blocked
-            time.sleep(random.uniform(2, 4))
-            
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract basic page info
-            page_data = {
-                "id": page_id,
-                "name": self._extract_name(soup),
-                "url": url,
-                "profile_picture": self._extract_profile_picture(soup),
-                "description": self._extract_description(soup),
-                "website": self._extract_website(soup),
-                "industry": self._extract_industry(soup),
-                "total_followers": self._extract_followers(soup),
-                "head_count": self._extract_headcount(soup),
-                "specialities": self._extract_specialities(soup),
-                "company_type": self._extract_company_type(soup),
-                "founded_year": self._extract_founded_year(soup),
-                "headquarters": self._extract_headquarters(soup),
-                "locations": self._extract_locations(soup),
-                "scraped_at": datetime.utcnow().isoformat()
-            }
-            
-            # Extract posts (limited to 15 for demo)
-            page_data["posts"] = self._extract_posts(soup, limit=15)
-            
-            # Extract employees
-            page_data["employees"] = self._extract_employees(soup)
+            # Fail fast while LinkedIn is throttling us or down
+            probe = self.breaker.before_request()
+            try:
+                # Wait for our share of the global request budget for this host
+                self.rate_limiter.acquire(host_of(url))
+                
+                fetched = self._fetch(url)
+            finally:
+                self.breaker.release_probe(probe)
+            if self.archive:
+                self.archive.record_fetch(page_id, url, fetched)
+            if stored_hash and fetched.body_hash == stored_hash:
+                return None
             
+            page_data = self.parse_page(page_id, url, fetched.body)
+            page_data["content_hash"] = fetched.body_hash
             return page_data
             
+        except CircuitOpenError:
+            raise
         except Exception as e:
             print(f"Scraping error for {page_id}: {str(e)}")
-            # Return mock data for testing
-            return self._get_mock_data(page_id)
+            response = getattr(e, "response", None)
+            raise ScrapeError(page_id, str(e), getattr(response, "status_code", None)) from e
+    
+    def _fetch(self, url: str) -> CachedFetch:
+        """GET a page, revalidating against the fetch cache when enabled"""
+        headers = self.fetch_cache.conditional_headers(url) if self.fetch_cache else {}
+        try:
+            response = self.session.get(url, timeout=settings.scrape_timeout, headers=headers)
+        except requests.RequestException:
+            self.breaker.record_failure()
+            raise
+        
+        self.breaker.record_response(response.status_code, response.headers)
+        if response.status_code in THROTTLE_STATUS_CODES:
+            raise requests.HTTPError(f"{response.status_code} throttled for url: {url}", response=response)
+        response.raise_for_status()
+        
+        if self.fetch_cache is None:
+            return CachedFetch(response.content, hashlib.sha256(response.content).hexdigest(), True)
+        return self.fetch_cache.store(url, response.status_code, response.headers, response.content)
+    
+    def parse_page(self, page_id: str, url: str, html) -> Dict:
+        """Build page data from a fetched company page"""
+        return self.extract_page(page_id, url, parse_html(html, self.parser))
+    
+    def extract_page(self, page_id: str, url: str, soup: HtmlDocument) -> Dict:
+        """Build page data from an already parsed document"""
+        # Extract basic page info
+        page_data = {
+            "id": page_id,
+            "name": self._extract_name(soup),
+            "url": url,
+            "profile_picture": self._extract_profile_picture(soup),
+            "description": self._extract_description(soup),
+            "website": self._extract_website(soup, page_id),
+        }
+        # Text-derived fields come from one pass over the document
+        page_data.update(extract_text_fields(soup))
+        page_data["scraped_at"] = datetime.utcnow().isoformat()
+        
+        # Extract posts (limited to 15 for demo)
+        page_data["posts"] = self._extract_posts(soup, page_id, limit=15)
+        
+        # Extract employees
+        page_data["employees"] = self._extract_employees(soup, page_id)
+        
+        return page_data
     
     # ========== PAGE DATA EXTRACTION METHODS ==========
     
-    def _extract_name(self, soup: BeautifulSoup) -> str:
+    def _extract_name(self, soup: HtmlDocument) -> str:
         """Extract company name"""
         # Try multiple selectors
         selectors = ['h1', '.org-top-card-summary__title', '.top-card-layout__title']
@@ -75,7 +151,10 @@ class LinkedInScraper:
                 return element.get_text(strip=True)
         return f"Company-{random.randint(1000, 9999)}"
     
-    def _extract_industry(self, soup: BeautifulSoup) -> str:
+    # The per-field extractors below are the reference implementations of
+    # extract_text_fields(); scrape_page uses the single-pass version.
+
+    def _extract_industry(self, soup: HtmlDocument) -> str:
         """Extract industry using English keywords"""
         industry_keywords = ['industry:', 'sector:', 'category:', 'field:']
         
@@ -99,7 +178,7 @@ class LinkedInScraper:
         
         return "Technology"  # Default
     
-    def _extract_followers(self, soup: BeautifulSoup) -> int:
+    def _extract_followers(self, soup: HtmlDocument) -> int:
         """Extract follower count using English keywords"""
         # Look for follower text patterns in English
         patterns = [
@@ -122,7 +201,7 @@ class LinkedInScraper:
         # Return random for demo
         return random.randint(500, 50000)
     
-    def _extract_headcount(self, soup: BeautifulSoup) -> str:
+    def _extract_headcount(self, soup: HtmlDocument) -> str:
         """Extract employee count range using English keywords"""
         keywords = ['employees', 'headcount', 'team size', 'company size', 'staff']
         
@@ -147,7 +226,7 @@ class LinkedInScraper:
         
         return "11-50"  # Default
     
-    def _extract_description(self, soup: BeautifulSoup) -> str:
+    def _extract_description(self, soup: HtmlDocument) -> str:
         """Extract company description"""
         # Look for description in common elements
         desc_selectors = ['.org-about-us-organization-description__text',
@@ -164,7 +243,7 @@ class LinkedInScraper:
         
         return "Company description not available."
     
-    def _extract_website(self, soup: BeautifulSoup) -> str:
+    def _extract_website(self, soup: HtmlDocument, page_id: str) -> str:
         """Extract company website"""
         # Look for website links
         website_elements = soup.find_all('a', href=re.compile(r'http'))
@@ -178,7 +257,7 @@ class LinkedInScraper:
         
         return f"https://{page_id}.com"  # Default
     
-    def _extract_profile_picture(self, soup: BeautifulSoup) -> str:
+    def _extract_profile_picture(self, soup: HtmlDocument) -> str:
         """Extract company logo/profile picture"""
         img_selectors = ['img.org-top-card-primary-content__logo',
                         'img.top-card-layout__entity-image',
@@ -191,7 +270,7 @@ class LinkedInScraper:
         
         return "https://via.placeholder.com/150"  # Default placeholder
     
-    def _extract_specialities(self, soup: BeautifulSoup) -> List[str]:
+    def _extract_specialities(self, soup: HtmlDocument) -> List[str]:
         """Extract company specialties"""
         specialties = []
         
@@ -222,7 +301,7 @@ class LinkedInScraper:
         
         return specialties[:5]  # Limit to 5
     
-    def _extract_company_type(self, soup: BeautifulSoup) -> str:
+    def _extract_company_type(self, soup: HtmlDocument) -> str:
         """Extract company type"""
         type_keywords = ['type:', 'company type:', 'ownership:']
         
@@ -236,7 +315,7 @@ class LinkedInScraper:
         
         return "Private Company"  # Default
     
-    def _extract_founded_year(self, soup: BeautifulSoup) -> Optional[int]:
+    def _extract_founded_year(self, soup: HtmlDocument) -> Optional[int]:
         """Extract founded year"""
         patterns = [
             r'founded\s*(\d{4})',
@@ -257,7 +336,7 @@ class LinkedInScraper:
         # Return random year for demo
         return random.randint(2000, 2023)
     
-    def _extract_headquarters(self, soup: BeautifulSoup) -> str:
+    def _extract_headquarters(self, soup: HtmlDocument) -> str:
         """Extract headquarters location"""
         location_keywords = ['headquarters:', 'hq:', 'location:', 'based in:']
         
@@ -279,7 +358,7 @@ class LinkedInScraper:
         
         return "Not specified"  # Default
     
-    def _extract_locations(self, soup: BeautifulSoup) -> List[str]:
+    def _extract_locations(self, soup: HtmlDocument) -> List[str]:
         """Extract all company locations"""
         locations = []
         
@@ -302,18 +381,21 @@ class LinkedInScraper:
     
     # ========== POSTS AND COMMENTS EXTRACTION ==========
     
-    def _extract_posts(self, soup: BeautifulSoup, limit: int = 15) -> List[Dict]:
+    def _extract_posts(self, soup: HtmlDocument, page_id: str, limit: int = 15) -> List[Dict]:
         """Extract recent posts"""
         posts = []
+        # Post URN when present, otherwise a hash of the content within the page
+        ids = IdAllocator("post", page_id)
         
         # Find post containers
         post_containers = soup.find_all(['article', 'div'], class_=re.compile(r'feed-shared|update-components'))
         
-        for i, container in enumerate(post_containers[:limit]):
-            post_id = f"post_{i}_{int(time.time())}"
+        for container in post_containers[:limit]:
+            content = self._extract_post_content(container)
+            post_id = ids.id_for(container, content)
             post_data = {
                 "id": post_id,
-                "content": self._extract_post_content(container),
+                "content": content,
                 "post_type": "post",
                 "like_count": random.randint(5, 500),
                 "comment_count": random.randint(0, 100),
@@ -345,6 +427,7 @@ class LinkedInScraper:
     def _extract_comments(self, container, post_id: str) -> List[Dict]:
         """Extract comments for a post"""
         comments = []
+        ids = IdAllocator("comment", post_id)
         # Mock comments for demo
         comment_authors = ["John Doe", "Jane Smith", "Alex Johnson", "Maria Garcia"]
         comment_templates = [
@@ -356,11 +439,13 @@ class LinkedInScraper:
         ]
         
         for i in range(random.randint(0, 5)):
+            user_profile_url = f"https://linkedin.com/in/user{i}"
+            content = random.choice(comment_templates)
             comment = {
-                "id": f"comment_{post_id}_{i}",
+                "id": ids.id_for(None, user_profile_url, content),
                 "user_name": random.choice(comment_authors),
-                "user_profile_url": f"https://linkedin.com/in/user{i}",
-                "content": random.choice(comment_templates),
+                "user_profile_url": user_profile_url,
+                "content": content,
                 "commented_at": datetime.utcnow().isoformat()
             }
             comments.append(comment)
@@ -369,9 +454,12 @@ class LinkedInScraper:
     
     # ========== EMPLOYEES EXTRACTION ==========
     
-    def _extract_employees(self, soup: BeautifulSoup) -> List[Dict]:
+    def _extract_employees(self, soup: HtmlDocument, page_id: str) -> List[Dict]:
         """Extract employee information"""
         employees = []
+        # Employees are scoped to the page: one person listed by two
+        # companies is two rows
+        ids = IdAllocator("emp", page_id)
         # Mock employees for demo
         positions = ["Software Engineer", "Product Manager", "Data Scientist", 
                     "Marketing Director", "Sales Executive", "CEO", "CTO"]
@@ -379,44 +467,14 @@ class LinkedInScraper:
         last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller"]
         
         for i in range(random.randint(3, 10)):
+            profile_url = f"https://linkedin.com/in/employee{i}"
             employee = {
-                "id": f"emp_{i}_{int(time.time())}",
+                "id": ids.id_for(None, profile_url),
                 "name": f"{random.choice(first_names)} {random.choice(last_names)}",
-                "profile_url": f"https://linkedin.com/in/employee{i}",
+                "profile_url": profile_url,
                 "position": random.choice(positions),
                 "profile_picture": f"https://randomuser.me/api/portraits/men/{i}.jpg" if i % 2 == 0 else f"https://randomuser.me/api/portraits/women/{i}.jpg"
             }
             employees.append(employee)
         
         return employees
-    
-    # ========== MOCK DATA FOR TESTING ==========
-    
-    def _get_mock_data(self, page_id: str) -> Dict:
-        """Return mock data when scraping fails (for testing)"""
-        # Generate consistent mock data based on page_id
-        seed_value = sum(ord(c) for c in page_id)
-        random.seed(seed_value)
-        
-        industries = ["Technology", "Software", "Consulting", "Finance", "Healthcare"]
-        company_types = ["Private Company", "Public Company", "Startup", "Non-profit"]
-        locations_list = ["San Francisco, CA", "New York, NY", "Austin, TX", "Remote"]
-        
-        return {
-            "id": page_id,
-            "name": f"{page_id.replace('-', ' ').title()} Inc.",
-            "url": f"https://linkedin.com/company/{page_id}",
-            "profile_picture": "https://via.placeholder.com/150",
-            "description": f"{page_id.replace('-', ' ').title()} is a leading company in its industry, focused on innovation and customer satisfaction.",
-            "website": f"https://{page_id}.com",
-            "industry": random.choice(industries),
-            "total_followers": random.randint(1000, 50000),
-            "head_count": random.choice(["1-10", "11-50", "51-200", "201-500"]),
-            "specialities": ["Software Development", "AI/ML", "Cloud Solutions", "Data Analytics"][:random.randint(2, 4)],
-            "company_type": random.choice(company_types),
-            "founded_year": random.randint(2000, 2020),
-            "headquarters": random.choice(locations_list),
-            "locations": random.sample(locations_list, random.randint(1, 3)),
-            "posts": self._extract_posts(BeautifulSoup("<div></div>", 'html.parser'), limit=10),
-            "employees": self._extract_employees(BeautifulSoup("<div></div>", 'html.parser'))
-        }
\ No newline at end of file
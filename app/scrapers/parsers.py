@@ -0,0 +1,91 @@
+"""Interchangeable HTML parser backends for the scraper.
+
+Every backend returns a document exposing the small part of the
+BeautifulSoup API the extractors use: ``select_one``, ``select``,
+``find_all`` (tag names plus ``class_``/``href`` regex filters),
+``stripped_strings``, ``get_text(strip=True)``, ``get`` and ``[attr]``.
+
+* ``html.parser`` - BeautifulSoup with the stdlib parser (pure Python)
+* ``lxml``        - BeautifulSoup with the lxml tree builder
+* ``selectolax``  - selectolax (lexbor/modest) wrapped in ``SelectolaxNode``
+"""
+from typing import Iterator, List, Optional, Union
+
+from bs4 import BeautifulSoup
+
+from app.config import settings
+
+PARSER_BACKENDS = ("html.parser", "lxml", "selectolax")
+
+# Text inside these tags is not page content (BeautifulSoup skips it too)
+NON_CONTENT_TAGS = {"script", "style", "template", "noscript"}
+
+
+class SelectolaxNode:
+    """BeautifulSoup-compatible view of a selectolax node"""
+
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def select_one(self, selector: str) -> Optional["SelectolaxNode"]:
+        found = self.node.css_first(selector)
+        return SelectolaxNode(found) if found is not None else None
+
+    def select(self, selector: str) -> List["SelectolaxNode"]:
+        return [SelectolaxNode(n) for n in self.node.css(selector)]
+
+    def find_all(self, name, class_=None, href=None) -> List["SelectolaxNode"]:
+        names = [name] if isinstance(name, str) else list(name)
+        matches = []
+        for node in self.node.css(", ".join(names)):
+            attributes = node.attributes
+            if class_ is not None and not _class_matches(attributes.get("class"), class_):
+                continue
+            if href is not None and not (attributes.get("href") and href.search(attributes["href"])):
+                continue
+            matches.append(SelectolaxNode(node))
+        return matches
+
+    @property
+    def stripped_strings(self) -> Iterator[str]:
+        for node in self.node.traverse(include_text=True):
+            if node.tag != "-text" or node.parent is None or node.parent.tag in NON_CONTENT_TAGS:
+                continue
+            text = node.text_content.strip()
+            if text:
+                yield text
+
+    def get_text(self, strip: bool = False) -> str:
+        return self.node.text(deep=True, separator="", strip=strip)
+
+    def get(self, key: str, default=None):
+        value = self.node.attributes.get(key)
+        return default if value is None else value
+
+    def __getitem__(self, key: str):
+        return self.node.attributes[key]
+
+
+def _class_matches(class_value: Optional[str], pattern) -> bool:
+    """Match a class regex the way BeautifulSoup does for multi-valued attributes"""
+    if not class_value:
+        return False
+    return any(pattern.search(c) for c in class_value.split()) or bool(pattern.search(class_value))
+
+
+HtmlDocument = Union[BeautifulSoup, SelectolaxNode]
+
+
+def parse_html(markup, backend: Optional[str] = None) -> HtmlDocument:
+    """Parse markup with the configured (or given) backend"""
+    backend = backend or settings.html_parser
+    if backend == "html.parser":
+        return BeautifulSoup(markup, "html.parser")
+    if backend == "lxml":
+        return BeautifulSoup(markup, "lxml")
+    if backend == "selectolax":
+        from selectolax.parser import HTMLParser
+        return SelectolaxNode(HTMLParser(markup).root)
+    raise ValueError(f"Unknown HTML parser backend '{backend}', expected one of {PARSER_BACKENDS}")
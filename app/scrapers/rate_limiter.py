@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import redis
+
+from app.config import settings
+from app.redis_client import get_redis
+
+# Refill the bucket for the elapsed time, then take the tokens if there are
+# enough. Returns the seconds to wait before the request would succeed
+# (0 when granted). Uses the Redis clock so every process agrees on time.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+# In-process buckets used while Redis is unreachable: (key) -> (tokens, ts)
+_local_buckets: Dict[str, Tuple[float, float]] = {}
+_local_lock = threading.Lock()
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).hostname or url
+
+
+class TokenBucketLimiter:
+    """Per-host token bucket shared by every process through Redis.
+
+    ``rate`` tokens per second refill a bucket of ``capacity`` tokens for
+    each target host. ``try_acquire`` never waits; ``acquire`` waits for a
+    token (optionally bounded by ``timeout``) or, with ``blocking=False``,
+    returns immediately. When Redis is unreachable the limiter falls back to
+    a bucket local to this process.
+    """
+
+    def __init__(self, rate: Optional[float] = None, capacity: Optional[int] = None,
+                 prefix: str = "ratelimit"):
+        self.rate = rate or settings.scrape_rate_per_host
+        self.capacity = capacity or settings.scrape_burst
+        self.prefix = prefix
+        self._script = None
+        self._script_client = None
+
+    def try_acquire(self, host: str, tokens: int = 1) -> float:
+        """Take tokens if available; returns 0 on success, else seconds to wait"""
+        key = f"{self.prefix}:{host}"
+        client = get_redis()
+        if client is not None:
+            try:
+                return float(self._redis_script(client)(keys=[key], args=[self.rate, self.capacity, tokens]))
+            except redis.RedisError as e:
+                print(f"Rate limiter falling back to local bucket: {str(e)}")
+        return self._local_try_acquire(key, tokens)
+
+    def acquire(self, host: str, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """Take one token for host, waiting for it unless blocking is False"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(host)
+            if wait <= 0:
+                return True
+            if not blocking or (deadline is not None and time.monotonic() + wait > deadline):
+                return False
+            time.sleep(wait)
+
+    async def acquire_async(self, host: str, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """Event-loop friendly acquire(); Redis calls run in a worker thread"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire, host)
+            if wait <= 0:
+                return True
+            if not blocking or (deadline is not None and time.monotonic() + wait > deadline):
+                return False
+            await asyncio.sleep(wait)
+
+    def _redis_script(self, client: redis.Redis):
+        if self._script is None or self._script_client is not client:
+            self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+            self._script_client = client
+        return self._script
+
+    def _local_try_acquire(self, key: str, tokens: int) -> float:
+        with _local_lock:
+            now = time.monotonic()
+            available, ts = _local_buckets.get(key, (self.capacity, now))
+            available = min(self.capacity, available + (now - ts) * self.rate)
+            if available >= tokens:
+                _local_buckets[key] = (available - tokens, now)
+                return 0.0
+            _local_buckets[key] = (available, now)
+            return (tokens - available) / self.rate
@@ -0,0 +1,51 @@
+"""Per-page read counters kept in Redis for the refresh scheduler.
+
+Reads increment a sorted set (``page_access``); the scheduler decays the
+scores over time so they track recent popularity. Tracking is skipped
+while Redis is unreachable.
+"""
+from typing import Dict
+
+import redis
+
+from app.redis_client import get_redis
+
+ACCESS_KEY = "page_access"
+
+
+def record_access(page_id: str):
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.zincrby(ACCESS_KEY, 1, page_id)
+    except redis.RedisError as e:
+        print(f"Could not record access to {page_id}: {str(e)}")
+
+
+def access_scores() -> Dict[str, float]:
+    client = get_redis()
+    if client is None:
+        return {}
+    try:
+        return {
+            member.decode(): score
+            for member, score in client.zrangebyscore(ACCESS_KEY, 0.01, "+inf", withscores=True)
+        }
+    except redis.RedisError as e:
+        print(f"Could not read access scores: {str(e)}")
+        return {}
+
+
+def decay_access_scores(factor: float):
+    """Multiply every score by factor and drop members that faded out"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline()
+        pipe.zunionstore(ACCESS_KEY, {ACCESS_KEY: factor})
+        pipe.zremrangebyscore(ACCESS_KEY, "-inf", 0.01)
+        pipe.execute()
+    except redis.RedisError as e:
+        print(f"Could not decay access scores: {str(e)}")
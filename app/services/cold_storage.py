@@ -0,0 +1,283 @@
+"""Cold storage: old posts and comments moved out of the database to Parquet.
+
+``archive_old_rows`` (run by ``python -m app.retention``) moves, page by
+page, posts published before ``POST_RETENTION_DAYS`` together with all
+their comments, and comments written before ``COMMENT_RETENTION_DAYS``,
+into Parquet files partitioned by kind, page and month::
+
+    <COLD_STORAGE_DIR>/posts/page_id=acme/month=2023-04/<part>.parquet
+
+What stays in the database is small:
+
+* a ``cold_partitions`` row per file with its row count and, for posts,
+  the likes/comments/shares it holds, so the counters and engagement
+  rollups (which keep counting archived posts) still reconcile;
+* ``pages.posts_archived_before`` / ``comments_archived_before``, the
+  cutoffs already applied to the page, so a refresh does not insert an
+  archived post or comment again and reconciliation knows which days
+  only live in cold storage.
+
+Files are written before the rows are deleted and only files recorded in
+``cold_partitions`` are read, so a run that fails half way leaves at most
+an unreferenced file behind. Historical reads (``archived_posts``,
+``archived_comments``) open only the files of the requested page and
+months, newest first, and stop once they have enough rows.
+
+Needs pyarrow, which is optional: without it nothing is archived and
+historical reads raise ColdStorageUnavailable.
+"""
+import json
+import os
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional, only needed to archive and read archived rows
+    pa = pq = None
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import use_primary
+from app.models.cold_partition import ColdPartition
+from app.models.comment import Comment
+from app.models.page import Page
+from app.models.post import Post
+
+POSTS = "posts"
+COMMENTS = "comments"
+
+POST_COLUMNS = ("id", "page_id", "content", "post_type", "media_urls", "like_count", "comment_count",
+                "share_count", "engagement_score", "posted_at", "created_at")
+COMMENT_COLUMNS = ("id", "post_id", "user_name", "user_profile_url", "content", "commented_at", "created_at")
+
+DELETE_BATCH = 500
+
+
+class ColdStorageUnavailable(RuntimeError):
+    """pyarrow is not installed"""
+
+
+def _schema(kind: str):
+    timestamp = pa.timestamp("us")
+    if kind == POSTS:
+        return pa.schema([
+            ("id", pa.string()), ("page_id", pa.string()), ("content", pa.string()),
+            ("post_type", pa.string()), ("media_urls", pa.string()), ("like_count", pa.int64()),
+            ("comment_count", pa.int64()), ("share_count", pa.int64()), ("engagement_score", pa.float64()),
+            ("posted_at", timestamp), ("created_at", timestamp),
+        ])
+    return pa.schema([
+        ("id", pa.string()), ("post_id", pa.string()), ("user_name", pa.string()),
+        ("user_profile_url", pa.string()), ("content", pa.string()),
+        ("commented_at", timestamp), ("created_at", timestamp),
+    ])
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ColdStorageUnavailable("Cold storage needs pyarrow (pip install pyarrow)")
+
+
+class ColdStorage:
+    """Parquet files under ``directory``, one per kind, page, month and run"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.root = Path(directory or settings.cold_storage_dir)
+
+    def write(self, kind: str, page_id: str, month: str, rows: List[Dict]) -> str:
+        """Write rows to a new file and return its path relative to the root"""
+        _require_pyarrow()
+        relative = Path(kind) / f"page_id={page_id}" / f"month={month}" / f"{uuid.uuid4().hex}.parquet"
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pylist(rows, schema=_schema(kind))
+        tmp = path.with_suffix(".tmp")
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, path)
+        return relative.as_posix()
+
+    def read(self, file: str) -> List[Dict]:
+        _require_pyarrow()
+        return pq.read_table(self.root / file).to_pylist()
+
+
+def retention_cutoff(days: int, now: datetime) -> Optional[datetime]:
+    """Start of the oldest day still kept in the database; None keeps everything"""
+    if not days:
+        return None
+    return datetime.combine(now.date() - timedelta(days=days), time.min)
+
+
+def _month(value: Optional[datetime]) -> str:
+    return value.strftime("%Y-%m") if value else "0000-00"
+
+
+def _as_row(obj, columns: Iterable[str]) -> Dict:
+    row = {column: getattr(obj, column) for column in columns}
+    if "media_urls" in row and row["media_urls"] is not None and not isinstance(row["media_urls"], str):
+        row["media_urls"] = json.dumps(row["media_urls"])
+    return row
+
+
+def archive_old_rows(db: Session, storage: Optional[ColdStorage] = None, page_ids: Optional[Iterable[str]] = None,
+                     now: Optional[datetime] = None, batch_size: int = 100) -> Dict[str, int]:
+    """Move posts and comments past their retention age to cold storage,
+    one transaction per page; returns ``{"pages": n, "posts": n, "comments": n}``"""
+    _require_pyarrow()
+    use_primary(db)
+    storage = storage or ColdStorage()
+    now = now or datetime.utcnow()
+    post_cutoff = retention_cutoff(settings.post_retention_days, now)
+    comment_cutoff = retention_cutoff(settings.comment_retention_days, now)
+    totals = {"pages": 0, "posts": 0, "comments": 0}
+    if post_cutoff is None and comment_cutoff is None:
+        return totals
+
+    wanted = sorted(set(page_ids)) if page_ids is not None else None
+    last_id = ""
+    while True:
+        query = db.query(Page.id).filter(Page.id > last_id)
+        if wanted is not None:
+            query = query.filter(Page.id.in_(wanted))
+        batch = [row.id for row in query.order_by(Page.id).limit(batch_size)]
+        if not batch:
+            break
+        last_id = batch[-1]
+        for page_id in batch:
+            posts, comments = archive_page(db, storage, page_id, post_cutoff, comment_cutoff)
+            db.commit()
+            if posts or comments:
+                totals["pages"] += 1
+                totals["posts"] += posts
+                totals["comments"] += comments
+    return totals
+
+
+def archive_page(db: Session, storage: ColdStorage, page_id: str, post_cutoff: Optional[datetime],
+                 comment_cutoff: Optional[datetime]) -> Tuple[int, int]:
+    """Move one page's old posts (with their comments) and old comments to
+    cold storage; the caller commits. Returns (posts, comments) moved."""
+    posts = []
+    if post_cutoff is not None:
+        posts = db.query(Post).filter(Post.page_id == page_id, Post.posted_at < post_cutoff).all()
+    post_ids = [post.id for post in posts]
+
+    comments = {}
+    for start in range(0, len(post_ids), DELETE_BATCH):
+        for comment in db.query(Comment).filter(Comment.post_id.in_(post_ids[start:start + DELETE_BATCH])):
+            comments[comment.id] = comment
+    if comment_cutoff is not None:
+        old = db.query(Comment).join(Post, Comment.post_id == Post.id).filter(
+            Post.page_id == page_id,
+            Comment.commented_at < comment_cutoff
+        )
+        for comment in old:
+            comments[comment.id] = comment
+
+    if posts or comments:
+        by_month: Dict[Tuple[str, str], List] = defaultdict(list)
+        for post in posts:
+            by_month[POSTS, _month(post.posted_at)].append(post)
+        for comment in comments.values():
+            by_month[COMMENTS, _month(comment.commented_at or comment.created_at)].append(comment)
+
+        for (kind, month), objs in sorted(by_month.items()):
+            columns = POST_COLUMNS if kind == POSTS else COMMENT_COLUMNS
+            file = storage.write(kind, page_id, month, [_as_row(obj, columns) for obj in objs])
+            partition = ColdPartition(page_id=page_id, kind=kind, month=month, file=file, row_count=len(objs))
+            if kind == POSTS:
+                partition.likes = sum(post.like_count or 0 for post in objs)
+                partition.comments = sum(post.comment_count or 0 for post in objs)
+                partition.shares = sum(post.share_count or 0 for post in objs)
+            db.add(partition)
+
+        comment_ids = list(comments)
+        for start in range(0, len(comment_ids), DELETE_BATCH):
+            db.query(Comment).filter(
+                Comment.id.in_(comment_ids[start:start + DELETE_BATCH])
+            ).delete(synchronize_session=False)
+        for start in range(0, len(post_ids), DELETE_BATCH):
+            db.query(Post).filter(Post.id.in_(post_ids[start:start + DELETE_BATCH])).delete(synchronize_session=False)
+        for obj in posts + list(comments.values()):
+            db.expunge(obj)
+
+    # A horizon only moves forward, even if the retention period grows
+    archived = db.query(Page.posts_archived_before, Page.comments_archived_before).filter(Page.id == page_id).one()
+    # Keep updated_at: it is the scrape time the refresh schedule relies on
+    values = {Page.updated_at: Page.updated_at}
+    if post_cutoff is not None:
+        values[Page.posts_archived_before] = max(filter(None, (archived.posts_archived_before, post_cutoff)))
+    if comment_cutoff is not None:
+        values[Page.comments_archived_before] = max(filter(None, (archived.comments_archived_before, comment_cutoff)))
+    db.query(Page).filter(Page.id == page_id).update(values, synchronize_session=False)
+    return len(posts), len(comments)
+
+
+def cold_totals(db: Session, page_ids: List[str]) -> Dict[str, Tuple[int, int, int, int]]:
+    """(posts, likes, comments, shares) of each page's archived posts"""
+    return {
+        page_id: tuple(int(value or 0) for value in values)
+        for page_id, *values in db.query(
+            ColdPartition.page_id, func.sum(ColdPartition.row_count), func.sum(ColdPartition.likes),
+            func.sum(ColdPartition.comments), func.sum(ColdPartition.shares)
+        ).filter(
+            ColdPartition.page_id.in_(page_ids),
+            ColdPartition.kind == POSTS
+        ).group_by(ColdPartition.page_id)
+    }
+
+
+def _read_partitions(db: Session, storage: Optional[ColdStorage], page_id: str, kind: str,
+                     start: Optional[date], end: Optional[date], keep, sort_key: str, limit: int) -> List[Dict]:
+    """Rows of a page's files of ``kind`` in [start, end] matching ``keep``,
+    newest first; files are read month by month until ``limit`` is reached"""
+    storage = storage or ColdStorage()
+    query = db.query(ColdPartition.month, ColdPartition.file).filter(
+        ColdPartition.page_id == page_id,
+        ColdPartition.kind == kind
+    )
+    if start:
+        query = query.filter(ColdPartition.month >= start.strftime("%Y-%m"))
+    if end:
+        query = query.filter(ColdPartition.month <= end.strftime("%Y-%m"))
+    files_by_month: Dict[str, List[str]] = defaultdict(list)
+    for month, file in query.order_by(ColdPartition.month.desc()):
+        files_by_month[month].append(file)
+
+    since = datetime.combine(start, time.min) if start else None
+    until = datetime.combine(end + timedelta(days=1), time.min) if end else None
+    rows: List[Dict] = []
+    for month, files in files_by_month.items():
+        month_rows = []
+        for file in files:
+            for row in storage.read(file):
+                at = row[sort_key]
+                if (since and (at is None or at < since)) or (until and (at is None or at >= until)) or not keep(row):
+                    continue
+                month_rows.append(row)
+        rows.extend(sorted(month_rows, key=lambda row: row[sort_key] or datetime.min, reverse=True))
+        if len(rows) >= limit:
+            break
+    return rows[:limit]
+
+
+def archived_posts(db: Session, page_id: str, start: Optional[date] = None, end: Optional[date] = None,
+                   limit: int = 50, storage: Optional[ColdStorage] = None) -> List[Dict]:
+    """A page's archived posts published in [start, end], newest first"""
+    return _read_partitions(db, storage, page_id, POSTS, start, end, lambda row: True, "posted_at", limit)
+
+
+def archived_comments(db: Session, page_id: str, post_id: Optional[str] = None, start: Optional[date] = None,
+                      end: Optional[date] = None, limit: int = 50,
+                      storage: Optional[ColdStorage] = None) -> List[Dict]:
+    """A page's archived comments (of one post if given) written in
+    [start, end], newest first"""
+    keep = (lambda row: row["post_id"] == post_id) if post_id else (lambda row: True)
+    return _read_partitions(db, storage, page_id, COMMENTS, start, end, keep, "commented_at", limit)
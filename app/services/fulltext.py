@@ -0,0 +1,164 @@
+"""Full-text search over post content and page names/descriptions.
+
+Queries use a small syntax shared by every backend: words must all match,
+``"quoted words"`` match as a phrase and ``word*`` matches a prefix.
+The query is translated to FTS5 on SQLite and to boolean-mode
+MATCH ... AGAINST on MySQL (see app.models.fulltext for the indexes);
+other databases fall back to LIKE with ranking done here. Results are
+ranked by relevance and post hits carry a highlighted snippet.
+"""
+import re
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import Float, String, and_, literal, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.models.page import Page
+from app.models.post import Post
+
+WORD = re.compile(r"\w+", re.UNICODE)
+TOKEN = re.compile(r'"([^"]*)"|(\w+)(\*?)', re.UNICODE)
+
+MARK_START, MARK_END = "<mark>", "</mark>"
+SNIPPET_WORDS = 16
+
+
+class Term(NamedTuple):
+    words: tuple  # several words: a phrase
+    prefix: bool = False
+
+
+class PostHit(NamedTuple):
+    post: Post
+    score: float
+    snippet: str
+
+
+def parse_query(query: str) -> List[Term]:
+    """Split a search string into words, "phrases" and prefix* terms"""
+    terms = []
+    for phrase, word, star in TOKEN.findall(query or ""):
+        if phrase:
+            words = tuple(w.lower() for w in WORD.findall(phrase))
+            if words:
+                terms.append(Term(words))
+        elif word:
+            terms.append(Term((word.lower(),), prefix=bool(star)))
+    return terms
+
+
+def fts5_query(terms: List[Term]) -> str:
+    # Every word is quoted so FTS5 keywords (AND, NEAR, ...) are plain words
+    parts = []
+    for term in terms:
+        quoted = '"' + " ".join(term.words) + '"'
+        parts.append(quoted + "*" if term.prefix else quoted)
+    return " AND ".join(parts)
+
+
+def mysql_boolean_query(terms: List[Term]) -> str:
+    parts = []
+    for term in terms:
+        if len(term.words) > 1:
+            parts.append('+"' + " ".join(term.words) + '"')
+        else:
+            parts.append("+" + term.words[0] + ("*" if term.prefix else ""))
+    return " ".join(parts)
+
+
+def term_pattern(term: Term) -> re.Pattern:
+    body = r"\W+".join(re.escape(w) for w in term.words)
+    return re.compile(r"\b" + body + (r"\w*" if term.prefix else r"\b"), re.IGNORECASE | re.UNICODE)
+
+
+def highlight(content: Optional[str], terms: List[Term], words: int = SNIPPET_WORDS) -> str:
+    """A window of about ``words`` words around the first match, matches marked"""
+    content = content or ""
+    patterns = [term_pattern(term) for term in terms]
+    matches = [m for pattern in patterns for m in pattern.finditer(content)]
+    if not matches:
+        return " ".join(content.split()[:words])
+
+    first = min(m.start() for m in matches)
+    starts = [m.start() for m in WORD.finditer(content)]
+    index = max(0, sum(1 for s in starts if s < first) - words // 4)
+    begin = starts[index] if starts else 0
+    end = starts[index + words] if index + words < len(starts) else len(content)
+
+    window = content[begin:end].rstrip()
+    for pattern in patterns:
+        window = pattern.sub(lambda m: f"{MARK_START}{m.group(0)}{MARK_END}", window)
+    return ("…" if begin > 0 else "") + window + ("…" if end < len(content) else "")
+
+
+def _like_score(values: List[Optional[str]], terms: List[Term]) -> float:
+    return float(sum(len(term_pattern(t).findall(v or "")) for t in terms for v in values))
+
+
+class FullTextSearch:
+    def __init__(self, db: Session):
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+
+    def search_posts(self, query: str, page_id: Optional[str] = None, limit: int = 10) -> List[PostHit]:
+        """Posts matching ``query`` (optionally of one page), best first"""
+        terms = parse_query(query)
+        if not terms:
+            return []
+        if self.dialect == "sqlite":
+            rows = self.db.execute(text(
+                "SELECT posts.id, -bm25(posts_fts) AS score, "
+                f"snippet(posts_fts, 0, '{MARK_START}', '{MARK_END}', '…', {SNIPPET_WORDS}) AS snippet "
+                "FROM posts_fts JOIN posts ON posts.rowid = posts_fts.rowid "
+                "WHERE posts_fts MATCH :q" + (" AND posts.page_id = :page_id" if page_id else "") +
+                " ORDER BY score DESC LIMIT :limit"
+            ), {"q": fts5_query(terms), "page_id": page_id, "limit": limit}).all()
+        elif self.dialect == "mysql":
+            rows = self.db.execute(text(
+                "SELECT id, MATCH(content) AGAINST(:q IN BOOLEAN MODE) AS score, NULL AS snippet "
+                "FROM posts WHERE MATCH(content) AGAINST(:q IN BOOLEAN MODE)" +
+                (" AND page_id = :page_id" if page_id else "") +
+                " ORDER BY score DESC LIMIT :limit"
+            ), {"q": mysql_boolean_query(terms), "page_id": page_id, "limit": limit}).all()
+        else:
+            return self._like_search_posts(terms, page_id, limit)
+
+        posts = {p.id: p for p in self.db.query(Post).filter(Post.id.in_([r[0] for r in rows]))}
+        return [
+            PostHit(posts[post_id], float(score), snippet or highlight(posts[post_id].content, terms))
+            for post_id, score, snippet in rows if post_id in posts
+        ]
+
+    def page_matches(self, query: str):
+        """Subquery of (page_id, score) for pages whose name or description
+        matches ``query``; None when the query has no terms"""
+        terms = parse_query(query)
+        if not terms:
+            return None
+        if self.dialect == "sqlite":
+            # A name match counts ten times as much as a description match
+            stmt = text(
+                "SELECT pages.id AS page_id, -bm25(pages_fts, 10.0, 1.0) AS score "
+                "FROM pages_fts JOIN pages ON pages.rowid = pages_fts.rowid WHERE pages_fts MATCH :q"
+            ).bindparams(q=fts5_query(terms))
+        elif self.dialect == "mysql":
+            stmt = text(
+                "SELECT id AS page_id, MATCH(name, description) AGAINST(:q IN BOOLEAN MODE) AS score "
+                "FROM pages WHERE MATCH(name, description) AGAINST(:q IN BOOLEAN MODE)"
+            ).bindparams(q=mysql_boolean_query(terms))
+        else:
+            conditions = [
+                or_(Page.name.ilike(f"%{' '.join(t.words)}%"), Page.description.ilike(f"%{' '.join(t.words)}%"))
+                for t in terms
+            ]
+            return select(Page.id.label("page_id"), literal(1.0).label("score")).where(and_(*conditions)).subquery()
+        return stmt.columns(page_id=String, score=Float).subquery()
+
+    def _like_search_posts(self, terms: List[Term], page_id: Optional[str], limit: int) -> List[PostHit]:
+        query = self.db.query(Post).filter(*[Post.content.ilike(f"%{' '.join(t.words)}%") for t in terms])
+        if page_id:
+            query = query.filter(Post.page_id == page_id)
+        hits = [PostHit(post, _like_score([post.content], terms), highlight(post.content, terms)) for post in query]
+        hits = [hit for hit in hits if hit.score > 0]
+        hits.sort(key=lambda hit: hit.score, reverse=True)
+        return hits[:limit]
@@ -0,0 +1,111 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+import uuid
+
+from app.config import settings
+from app.database import use_primary
+from app.models.job import ScrapeJob
+from app.services.page_service import PageService
+
+MAX_STORED_ERRORS = 100
+
+class JobService:
+    def __init__(self, db: Session):
+        # Job state is read right after it is written, so never from a replica
+        self.db = use_primary(db)
+    
+    def create_job(self, page_ids: List[str], concurrency: Optional[int] = None) -> ScrapeJob:
+        """Store a queued bulk scrape job"""
+        page_ids = list(dict.fromkeys(page_ids))
+        job = ScrapeJob(
+            id=str(uuid.uuid4()),
+            status="queued",
+            page_ids=page_ids,
+            concurrency=concurrency,
+            total=len(page_ids),
+            errors={}
+        )
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+    
+    def get_job(self, job_id: str) -> Optional[ScrapeJob]:
+        return self.db.query(ScrapeJob).filter(ScrapeJob.id == job_id).first()
+    
+    def claim_job(self, job_id: str) -> bool:
+        """Mark a job running for this worker; False if another worker has it
+        
+        A queued job is claimed once, however many times its task is
+        delivered. A running job whose worker made no progress for
+        JOB_STALE_AFTER seconds (it crashed, and Celery redelivered the
+        task) is taken over and run again from the start.
+        """
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=settings.job_stale_after)
+        claimed = self.db.query(ScrapeJob).filter(
+            ScrapeJob.id == job_id,
+            or_(
+                ScrapeJob.status == "queued",
+                and_(ScrapeJob.status == "running", ScrapeJob.heartbeat_at < stale)
+            )
+        ).update({
+            ScrapeJob.status: "running",
+            ScrapeJob.started_at: now,
+            ScrapeJob.heartbeat_at: now,
+            ScrapeJob.refreshed: 0,
+            ScrapeJob.unchanged: 0,
+            ScrapeJob.failed: 0,
+        }, synchronize_session=False)
+        self.db.commit()
+        return claimed == 1
+    
+    def run_job(self, job_id: str):
+        """Scrape every page of a job, recording progress with each saved batch"""
+        if not self.claim_job(job_id):
+            return
+        job = self.db.query(ScrapeJob).filter(ScrapeJob.id == job_id).populate_existing().first()
+        
+        def record_progress(summary: Dict):
+            job.heartbeat_at = datetime.utcnow()
+            job.refreshed = len(summary["refreshed"])
+            job.unchanged = len(summary["unchanged"])
+            job.failed = len(summary["failed"])
+            job.errors = dict(list(summary["failed"].items())[:MAX_STORED_ERRORS])
+        
+        try:
+            PageService(self.db).refresh_pages(job.page_ids, job.concurrency, on_batch=record_progress)
+            job.status = "completed"
+        except Exception as e:
+            self.db.rollback()
+            job.status = "failed"
+            job.errors = {**(job.errors or {}), "_job": str(e)}
+        job.finished_at = datetime.utcnow()
+        self.db.commit()
+    
+    def job_status(self, job: ScrapeJob) -> Dict:
+        """Progress and throughput of a job"""
+        processed = (job.refreshed or 0) + (job.unchanged or 0) + (job.failed or 0)
+        pages_per_minute = None
+        if job.started_at:
+            elapsed = ((job.finished_at or datetime.utcnow()) - job.started_at).total_seconds()
+            if elapsed > 0:
+                pages_per_minute = round(processed * 60 / elapsed, 2)
+        
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "total": job.total,
+            "processed": processed,
+            "refreshed": job.refreshed or 0,
+            "unchanged": job.unchanged or 0,
+            "failed": job.failed or 0,
+            "progress": round(processed / job.total, 4) if job.total else 1.0,
+            "pages_per_minute": pages_per_minute,
+            "errors": job.errors or {},
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at
+        }
@@ -1,55 +1,400 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
-from typing import Dict, List, Optional, Tuple
+from sqlalchemy.exc import SQLAlchemyError
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime, timedelta
+from collections import Counter, defaultdict
+import asyncio
 import json
 
+from app.config import settings
+from app.database import use_primary
 from app.models.page import Page
 from app.models.post import Post
 from app.models.user import SocialMediaUser
 from app.models.comment import Comment
-from app.scrapers.linkedin_scraper import LinkedInScraper
+from app.scrapers.linkedin_scraper import LinkedInScraper, ScrapeError
+from app.scrapers.circuit_breaker import CircuitOpenError
+from app.scrapers.async_scraper import AsyncLinkedInScraper, ScrapeResult
+from app.services.fulltext import FullTextSearch
+from app.services.pagination import count_rows, decode_cursor, encode_cursor
+from app.services.persistence import bulk_upsert
+from app.services.page_tags import save_page_tags, tag_filters, tagged_pages
+from app.services.read_your_writes import mark_written
+from app.services.rollups import apply_engagement_deltas, engagement_deltas, previous_engagement
+from app.services.scoring import engagement_score
+from app.services.single_flight import SingleFlight
+from app.services.snapshots import page_trends, record_snapshot
+from app.tasks import schedule_refresh
+
+# Shared by every PageService in this process
+scrape_flight = SingleFlight("scrape")
+
+# Keyset pagination sorts: column and whether it is descending
+SEARCH_SORTS = {
+    "followers": (Page.total_followers, True),
+    "name": (Page.name, False),
+    "updated_at": (Page.updated_at, True),
+}
+
+# Columns overwritten when a refresh finds a row that already exists
+POST_UPDATE_COLUMNS = ("content", "post_type", "like_count", "comment_count", "share_count", "engagement_score", "posted_at")
+COMMENT_UPDATE_COLUMNS = ("user_name", "user_profile_url", "content", "commented_at")
+EMPLOYEE_UPDATE_COLUMNS = ("name", "profile_url", "profile_picture", "position")
 
 class PageService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, scraper: Optional[LinkedInScraper] = None):
         self.db = db
-        self.scraper = LinkedInScraper()
+        self._scraper = scraper
+        # Related rows inserted/updated by this service, per table
+        self.row_counts: Dict[str, Counter] = defaultdict(Counter)
     
-    def get_or_scrape_page(self, page_id: str, force_refresh: bool = False) -> Page:
-        """Get page from DB or scrape if not exists/outdated"""
-        page = self.db.query(Page).filter(Page.id == page_id).first()
+    @property
+    def scraper(self) -> LinkedInScraper:
+        # Built on the first scrape: most services only read or save, and a
+        # scraper sets up its own fetch cache, archive and rate limiter
+        if self._scraper is None:
+            self._scraper = LinkedInScraper()
+        return self._scraper
+    
+    def get_or_scrape_page(self, page_id: str, force_refresh: bool = False,
+                           allow_stale: bool = False) -> Page:
+        """Get page from DB or scrape if not exists/outdated
         
-        should_refresh = force_refresh or not page
-        if page and not force_refresh:
-            one_day_ago = datetime.utcnow() - timedelta(days=1)
-            if page.updated_at < one_day_ago:
-                should_refresh = True
+        With allow_stale, a page past the soft TTL but within the hard TTL is
+        returned as is and refreshed in the background.
+        Concurrent callers for the same page share a single scrape: one of
+        them scrapes, the others wait for it and return the stored row.
+        When the scrape fails the stored row is returned unchanged; without
+        one, None for a page LinkedIn does not have, else the error is raised.
+        """
+        page = self.db.query(Page).filter(Page.id == page_id).first()
+        if not force_refresh:
+            if not self._is_outdated(page):
+                return page
+            if allow_stale and page and self._age(page) < timedelta(seconds=settings.page_hard_ttl):
+                schedule_refresh(page_id)
+                return page
         
-        if should_refresh:
-            # Scrape fresh data
-            scraped_data = self.scraper.scrape_page(page_id)
+        # From here on we write, or must see what another writer committed
+        use_primary(self.db)
+        try:
+            with scrape_flight.lead(page_id) as leader:
+                if leader:
+                    if not force_refresh:
+                        # Another worker may have refreshed it while we got the lease
+                        page = self._reload(page_id)
+                        if not self._is_outdated(page):
+                            return page
+                    return self._scrape_and_save(page_id, page, force_refresh)
             
-            if page:
-                # Update existing page
-                self._update_page(page, scraped_data)
+            # Another caller scraped this page; return what it stored
+            page = self._reload(page_id)
+            if page is None:
+                # The other scrape failed or took too long - do it ourselves
+                page = self._scrape_and_save(page_id, None, force_refresh)
+            return page
+        except (CircuitOpenError, ScrapeError) as e:
+            # LinkedIn is failing: serve the last stored row if we have one,
+            # never made-up data
+            page = self._reload(page_id)
+            if page is None and not self._not_found(e):
+                raise
+            return page
+    
+    @staticmethod
+    def _not_found(error: Exception) -> bool:
+        """Whether a scrape failed because LinkedIn has no such page"""
+        return isinstance(error, ScrapeError) and error.status_code == 404
+    
+    @staticmethod
+    def is_stale(page: Page) -> bool:
+        """Whether the page is older than the soft TTL"""
+        return PageService._age(page) >= timedelta(seconds=settings.page_soft_ttl)
+    
+    @staticmethod
+    def _age(page: Page) -> timedelta:
+        return datetime.utcnow() - page.updated_at
+    
+    @staticmethod
+    def _is_outdated(page: Optional[Page]) -> bool:
+        return not page or PageService.is_stale(page)
+    
+    def _reload(self, page_id: str) -> Optional[Page]:
+        """Re-read a page, ending the current transaction so rows committed
+        by other sessions are visible"""
+        self.db.rollback()
+        return self.db.query(Page).filter(Page.id == page_id).first()
+    
+    def _scrape_and_save(self, page_id: str, page: Optional[Page], force_refresh: bool) -> Page:
+        # Scrape fresh data; an existing page whose HTML is the one it was
+        # last parsed from is not re-parsed or re-written
+        stored_hash = page.content_hash if page and not force_refresh else None
+        # Don't hold a pooled connection while waiting on LinkedIn
+        self.db.rollback()
+        scraped_data = self.scraper.scrape_page(page_id, stored_hash=stored_hash)
+        page = self._apply_scrape(page, scraped_data)
+        self.db.commit()
+        mark_written([page_id])
+        self.db.refresh(page)
+        return page
+    
+    def refresh_pages(self, page_ids: List[str], concurrency: Optional[int] = None,
+                      batch_size: Optional[int] = None,
+                      on_batch: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Scrape many pages concurrently and save them in batches as they finish
+        
+        on_batch(summary) runs inside each batch's transaction, right before
+        the commit, so callers can record progress atomically with the data.
+        """
+        page_ids = list(dict.fromkeys(page_ids))
+        use_primary(self.db)
+        return asyncio.run(self._refresh_pages(
+            page_ids, concurrency, batch_size or settings.persist_batch_size, on_batch
+        ))
+    
+    async def _refresh_pages(self, page_ids: List[str], concurrency: Optional[int],
+                             batch_size: int, on_batch) -> Dict:
+        scraper = AsyncLinkedInScraper(concurrency=concurrency)
+        stored_hashes = {
+            page_id: content_hash for page_id, content_hash in self.db.query(Page.id, Page.content_hash).filter(
+                Page.id.in_(page_ids),
+                Page.content_hash.isnot(None)
+            )
+        }
+        summary = {"refreshed": [], "unchanged": [], "failed": {}}
+        batch, since_flush = [], 0
+        
+        async for result in scraper.scrape_many(page_ids, stored_hashes=stored_hashes):
+            if result.error:
+                summary["failed"][result.page_id] = result.error
             else:
-                # Create new page
-                page = self._create_page(scraped_data)
-                self.db.add(page)
-            
-            # Save related data
-            self._save_posts(page.id, scraped_data.get("posts", []))
-            self._save_employees(page.id, scraped_data.get("employees", []))
-            
+                batch.append(result)
+            since_flush += 1
+            if since_flush >= batch_size:
+                self._persist_batch(batch, summary, on_batch)
+                batch, since_flush = [], 0
+        
+        if since_flush:
+            self._persist_batch(batch, summary, on_batch)
+        return summary
+    
+    def save_results(self, results: Iterable[ScrapeResult], batch_size: Optional[int] = None,
+                     on_batch: Optional[Callable[[Dict], None]] = None, fresh: bool = True) -> Dict:
+        """Upsert already scraped results in batches
+        
+        With fresh=False (see save_reextracted) the results are not new
+        scrapes of the pages.
+        """
+        use_primary(self.db)
+        batch_size = batch_size or settings.persist_batch_size
+        summary = {"refreshed": [], "unchanged": [], "failed": {}}
+        batch = []
+        for result in results:
+            if result.error:
+                summary["failed"][result.page_id] = result.error
+            else:
+                batch.append(result)
+            if len(batch) >= batch_size:
+                self._persist_batch(batch, summary, on_batch, fresh)
+                batch = []
+        if batch:
+            self._persist_batch(batch, summary, on_batch, fresh)
+        return summary
+    
+    def save_reextracted(self, results: Iterable[ScrapeResult], batch_size: Optional[int] = None) -> Dict:
+        """Upsert pages re-extracted from archived bodies (see app.reextract)
+        
+        Each result's data carries the archived body's ``content_hash`` and
+        its fetch time as ``scraped_at``. The pages keep their refresh time
+        (a new page gets the fetch time) and no snapshot is recorded, since
+        nothing new was fetched.
+        """
+        return self.save_results(results, batch_size, fresh=False)
+    
+    def _persist_batch(self, results: List[ScrapeResult], summary: Dict, on_batch, fresh: bool = True):
+        """Save a batch of scrape results in one transaction, retrying page by
+        page if the batch as a whole fails"""
+        saved = len(summary["refreshed"]), len(summary["unchanged"])
+        try:
+            for result in results:
+                self._save_result(result, fresh)
+                self._count_saved(summary, result)
+            if on_batch:
+                on_batch(summary)
+            self.db.commit()
+            mark_written(result.page_id for result in results)
+            return
+        except SQLAlchemyError:
+            self.db.rollback()
+            del summary["refreshed"][saved[0]:]
+            del summary["unchanged"][saved[1]:]
+        
+        for result in results:
+            try:
+                self._save_result(result, fresh)
+                self.db.commit()
+                mark_written([result.page_id])
+                self._count_saved(summary, result)
+            except SQLAlchemyError as e:
+                self.db.rollback()
+                summary["failed"][result.page_id] = str(e)
+        if on_batch:
+            on_batch(summary)
             self.db.commit()
-            self.db.refresh(page)
+    
+    def _save_result(self, result: ScrapeResult, fresh: bool = True):
+        if result.unchanged:
+            self.db.query(Page).filter(Page.id == result.page_id).update(
+                {Page.updated_at: datetime.utcnow()}, synchronize_session=False
+            )
+            record_snapshot(self.db, result.page_id)
+        else:
+            page = self.db.query(Page).filter(Page.id == result.page_id).first()
+            self._save_scraped_data(page, result.data, fresh)
+    
+    @staticmethod
+    def _count_saved(summary: Dict, result: ScrapeResult):
+        (summary["unchanged"] if result.unchanged else summary["refreshed"]).append(result.page_id)
+    
+    def _apply_scrape(self, page: Optional[Page], scraped_data: Optional[Dict]) -> Page:
+        """Save a scrape of ``page``; None means its HTML had not changed"""
+        if scraped_data is None:
+            self._mark_fresh(page)
+            return page
+        return self._save_scraped_data(page, scraped_data)
+    
+    def _mark_fresh(self, page: Page):
+        """Record a refresh that found the page unchanged"""
+        page.updated_at = datetime.utcnow()
+        record_snapshot(self.db, page.id)
+    
+    def _save_scraped_data(self, page: Optional[Page], scraped_data: Dict, fresh: bool = True) -> Page:
+        """Write scraped data onto the page (creating it if needed) and its related rows
+        
+        fresh=False saves data parsed from an earlier fetch: the page's refresh
+        time stays and no snapshot is recorded.
+        """
+        if page:
+            # Update existing page
+            self._update_page(page, scraped_data, fresh)
+        else:
+            # Create new page
+            page = self._create_page(scraped_data)
+            if not fresh:
+                page.updated_at = datetime.fromisoformat(scraped_data["scraped_at"])
+            self.db.add(page)
         
+        # The related rows are written with Core statements, so the page
+        # row has to exist in the database first
+        self.db.flush()
+        save_page_tags(self.db, page)
+        self._save_related(page.id, self._without_archived(page, scraped_data))
+        if fresh:
+            record_snapshot(self.db, page.id)
         return page
     
-    def search_pages(self, filters: Dict, page: int = 1, limit: int = 10) -> Tuple[List[Page], int]:
-        """Search pages with filters and pagination"""
+    @staticmethod
+    def _without_archived(page: Page, scraped_data: Dict) -> Dict:
+        """Leave out posts and comments older than what was already moved to
+        cold storage (see app.services.cold_storage), so they are not stored twice"""
+        posts_before, comments_before = page.posts_archived_before, page.comments_archived_before
+        if not posts_before and not comments_before:
+            return scraped_data
+        
+        def older(value: Optional[str], cutoff: Optional[datetime]) -> bool:
+            return bool(cutoff and value and datetime.fromisoformat(value) < cutoff)
+        
+        posts = [
+            dict(post_data, comments=[
+                comment_data for comment_data in post_data.get("comments", [])
+                if not older(comment_data.get("commented_at"), comments_before)
+            ])
+            for post_data in scraped_data.get("posts", [])
+            if not older(post_data.get("posted_at"), posts_before)
+        ]
+        return dict(scraped_data, posts=posts)
+    
+    def search_pages(self, filters: Dict, page: int = 1, limit: int = 10,
+                     count: str = "exact") -> Tuple[List[Page], Optional[int]]:
+        """Search pages with filters and offset pagination"""
+        query = self._filtered_pages(filters, rank=True)
+        
+        # Get total count
+        total = count_rows(query, count, self._count_key(filters))
+        
+        # Apply pagination
+        offset = (page - 1) * limit
+        pages = query.offset(offset).limit(limit).all()
+        
+        return pages, total
+    
+    def search_pages_keyset(self, filters: Dict, sort: Optional[str] = None,
+                            cursor: Optional[str] = None, limit: int = 10,
+                            count: str = "exact") -> Tuple[List[Page], Optional[str], Optional[int]]:
+        """Search pages with keyset pagination
+        
+        Returns the pages after ``cursor`` in ``sort`` order (ties broken by
+        id, pages without a value last for descending sorts and first for
+        ascending ones), the cursor of the next page (None on the last one)
+        and the count. Each page costs one index range scan however deep it is.
+        Raises ValueError for an unknown sort or a malformed cursor.
+        """
+        after = None
+        if cursor:
+            cursor_sort, value, last_id = decode_cursor(cursor)
+            if sort and sort != cursor_sort:
+                raise ValueError("Cursor was issued for a different sort")
+            sort, after = cursor_sort, (value, last_id)
+        sort = sort or "followers"
+        if sort not in SEARCH_SORTS:
+            raise ValueError(f"Unknown sort '{sort}'")
+        
+        query = self._filtered_pages(filters, rank=False)
+        total = count_rows(query, count, self._count_key(filters))
+        
+        column, descending = SEARCH_SORTS[sort]
+        if after:
+            query = query.filter(self._after(column, descending, *after))
+        order = (column.desc(), Page.id.desc()) if descending else (column.asc(), Page.id.asc())
+        if self.db.get_bind().dialect.name == "postgresql":
+            # NULL sorts lowest, as on MySQL and SQLite
+            order = (order[0].nulls_last() if descending else order[0].nulls_first(), order[1])
+        pages = query.order_by(*order).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(pages) > limit:
+            pages = pages[:limit]
+            last = pages[-1]
+            next_cursor = encode_cursor(sort, getattr(last, column.key), last.id)
+        return pages, next_cursor, total
+    
+    @staticmethod
+    def _after(column, descending: bool, value, last_id: str):
+        """Rows after (value, last_id) in keyset order; a NULL sort value sorts
+        lowest, so ``column < value`` alone would skip those rows"""
+        if descending:
+            if value is None:
+                return and_(column.is_(None), Page.id < last_id)
+            return or_(column < value, and_(column == value, Page.id < last_id), column.is_(None))
+        if value is None:
+            return or_(column.isnot(None), and_(column.is_(None), Page.id > last_id))
+        return or_(column > value, and_(column == value, Page.id > last_id))
+    
+    def _filtered_pages(self, filters: Dict, rank: bool):
+        """Pages matching the search filters; with rank, full-text matches
+        come best first"""
         query = self.db.query(Page)
         
+        # Full-text query over name and description
+        if filters.get("q"):
+            matches = FullTextSearch(self.db).page_matches(filters["q"])
+            if matches is not None:
+                query = query.join(matches, matches.c.page_id == Page.id)
+                if rank:
+                    query = query.order_by(matches.c.score.desc())
+        
         # Apply filters
         if filters.get("name"):
             query = query.filter(Page.name.ilike(f"%{filters['name']}%"))
@@ -63,14 +408,20 @@ class PageService:
         if filters.get("max_followers"):
             query = query.filter(Page.total_followers <= filters["max_followers"])
         
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
-        offset = (page - 1) * limit
-        pages = query.offset(offset).limit(limit).all()
+        # Speciality / location prefixes, looked up in the page_tags index
+        for kind, prefix in tag_filters(filters):
+            query = query.filter(Page.id.in_(tagged_pages(kind, prefix)))
         
-        return pages, total
+        return query
+    
+    @staticmethod
+    def _count_key(filters: Dict) -> str:
+        return "pages:" + json.dumps({k: v for k, v in filters.items() if v is not None}, sort_keys=True, default=str)
+    
+    def get_page_trends(self, page_id: str, days: int = 30) -> Optional[Dict]:
+        """Follower, count and engagement series of the last ``days`` days
+        with their growth (see app.services.snapshots)"""
+        return page_trends(self.db, page_id, days)
     
     def get_page_posts(self, page_id: str, limit: int = 15) -> List[Post]:
         """Get recent posts for a page"""
@@ -94,15 +445,16 @@ class PageService:
             industry=data.get("industry", ""),
             total_followers=data.get("total_followers", 0),
             head_count=data.get("head_count", ""),
-            specialities=json.dumps(data.get("specialities", [])),
+            specialities=list(data.get("specialities", [])),
             company_type=data.get("company_type", ""),
             founded_year=data.get("founded_year"),
             headquarters=data.get("headquarters", ""),
-            locations=json.dumps(data.get("locations", []))
+            locations=list(data.get("locations", [])),
+            content_hash=data.get("content_hash")
         )
         return page
     
-    def _update_page(self, page: Page, data: Dict):
+    def _update_page(self, page: Page, data: Dict, fresh: bool = True):
         """Update existing page with new data"""
         page.name = data.get("name", page.name)
         page.profile_picture = data.get("profile_picture", page.profile_picture)
@@ -111,59 +463,180 @@ class PageService:
         page.industry = data.get("industry", page.industry)
         page.total_followers = data.get("total_followers", page.total_followers)
         page.head_count = data.get("head_count", page.head_count)
-        page.specialities = json.dumps(data.get("specialities", []))
+        page.specialities = list(data.get("specialities", []))
         page.company_type = data.get("company_type", page.company_type)
         page.founded_year = data.get("founded_year", page.founded_year)
         page.headquarters = data.get("headquarters", page.headquarters)
-        page.locations = json.dumps(data.get("locations", []))
-        page.updated_at = datetime.utcnow()
+        page.locations = list(data.get("locations", []))
+        page.content_hash = data.get("content_hash")
+        # Set either way, or the column's onupdate would stamp the current time
+        page.updated_at = datetime.utcnow() if fresh else Page.updated_at
     
-    def _save_posts(self, page_id: str, posts_data: List[Dict]):
-        """Save posts and their comments"""
-        for post_data in posts_data:
-            # Check if post already exists
-            post = self.db.query(Post).filter(Post.id == post_data["id"]).first()
-            
-            if not post:
-                post = Post(
-                    id=post_data["id"],
-                    page_id=page_id,
-                    content=post_data.get("content", ""),
-                    post_type=post_data.get("post_type", "post"),
-                    media_urls=json.dumps([]),
-                    like_count=post_data.get("like_count", 0),
-                    comment_count=post_data.get("comment_count", 0),
-                    share_count=post_data.get("share_count", 0),
-                    posted_at=datetime.fromisoformat(post_data.get("posted_at")) if post_data.get("posted_at") else datetime.utcnow()
-                )
-                self.db.add(post)
-                self.db.flush()  # Get the post ID
+    def _save_related(self, page_id: str, scraped_data: Dict) -> Dict[str, Dict[str, int]]:
+        """Upsert the page's posts, their comments and its employees, one
+        multi-row statement per table (per batch)"""
+        posts_data = scraped_data.get("posts", [])
+        counts = {
+            "posts": self._save_posts(page_id, posts_data),
+            "comments": self._save_comments([
+                dict(comment_data, post_id=post_data["id"])
+                for post_data in posts_data for comment_data in post_data.get("comments", [])
+            ]),
+            "employees": self._save_employees(page_id, scraped_data.get("employees", [])),
+        }
+        for table, table_counts in counts.items():
+            self.row_counts[table].update(table_counts)
+        self._bump_counters(page_id, counts["posts"]["inserted"], counts["employees"]["inserted"])
+        return counts
+    
+    def _bump_counters(self, page_id: str, posts: int, employees: int):
+        """Add newly inserted rows to the page's denormalized counters"""
+        if not posts and not employees:
+            return
+        self.db.query(Page).filter(Page.id == page_id).update({
+            Page.post_count: Page.post_count + posts,
+            Page.employee_count: Page.employee_count + employees,
+            Page.updated_at: Page.updated_at,
+        }, synchronize_session=False)
+    
+    def _save_posts(self, page_id: str, posts_data: List[Dict]) -> Dict[str, int]:
+        """Upsert posts; a refreshed post gets its new content and counters"""
+        rows = [
+            {
+                "id": post_data["id"],
+                "page_id": page_id,
+                "content": post_data.get("content", ""),
+                "post_type": post_data.get("post_type", "post"),
+                "media_urls": list(post_data.get("media_urls", [])),
+                "like_count": post_data.get("like_count", 0),
+                "comment_count": post_data.get("comment_count", 0),
+                "share_count": post_data.get("share_count", 0),
+                "posted_at": datetime.fromisoformat(post_data.get("posted_at")) if post_data.get("posted_at") else datetime.utcnow(),
+                "created_at": datetime.utcnow(),
+            }
+            for post_data in posts_data
+        ]
+        for row in rows:
+            row["engagement_score"] = engagement_score(row)
+        # Engagement rollups move by the difference to the stored posts
+        previous = previous_engagement(self.db, [row["id"] for row in rows])
+        counts = bulk_upsert(self.db, Post, rows, POST_UPDATE_COLUMNS)
+        apply_engagement_deltas(self.db, engagement_deltas(previous, rows))
+        return counts
+    
+    def _save_comments(self, comments_data: List[Dict]) -> Dict[str, int]:
+        """Upsert comments (each carrying its post_id)"""
+        rows = [
+            {
+                "id": comment_data["id"],
+                "post_id": comment_data["post_id"],
+                "user_name": comment_data.get("user_name", ""),
+                "user_profile_url": comment_data.get("user_profile_url", ""),
+                "content": comment_data.get("content", ""),
+                "commented_at": datetime.fromisoformat(comment_data.get("commented_at")) if comment_data.get("commented_at") else datetime.utcnow(),
+                "created_at": datetime.utcnow(),
+            }
+            for comment_data in comments_data
+        ]
+        return bulk_upsert(self.db, Comment, rows, COMMENT_UPDATE_COLUMNS)
+    
+    def _save_employees(self, page_id: str, employees_data: List[Dict]) -> Dict[str, int]:
+        """Upsert employee information"""
+        rows = [
+            {
+                "id": emp_data["id"],
+                "page_id": page_id,
+                "name": emp_data.get("name", ""),
+                "profile_url": emp_data.get("profile_url", ""),
+                "profile_picture": emp_data.get("profile_picture", ""),
+                "position": emp_data.get("position", ""),
+                "created_at": datetime.utcnow(),
+            }
+            for emp_data in employees_data
+        ]
+        return bulk_upsert(self.db, SocialMediaUser, rows, EMPLOYEE_UPDATE_COLUMNS)
+
+
+class AsyncPageService:
+    """PageService for the async API (/api/v2)
+
+    Scrapes run on the event loop with AsyncLinkedInScraper and concurrent
+    callers wait on it instead of holding a worker thread. Queries and
+    writes reuse PageService through ``AsyncSession.run_sync``, which runs
+    them on the async driver.
+    """
+    
+    def __init__(self, db: AsyncSession, scraper: Optional[AsyncLinkedInScraper] = None):
+        self.db = db
+        self._scraper = scraper
+    
+    @property
+    def scraper(self) -> AsyncLinkedInScraper:
+        # As PageService.scraper; the PageService built for run_sync calls
+        # never scrapes, so it never builds one
+        if self._scraper is None:
+            self._scraper = AsyncLinkedInScraper()
+        return self._scraper
+    
+    is_stale = staticmethod(PageService.is_stale)
+    
+    async def get_or_scrape_page(self, page_id: str, force_refresh: bool = False,
+                                 allow_stale: bool = False) -> Page:
+        """Async PageService.get_or_scrape_page"""
+        page = await self.db.get(Page, page_id)
+        if not force_refresh:
+            if not PageService._is_outdated(page):
+                return page
+            if allow_stale and page and PageService._age(page) < timedelta(seconds=settings.page_hard_ttl):
+                await asyncio.to_thread(schedule_refresh, page_id)
+                return page
+        
+        use_primary(self.db)
+        try:
+            async with scrape_flight.lead_async(page_id) as leader:
+                if leader:
+                    if not force_refresh:
+                        page = await self._reload(page_id)
+                        if not PageService._is_outdated(page):
+                            return page
+                    return await self._scrape_and_save(page_id, page, force_refresh)
             
-            # Save comments
-            self._save_comments(post.id, post_data.get("comments", []))
-    
-    def _save_comments(self, post_id: str, comments_data: List[Dict]):
-        """Save comments for a post"""
-        for comment_data in comments_data:
-            comment = Comment(
-                id=comment_data["id"],
-                post_id=post_id,
-                user_name=comment_data.get("user_name", ""),
-                user_profile_url=comment_data.get("user_profile_url", ""),
-                content=comment_data.get("content", ""),
-                commented_at=datetime.fromisoformat(comment_data.get("commented_at")) if comment_data.get("commented_at") else datetime.utcnow()
-            )
-            self.db.add(comment)
-    
-    def _save_employees(self, page_id: str, employees_data: List[Dict]):
-        """Save employee information"""
-        for emp_data in employees_data:
-            employee = SocialMediaUser(
-                id=emp_data["id"],
-                page_id=page_id,
-                name=emp_data.get("name", ""),
-                profile_url=emp_data.get("profile_url", ""),
-                profile_picture=emp_data.get("profile_picture", ""),
-                position=emp_data.get("position", "")
-            )
-            self.db.add(employee)
\ No newline at end of file
+            page = await self._reload(page_id)
+            if page is None:
+                page = await self._scrape_and_save(page_id, None, force_refresh)
+            return page
+        except (CircuitOpenError, ScrapeError) as e:
+            page = await self._reload(page_id)
+            if page is None and not PageService._not_found(e):
+                raise
+            return page
+    
+    async def _reload(self, page_id: str) -> Optional[Page]:
+        await self.db.rollback()
+        return await self.db.get(Page, page_id, populate_existing=True)
+    
+    async def _scrape_and_save(self, page_id: str, page: Optional[Page], force_refresh: bool) -> Page:
+        stored_hash = page.content_hash if page and not force_refresh else None
+        await self.db.rollback()
+        scraped_data = await self.scraper.fetch_page(page_id, stored_hash=stored_hash)
+        page = await self.db.run_sync(lambda session: PageService(session)._apply_scrape(page, scraped_data))
+        await self.db.commit()
+        await asyncio.to_thread(mark_written, [page_id])
+        await self.db.refresh(page)
+        return page
+    
+    async def get_page_trends(self, page_id: str, days: int = 30) -> Optional[Dict]:
+        return await self.db.run_sync(lambda session: PageService(session).get_page_trends(page_id, days))
+    
+    async def search_pages(self, filters: Dict, page: int = 1, limit: int = 10,
+                           count: str = "exact") -> Tuple[List[Page], Optional[int]]:
+        return await self.db.run_sync(
+            lambda session: PageService(session).search_pages(filters, page, limit, count)
+        )
+    
+    async def search_pages_keyset(self, filters: Dict, sort: Optional[str] = None,
+                                  cursor: Optional[str] = None, limit: int = 10,
+                                  count: str = "exact") -> Tuple[List[Page], Optional[str], Optional[int]]:
+        return await self.db.run_sync(
+            lambda session: PageService(session).search_pages_keyset(filters, sort, cursor, limit, count)
+        )
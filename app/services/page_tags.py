@@ -0,0 +1,69 @@
+"""Indexed speciality and location filters for page search.
+
+A page's ``specialities`` and ``locations`` are JSON lists on the page
+row. Each entry is also a ``page_tags`` row, ``(page_id, kind, value)``,
+with the value stripped and lowercased. The ``(kind, value, page_id)``
+index serves the /pages filters, a case-insensitive prefix match, as an
+index range scan. Saving a page rewrites only the tags that changed.
+"""
+from typing import Dict, Iterable, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.page import Page
+from app.models.page_tag import PageTag
+
+SPECIALITY = "speciality"
+LOCATION = "location"
+
+# Page attribute holding the values of each kind
+KIND_ATTRIBUTES = {SPECIALITY: "specialities", LOCATION: "locations"}
+
+MAX_VALUE_LENGTH = 200
+
+
+def normalize(value: str) -> str:
+    # No trailing space after truncating: MySQL compares "a " and "a" as equal
+    return " ".join(str(value).split()).lower()[:MAX_VALUE_LENGTH].rstrip()
+
+
+def page_tags(page: Page) -> Set[Tuple[str, str]]:
+    """(kind, value) pairs of a page's (or page row's) specialities and locations"""
+    tags = set()
+    for kind, attribute in KIND_ATTRIBUTES.items():
+        values = getattr(page, attribute)
+        if not isinstance(values, list):
+            continue
+        for value in values:
+            if normalize(value):
+                tags.add((kind, normalize(value)))
+    return tags
+
+
+def save_page_tags(db: Session, page: Page):
+    """Make the page's tag rows match its specialities and locations"""
+    stored = {(row.kind, row.value) for row in db.query(PageTag.kind, PageTag.value).filter(PageTag.page_id == page.id)}
+    wanted = page_tags(page)
+    for kind, value in stored - wanted:
+        db.query(PageTag).filter(
+            PageTag.page_id == page.id, PageTag.kind == kind, PageTag.value == value
+        ).delete(synchronize_session=False)
+    if wanted - stored:
+        db.execute(PageTag.__table__.insert(), [
+            {"page_id": page.id, "kind": kind, "value": value} for kind, value in sorted(wanted - stored)
+        ])
+
+
+def tagged_pages(kind: str, prefix: str):
+    """Subquery of the ids of pages with a ``kind`` tag starting with ``prefix``"""
+    escaped = normalize(prefix).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return select(PageTag.page_id).where(
+        PageTag.kind == kind,
+        PageTag.value.like(f"{escaped}%", escape="\\")
+    )
+
+
+def tag_filters(filters: Dict) -> Iterable[Tuple[str, str]]:
+    """(kind, prefix) of the tag filters set in search ``filters``"""
+    return [(kind, filters[kind]) for kind in KIND_ATTRIBUTES if filters.get(kind)]
@@ -0,0 +1,115 @@
+"""Keyset pagination cursors and cheap result counts.
+
+Cursors are opaque to clients: url-safe base64 of a small JSON document
+holding the sort and the sort key of the last row returned. Counts can be
+exact, estimated from the query planner, cached in Redis (in process when
+Redis is down) or skipped.
+"""
+import base64
+import binascii
+import hashlib
+import json
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import redis
+from sqlalchemy import text
+from sqlalchemy.orm import Query
+
+from app.config import settings
+from app.redis_client import get_redis
+
+COUNT_MODES = ("exact", "estimated", "cached", "none")
+COUNT_CACHE_PREFIX = "count_cache"
+LOCAL_CACHE_SIZE = 1024  # prune expired in-process entries beyond this
+
+_local_counts: Dict[str, Tuple[float, int]] = {}
+_local_lock = threading.Lock()
+
+
+def encode_cursor(sort: str, value: Any, last_id: str) -> str:
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = json.dumps({"s": sort, "v": value, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Any, str]:
+    """(sort, last sort value, last id); ValueError for a malformed cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        sort, value, last_id = payload["s"], payload["v"], payload["id"]
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    return sort, value, last_id
+
+
+def count_rows(query: Query, mode: str, cache_key: Optional[str] = None) -> Optional[int]:
+    """Number of rows of ``query`` according to ``mode`` (see COUNT_MODES)"""
+    if mode == "none":
+        return None
+    if mode == "estimated":
+        estimate = estimate_rows(query)
+        if estimate is not None:
+            return estimate
+    if mode == "cached" and cache_key:
+        return cached_count(cache_key, query.count)
+    return query.count()
+
+
+def estimate_rows(query: Query) -> Optional[int]:
+    """The planner's row estimate for ``query`` (MySQL, Postgres); None when
+    the database has no usable estimate"""
+    db = query.session
+    dialect = db.get_bind().dialect
+    sql = str(query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    try:
+        if dialect.name == "mysql":
+            rows = db.execute(text(f"EXPLAIN {sql}")).mappings().all()
+            first = rows[0] if rows else None
+            if first and first.get("rows") is not None:
+                return int(first["rows"] * float(first.get("filtered") or 100) / 100)
+        elif dialect.name == "postgresql":
+            plan = db.execute(text(f"EXPLAIN {sql}")).scalar()
+            match = re.search(r"rows=(\d+)", plan or "")
+            if match:
+                return int(match.group(1))
+    except Exception as e:
+        print(f"Row estimate failed: {str(e)}")
+    return None
+
+
+def cached_count(key: str, compute) -> int:
+    """A count cached for settings.search_count_cache_ttl seconds"""
+    ttl = settings.search_count_cache_ttl
+    redis_key = f"{COUNT_CACHE_PREFIX}:{hashlib.sha1(key.encode()).hexdigest()}"
+    client = get_redis()
+    if client is not None:
+        try:
+            cached = client.get(redis_key)
+            if cached is not None:
+                return int(cached)
+            count = compute()
+            client.set(redis_key, count, ex=ttl)
+            return count
+        except redis.RedisError as e:
+            print(f"Count cache unavailable: {str(e)}")
+
+    now = time.monotonic()
+    with _local_lock:
+        entry = _local_counts.get(redis_key)
+        if entry and entry[0] > now:
+            return entry[1]
+    count = compute()
+    with _local_lock:
+        if len(_local_counts) >= LOCAL_CACHE_SIZE:
+            for stale in [k for k, (expires, _) in _local_counts.items() if expires <= now]:
+                del _local_counts[stale]
+        _local_counts[redis_key] = (now + ttl, count)
+    return count
@@ -0,0 +1,119 @@
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, bindparam, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+# Dialects with a native multi-row upsert; others go through _select_then_write
+UPSERT_DIALECTS = ("mysql", "sqlite", "postgresql")
+
+
+def _upsert_statement(dialect: str, table, rows: List[Dict], key: Sequence[str],
+                      update_columns: Sequence[str], increment: bool = False):
+    """Multi-row INSERT that updates ``update_columns`` on a key conflict
+    (adds the new values to the stored ones with ``increment``)"""
+    def new_value(col, proposed):
+        return table.c[col] + proposed if increment else proposed
+
+    if dialect == "mysql":
+        stmt = mysql.insert(table).values(rows)
+        # Without columns to update, "update" the key to itself to ignore duplicates
+        columns = update_columns or key
+        return stmt.on_duplicate_key_update({col: new_value(col, stmt.inserted[col]) for col in columns})
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(table).values(rows)
+        if not update_columns:
+            return stmt.on_conflict_do_nothing(index_elements=list(key))
+        return stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={col: new_value(col, stmt.excluded[col]) for col in update_columns},
+        )
+    raise ValueError(f"Unsupported dialect: {dialect}")
+
+
+def _select_then_write(db: Session, table, rows: List[Dict], key: Sequence[str],
+                       update_columns: Sequence[str], existing: set, increment: bool = False):
+    """Upsert for other dialects: INSERT the rows whose key is not in
+    ``existing`` and UPDATE the others, one executemany each. Unlike the
+    native upserts it is not atomic: a row inserted concurrently between
+    the SELECT of ``existing`` and the INSERT fails the batch."""
+    new = [row for row in rows if tuple(row[k] for k in key) not in existing]
+    stored = [row for row in rows if tuple(row[k] for k in key) in existing]
+    if new:
+        db.execute(table.insert(), new)
+    if stored and update_columns:
+        values = {
+            col: table.c[col] + bindparam(f"new_{col}") if increment else bindparam(f"new_{col}")
+            for col in update_columns
+        }
+        stmt = table.update().where(and_(*(table.c[k] == bindparam(f"key_{k}") for k in key))).values(values)
+        db.execute(stmt, [
+            {**{f"key_{k}": row[k] for k in key}, **{f"new_{col}": row[col] for col in update_columns}}
+            for row in stored
+        ])
+
+
+def bulk_upsert(db: Session, model, rows: List[Dict], update_columns: Sequence[str],
+                batch_size: Optional[int] = None) -> Dict[str, int]:
+    """Insert rows, updating ``update_columns`` of rows whose primary key exists
+
+    Each batch costs two round trips: a SELECT of the keys that already
+    exist (so inserted and updated rows can be counted exactly on every
+    backend) and one multi-row upsert. Rows repeating a key within the
+    call are collapsed to the last one.
+    Returns ``{"inserted": n, "updated": n}``.
+    """
+    counts = {"inserted": 0, "updated": 0}
+    if not rows:
+        return counts
+
+    table = model.__table__
+    key = [col.name for col in table.primary_key.columns]
+    unique = {tuple(row[k] for k in key): row for row in rows}
+    rows = list(unique.values())
+    batch_size = batch_size or settings.upsert_batch_size
+    dialect = db.get_bind().dialect.name
+
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        existing = _existing_keys(db, table, key, batch)
+        if dialect in UPSERT_DIALECTS:
+            db.execute(_upsert_statement(dialect, table, batch, key, update_columns))
+        else:
+            _select_then_write(db, table, batch, key, update_columns, existing)
+        updated = sum(1 for row in batch if tuple(row[k] for k in key) in existing)
+        counts["updated"] += updated
+        counts["inserted"] += len(batch) - updated
+    return counts
+
+
+def bulk_increment(db: Session, model, rows: List[Dict], columns: Sequence[str],
+                   batch_size: Optional[int] = None):
+    """Add the ``columns`` of each row to the stored row with the same primary
+    key, inserting the row where there is none (one statement per batch on
+    the UPSERT_DIALECTS). Rows must not repeat a key."""
+    if not rows:
+        return
+    table = model.__table__
+    key = [col.name for col in table.primary_key.columns]
+    batch_size = batch_size or settings.upsert_batch_size
+    dialect = db.get_bind().dialect.name
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        if dialect in UPSERT_DIALECTS:
+            db.execute(_upsert_statement(dialect, table, batch, key, columns, increment=True))
+        else:
+            existing = _existing_keys(db, table, key, batch)
+            _select_then_write(db, table, batch, key, columns, existing, increment=True)
+
+
+def _existing_keys(db: Session, table, key: Sequence[str], rows: List[Dict]) -> set:
+    """Keys of ``rows`` already in the table (composite keys are narrowed on
+    their first column, then matched exactly)"""
+    columns = [table.c[k] for k in key]
+    wanted = {tuple(row[k] for k in key) for row in rows}
+    found = db.execute(select(*columns).where(columns[0].in_({k[0] for k in wanted})))
+    return {tuple(r) for r in found} & wanted
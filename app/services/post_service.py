@@ -1,12 +1,20 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
-from sqlalchemy import desc, func
+from typing import List, Dict, Optional, Tuple
+from datetime import date, datetime, timedelta
+from sqlalchemy import desc, func, select, union_all
+import heapq
 import json
 
 from app.models.post import Post
 from app.models.comment import Comment
 from app.models.page import Page
+from app.models.engagement import PageEngagement, PageEngagementDaily
+from app.services.cold_storage import archived_comments, archived_posts
+from app.services.fulltext import FullTextSearch, PostHit
+
+# Pages whose best posts are fetched per query by get_top_posts_all_pages
+TOP_POSTS_PAGES_PER_QUERY = 50
 
 class PostService:
     def __init__(self, db: Session):
@@ -63,18 +71,71 @@ class PostService:
         return result
     
     def get_top_performing_posts(self, page_id: str, days: int = 30, limit: int = 5) -> List[Post]:
-        """Get top performing posts based on engagement"""
+        """Get top performing posts based on engagement (the stored score,
+        read backwards along the page's score index)"""
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         
+        # Scores are never negative; the range steers the planner to the
+        # (page_id, engagement_score) index instead of sorting the date window
         posts = self.db.query(Post).filter(
             Post.page_id == page_id,
+            Post.engagement_score >= 0,
             Post.posted_at >= cutoff_date
         ).order_by(
-            desc(Post.like_count + Post.comment_count * 2 + Post.share_count * 3)
+            desc(Post.engagement_score)
         ).limit(limit).all()
         
         return posts
     
+    def get_top_posts_all_pages(self, days: Optional[int] = 30, limit: int = 10,
+                                pages_per_query: int = TOP_POSTS_PAGES_PER_QUERY) -> List[Post]:
+        """Top posts across all pages
+        
+        Each page's best ``limit`` posts come from its (page_id,
+        engagement_score) index, ``pages_per_query`` pages per UNION ALL
+        query, and a heap of size ``limit`` keeps the overall best. Once the
+        heap is full only posts that beat its smallest score are asked for.
+        
+        Cost: one query per ``pages_per_query`` pages and one index seek
+        per page, so it grows with the number of pages but not with their
+        posts. A seek reads the page's posts scoring above the heap's
+        smallest score, stopping at ``limit`` in the date window; once the
+        heap holds strong posts most seeks find nothing and end there.
+        Posts are never sorted.
+        """
+        cutoff_date = datetime.utcnow() - timedelta(days=days) if days else None
+        heap: List[Tuple[float, str]] = []
+        last_id = ""
+        while True:
+            page_ids = [row.id for row in self.db.query(Page.id).filter(
+                Page.id > last_id
+            ).order_by(Page.id).limit(pages_per_query)]
+            if not page_ids:
+                break
+            last_id = page_ids[-1]
+            
+            threshold = heap[0][0] if len(heap) == limit else None
+            per_page = []
+            for page_id in page_ids:
+                query = select(Post.id, Post.engagement_score).where(
+                    Post.page_id == page_id,
+                    Post.engagement_score > threshold if threshold is not None else Post.engagement_score >= 0
+                )
+                if cutoff_date is not None:
+                    query = query.where(Post.posted_at >= cutoff_date)
+                best = query.order_by(desc(Post.engagement_score)).limit(limit).subquery()
+                per_page.append(select(best.c.id, best.c.engagement_score))
+            
+            for post_id, score in self.db.execute(union_all(*per_page)):
+                if len(heap) < limit:
+                    heapq.heappush(heap, (score, post_id))
+                elif score > heap[0][0]:
+                    heapq.heapreplace(heap, (score, post_id))
+        
+        ranked = [post_id for _, post_id in sorted(heap, reverse=True)]
+        posts = {post.id: post for post in self.db.query(Post).filter(Post.id.in_(ranked))}
+        return [posts[post_id] for post_id in ranked if post_id in posts]
+    
     def get_posts_by_date_range(self, page_id: str, start_date: datetime, end_date: datetime) -> List[Post]:
         """Get posts within a specific date range"""
         posts = self.db.query(Post).filter(
@@ -87,35 +148,78 @@ class PostService:
         
         return posts
     
-    def get_post_engagement_stats(self, page_id: str) -> Dict:
-        """Get engagement statistics for a page's posts"""
-        stats = self.db.query(
-            func.count(Post.id).label('total_posts'),
-            func.sum(Post.like_count).label('total_likes'),
-            func.sum(Post.comment_count).label('total_comments'),
-            func.sum(Post.share_count).label('total_shares'),
-            func.avg(Post.like_count).label('avg_likes'),
-            func.avg(Post.comment_count).label('avg_comments')
-        ).filter(
-            Post.page_id == page_id
-        ).first()
+    def get_post_engagement_stats(self, page_id: str, days: Optional[int] = None) -> Dict:
+        """Get engagement statistics for a page's posts, all time or for posts
+        of the last ``days`` days, from the engagement rollups"""
+        if days is None:
+            stats = self.db.query(
+                PageEngagement.posts, PageEngagement.likes, PageEngagement.comments, PageEngagement.shares
+            ).filter(
+                PageEngagement.page_id == page_id
+            ).first()
+        else:
+            since = datetime.utcnow().date() - timedelta(days=days - 1)
+            stats = self.db.query(
+                func.sum(PageEngagementDaily.posts).label('posts'),
+                func.sum(PageEngagementDaily.likes).label('likes'),
+                func.sum(PageEngagementDaily.comments).label('comments'),
+                func.sum(PageEngagementDaily.shares).label('shares')
+            ).filter(
+                PageEngagementDaily.page_id == page_id,
+                PageEngagementDaily.day >= since
+            ).first()
         
+        posts = (stats.posts if stats else 0) or 0
+        likes = (stats.likes if stats else 0) or 0
+        comments = (stats.comments if stats else 0) or 0
         return {
-            "total_posts": stats.total_posts or 0,
-            "total_likes": stats.total_likes or 0,
-            "total_comments": stats.total_comments or 0,
-            "total_shares": stats.total_shares or 0,
-            "average_likes": float(stats.avg_likes or 0),
-            "average_comments": float(stats.avg_comments or 0)
+            "total_posts": posts,
+            "total_likes": likes,
+            "total_comments": comments,
+            "total_shares": (stats.shares if stats else 0) or 0,
+            "average_likes": likes / posts if posts else 0.0,
+            "average_comments": comments / posts if posts else 0.0
         }
     
-    def search_posts(self, page_id: str, keyword: str, limit: int = 10) -> List[Post]:
-        """Search posts by keyword in content"""
-        posts = self.db.query(Post).filter(
-            Post.page_id == page_id,
-            Post.content.ilike(f"%{keyword}%")
-        ).order_by(
-            desc(Post.posted_at)
-        ).limit(limit).all()
-        
-        return posts
\ No newline at end of file
+    def get_archived_posts(self, page_id: str, start: Optional[date] = None, end: Optional[date] = None,
+                           limit: int = 50) -> List[Dict]:
+        """Posts moved to cold storage, published between start and end"""
+        return archived_posts(self.db, page_id, start, end, limit)
+    
+    def get_archived_comments(self, page_id: str, post_id: Optional[str] = None, start: Optional[date] = None,
+                              end: Optional[date] = None, limit: int = 50) -> List[Dict]:
+        """Comments moved to cold storage, of the page or one of its posts"""
+        return archived_comments(self.db, page_id, post_id, start, end, limit)
+    
+    def search_posts(self, page_id: Optional[str], keyword: str, limit: int = 10) -> List[PostHit]:
+        """Full-text search of post content (of one page, or all pages when
+        page_id is None), most relevant first"""
+        return FullTextSearch(self.db).search_posts(keyword, page_id, limit)
+
+
+class AsyncPostService:
+    """PostService for the async API; queries run through AsyncSession.run_sync"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def _run(self, method: str, *args):
+        return await self.db.run_sync(lambda session: getattr(PostService(session), method)(*args))
+    
+    async def get_recent_posts(self, page_id: str, limit: int = 15) -> List[Post]:
+        return await self._run("get_recent_posts", page_id, limit)
+    
+    async def get_posts_with_comments(self, page_id: str, limit: int = 10) -> List[Dict]:
+        return await self._run("get_posts_with_comments", page_id, limit)
+    
+    async def get_top_performing_posts(self, page_id: str, days: int = 30, limit: int = 5) -> List[Post]:
+        return await self._run("get_top_performing_posts", page_id, days, limit)
+    
+    async def get_top_posts_all_pages(self, days: Optional[int] = 30, limit: int = 10) -> List[Post]:
+        return await self._run("get_top_posts_all_pages", days, limit)
+    
+    async def get_post_engagement_stats(self, page_id: str, days: Optional[int] = None) -> Dict:
+        return await self._run("get_post_engagement_stats", page_id, days)
+    
+    async def search_posts(self, page_id: Optional[str], keyword: str, limit: int = 10) -> List[PostHit]:
+        return await self._run("search_posts", page_id, keyword, limit)
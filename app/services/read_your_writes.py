@@ -0,0 +1,63 @@
+"""Read-your-writes stickiness for replica reads.
+
+After a page is written, reads about it go to the primary for
+``REPLICA_STICKY_SECONDS`` so clients never see a replica that has not
+caught up with their refresh. Marks are kept in this process and in
+Redis (``rw_sticky:<page_id>``) for the other workers. Nothing is
+tracked when no replicas are configured.
+"""
+import threading
+import time
+from typing import Dict, Iterable
+
+import redis
+
+from app import database
+from app.config import settings
+from app.redis_client import get_redis
+
+STICKY_PREFIX = "rw_sticky"
+
+_written: Dict[str, float] = {}
+_lock = threading.Lock()
+
+
+def mark_written(page_ids: Iterable[str]):
+    if not database.replica_engines:
+        return
+    page_ids = list(page_ids)
+    ttl = settings.replica_sticky_seconds
+    until = time.monotonic() + ttl
+    with _lock:
+        now = time.monotonic()
+        for page_id in [p for p, expires in _written.items() if expires <= now]:
+            del _written[page_id]
+        for page_id in page_ids:
+            _written[page_id] = until
+
+    client = get_redis()
+    if client is None or not page_ids:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        for page_id in page_ids:
+            pipe.set(f"{STICKY_PREFIX}:{page_id}", 1, px=int(ttl * 1000))
+        pipe.execute()
+    except redis.RedisError as e:
+        print(f"Could not record writes to {page_ids}: {str(e)}")
+
+
+def recently_written(page_id: str) -> bool:
+    """Whether reads of this page should go to the primary"""
+    if not database.replica_engines:
+        return False
+    with _lock:
+        if _written.get(page_id, 0.0) > time.monotonic():
+            return True
+    client = get_redis()
+    if client is None:
+        return False
+    try:
+        return bool(client.exists(f"{STICKY_PREFIX}:{page_id}"))
+    except redis.RedisError:
+        return False
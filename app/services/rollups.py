@@ -0,0 +1,141 @@
+"""Engagement rollups: per-page totals and per-day aggregates of posts.
+
+``page_engagement`` holds the all-time posts/likes/comments/shares of a
+page and ``page_engagement_daily`` the same per UTC day the posts were
+published, so engagement stats read one row or one row per day instead
+of every post. Both are maintained incrementally by the scrape
+persistence path: before posts are upserted their stored values are read,
+and the difference between the new and the old values is added to the
+rollups in the same transaction. ``python -m app.reconcile`` recomputes
+them from the posts and repairs drift.
+
+Posts moved to cold storage stay counted: reconciliation adds their
+totals from ``cold_partitions`` and leaves the days before a page's
+``posts_archived_before`` alone (see app.services.cold_storage).
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.engagement import PageEngagement, PageEngagementDaily
+from app.models.page import Page
+from app.models.post import Post
+from app.services.cold_storage import cold_totals
+from app.services.persistence import bulk_increment
+
+METRICS = ("posts", "likes", "comments", "shares")
+
+Totals = Tuple[int, int, int, int]  # in METRICS order
+
+
+def _as_date(value) -> Optional[date]:
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return date.fromisoformat(str(value)[:10])  # SQLite DATE() returns text
+
+
+def _contribution(post) -> Totals:
+    return (1, post["like_count"] or 0, post["comment_count"] or 0, post["share_count"] or 0)
+
+
+def previous_engagement(db: Session, post_ids: List[str]) -> Dict[str, Dict]:
+    """Stored page, day and counters of the posts about to be upserted"""
+    if not post_ids:
+        return {}
+    rows = db.query(
+        Post.id, Post.page_id, Post.posted_at, Post.like_count, Post.comment_count, Post.share_count
+    ).filter(Post.id.in_(post_ids))
+    return {row.id: dict(row._mapping) for row in rows}
+
+
+def engagement_deltas(previous: Dict[str, Dict], rows: Iterable[Dict]) -> Dict[Tuple[str, Optional[date]], List[int]]:
+    """Change of each (page, day) once ``rows`` replace the ``previous`` posts"""
+    deltas: Dict[Tuple[str, Optional[date]], List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+    for row in {row["id"]: row for row in rows}.values():
+        old = previous.get(row["id"])
+        if old:
+            for i, value in enumerate(_contribution(old)):
+                deltas[old["page_id"], _as_date(old["posted_at"])][i] -= value
+        # An upsert never moves a post to another page
+        page_id = old["page_id"] if old else row["page_id"]
+        for i, value in enumerate(_contribution(row)):
+            deltas[page_id, _as_date(row["posted_at"])][i] += value
+    return {key: delta for key, delta in deltas.items() if any(delta)}
+
+
+def apply_engagement_deltas(db: Session, deltas: Dict[Tuple[str, Optional[date]], List[int]]):
+    """Add the deltas to the daily and total rollups"""
+    totals: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+    daily = []
+    for (page_id, day), delta in sorted(deltas.items(), key=lambda item: (item[0][0], item[0][1] or date.min)):
+        for i, value in enumerate(delta):
+            totals[page_id][i] += value
+        if day is not None:
+            daily.append({"page_id": page_id, "day": day, **dict(zip(METRICS, delta))})
+    bulk_increment(db, PageEngagementDaily, daily, METRICS)
+    bulk_increment(db, PageEngagement, [
+        {"page_id": page_id, **dict(zip(METRICS, delta))}
+        for page_id, delta in sorted(totals.items()) if any(delta)
+    ], METRICS)
+
+
+def reconcile_engagement(db: Session, page_ids: List[str]) -> List[str]:
+    """Recompute the rollups of ``page_ids`` from their posts, rewriting the
+    rows that differ; returns the pages that had drifted"""
+    sums = (func.count(Post.id), func.coalesce(func.sum(Post.like_count), 0),
+            func.coalesce(func.sum(Post.comment_count), 0), func.coalesce(func.sum(Post.share_count), 0))
+    day = func.date(Post.posted_at)
+
+    actual_daily = {
+        (page_id, _as_date(posted)): tuple(values)
+        for page_id, posted, *values in db.query(Post.page_id, day, *sums)
+        .filter(Post.page_id.in_(page_ids), Post.posted_at.isnot(None))
+        .group_by(Post.page_id, day)
+    }
+    stored_daily = {
+        (row.page_id, row.day): tuple(getattr(row, m) for m in METRICS)
+        for row in db.query(PageEngagementDaily).filter(PageEngagementDaily.page_id.in_(page_ids))
+    }
+    actual_totals = {
+        page_id: tuple(values)
+        for page_id, *values in db.query(Post.page_id, *sums)
+        .filter(Post.page_id.in_(page_ids)).group_by(Post.page_id)
+    }
+    for page_id, archived in cold_totals(db, page_ids).items():
+        hot = actual_totals.get(page_id, (0, 0, 0, 0))
+        actual_totals[page_id] = tuple(h + a for h, a in zip(hot, archived))
+    # Days before the archive horizon only have their posts in cold storage
+    horizons = {
+        page_id: archived_before.date()
+        for page_id, archived_before in db.query(Page.id, Page.posts_archived_before)
+        .filter(Page.id.in_(page_ids), Page.posts_archived_before.isnot(None))
+    }
+    stored_totals = {
+        row.page_id: tuple(getattr(row, m) for m in METRICS)
+        for row in db.query(PageEngagement).filter(PageEngagement.page_id.in_(page_ids))
+    }
+
+    drifted = set()
+    deltas: Dict[Tuple[str, Optional[date]], List[int]] = {}
+    for key in actual_daily.keys() | stored_daily.keys():
+        if key[0] in horizons and key[1] < horizons[key[0]]:
+            continue
+        actual, stored = actual_daily.get(key, (0, 0, 0, 0)), stored_daily.get(key, (0, 0, 0, 0))
+        if actual != stored:
+            deltas[key] = [a - s for a, s in zip(actual, stored)]
+            drifted.add(key[0])
+    for page_id in actual_totals.keys() | stored_totals.keys():
+        actual, stored = actual_totals.get(page_id, (0, 0, 0, 0)), stored_totals.get(page_id, (0, 0, 0, 0))
+        # Total drift beyond what the daily deltas already carry (undated posts, lost updates)
+        carried = [sum(d[i] for (p, _), d in deltas.items() if p == page_id) for i in range(4)]
+        extra = [a - s - c for a, s, c in zip(actual, stored, carried)]
+        if any(extra):
+            deltas[page_id, None] = extra
+            drifted.add(page_id)
+    apply_engagement_deltas(db, deltas)
+    return sorted(drifted)
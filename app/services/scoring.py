@@ -0,0 +1,104 @@
+"""Post engagement score: likes, comments and shares weighted by settings.
+
+The score is stored on each post (``posts.engagement_score``) when it is
+saved, and indexed together with ``page_id``, so the best posts of a page
+are read in index order instead of sorting every post by an expression.
+Because the weights are configurable the column is maintained here rather
+than generated by the database: the weights the stored scores were
+computed with are recorded in ``app_state``, and when the settings differ
+``rescore_posts`` recomputes every post in batches and records the new
+ones. It runs in the background at startup (see app.tasks) and from
+``python -m app.reconcile``; a Redis lease lets only one process at a time
+rescore, and the others skip it.
+"""
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import use_primary
+from app.models.app_state import AppState
+from app.models.post import Post
+from app.services.single_flight import SingleFlight
+
+WEIGHTS_KEY = "engagement_weights"
+BATCH_SIZE = 1000
+RESCORE_LEASE_SECONDS = 3600
+
+rescore_flight = SingleFlight("rescore", lease_seconds=RESCORE_LEASE_SECONDS)
+
+Weights = Tuple[float, float, float]  # likes, comments, shares
+
+
+def score_weights() -> Weights:
+    return (settings.engagement_like_weight, settings.engagement_comment_weight, settings.engagement_share_weight)
+
+
+def engagement_score(post: Dict, weights: Optional[Weights] = None) -> float:
+    """Score of a post row (a dict with the three counters)"""
+    likes, comments, shares = weights or score_weights()
+    return ((post.get("like_count") or 0) * likes
+            + (post.get("comment_count") or 0) * comments
+            + (post.get("share_count") or 0) * shares)
+
+
+def score_expression(weights: Optional[Weights] = None):
+    """The same score as a SQL expression over the posts table"""
+    likes, comments, shares = weights or score_weights()
+    return (func.coalesce(Post.like_count, 0) * likes
+            + func.coalesce(Post.comment_count, 0) * comments
+            + func.coalesce(Post.share_count, 0) * shares)
+
+
+def stored_weights(db: Session) -> Optional[Weights]:
+    state = db.get(AppState, WEIGHTS_KEY)
+    return tuple(state.value) if state and state.value else None
+
+
+def scores_outdated(db: Session) -> bool:
+    return stored_weights(db) != score_weights()
+
+
+def rescore_posts(db: Session, batch_size: int = BATCH_SIZE) -> int:
+    """Recompute every post's score with the current weights, ``batch_size``
+    posts per transaction walked in id order, then record the weights.
+    Returns the number of posts rescored."""
+    use_primary(db)
+    weights = score_weights()
+    rescored = 0
+    last_id = ""
+    while True:
+        ids = [row.id for row in db.query(Post.id).filter(Post.id > last_id).order_by(Post.id).limit(batch_size)]
+        if not ids:
+            break
+        db.query(Post).filter(Post.id.in_(ids)).update(
+            {Post.engagement_score: score_expression(weights)}, synchronize_session=False
+        )
+        db.commit()
+        rescored += len(ids)
+        last_id = ids[-1]
+
+    state = db.get(AppState, WEIGHTS_KEY)
+    if state is None:
+        db.add(AppState(key=WEIGHTS_KEY, value=list(weights)))
+    else:
+        state.value = list(weights)
+    db.commit()
+    return rescored
+
+
+def rescore_if_outdated(db: Session, batch_size: int = BATCH_SIZE) -> Optional[int]:
+    """Rescore the posts when the weights changed; None when they did not,
+    or when another process is rescoring them"""
+    use_primary(db)
+    if not scores_outdated(db):
+        return None
+    with rescore_flight.try_lead(WEIGHTS_KEY) as leader:
+        if not leader:
+            return None
+        # The last holder of the lease may have just finished
+        db.rollback()
+        if not scores_outdated(db):
+            return None
+        return rescore_posts(db, batch_size)
@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+import redis
+
+from app.config import settings
+from app.redis_client import get_redis
+
+# Delete the lease only if we still hold it (it may have expired and been
+# taken over by another worker)
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+POLL_INTERVAL = 0.1
+
+
+class SingleFlight:
+    """Lets only one caller at a time do the work for a key.
+
+    Threads of this process coordinate through an Event per key; other
+    processes through a Redis lease (``SET NX PX``). ``lead(key)`` yields
+    True to the caller that should do the work and False to callers that
+    waited for another leader to finish (or gave up after ``wait_timeout``).
+    Without Redis, coordination is limited to this process.
+    ``lead_async(key)`` is the same for coroutines: they wait on the event
+    loop, and only share work locally with other coroutines.
+    ``try_lead(key)`` does not wait: callers that do not lead get False at
+    once, for work that only has to happen once rather than be shared.
+    """
+
+    def __init__(self, prefix: str, lease_seconds: Optional[float] = None,
+                 wait_timeout: Optional[float] = None):
+        self.prefix = prefix
+        self.lease_seconds = lease_seconds or settings.scrape_lease_seconds
+        self.wait_timeout = wait_timeout or settings.scrape_wait_timeout
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, threading.Event] = {}
+        self._in_flight_async: Dict[str, asyncio.Event] = {}
+
+    @contextmanager
+    def lead(self, key: str) -> Iterator[bool]:
+        with self._lock:
+            done = self._in_flight.get(key)
+            if done is None:
+                done = self._in_flight[key] = threading.Event()
+                local_leader = True
+            else:
+                local_leader = False
+
+        if not local_leader:
+            done.wait(self.wait_timeout)
+            yield False
+            return
+
+        try:
+            lease = self._acquire_lease(key)
+            if lease is None:
+                self._wait_for_lease(key)
+                yield False
+            else:
+                try:
+                    yield True
+                finally:
+                    self._release_lease(key, lease)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            done.set()
+
+    @contextmanager
+    def try_lead(self, key: str) -> Iterator[bool]:
+        with self._lock:
+            if key in self._in_flight:
+                local_leader = False
+            else:
+                done = self._in_flight[key] = threading.Event()
+                local_leader = True
+
+        if not local_leader:
+            yield False
+            return
+
+        try:
+            lease = self._acquire_lease(key)
+            if lease is None:
+                yield False
+            else:
+                try:
+                    yield True
+                finally:
+                    self._release_lease(key, lease)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            done.set()
+
+    @asynccontextmanager
+    async def lead_async(self, key: str) -> AsyncIterator[bool]:
+        done = self._in_flight_async.get(key)
+        if done is not None:
+            try:
+                await asyncio.wait_for(done.wait(), self.wait_timeout)
+            except asyncio.TimeoutError:
+                pass
+            yield False
+            return
+
+        done = self._in_flight_async[key] = asyncio.Event()
+        try:
+            # Redis calls block, keep them off the event loop
+            lease = await asyncio.to_thread(self._acquire_lease, key)
+            if lease is None:
+                await asyncio.to_thread(self._wait_for_lease, key)
+                yield False
+            else:
+                try:
+                    yield True
+                finally:
+                    await asyncio.to_thread(self._release_lease, key, lease)
+        finally:
+            del self._in_flight_async[key]
+            done.set()
+
+    def _lease_key(self, key: str) -> str:
+        return f"{self.prefix}:lease:{key}"
+
+    def _acquire_lease(self, key: str) -> Optional[str]:
+        """Token of the acquired lease, '' when Redis is down, None if held elsewhere"""
+        client = get_redis()
+        if client is None:
+            return ""
+        token = uuid.uuid4().hex
+        try:
+            acquired = client.set(self._lease_key(key), token, nx=True, px=int(self.lease_seconds * 1000))
+        except redis.RedisError as e:
+            print(f"Single-flight lease unavailable for {key}: {str(e)}")
+            return ""
+        return token if acquired else None
+
+    def _wait_for_lease(self, key: str):
+        client = get_redis()
+        deadline = time.monotonic() + self.wait_timeout
+        try:
+            while client is not None and time.monotonic() < deadline:
+                if not client.exists(self._lease_key(key)):
+                    return
+                time.sleep(POLL_INTERVAL)
+        except redis.RedisError:
+            return
+
+    def _release_lease(self, key: str, token: str):
+        client = get_redis()
+        if not token or client is None:
+            return
+        try:
+            client.eval(RELEASE_SCRIPT, 1, self._lease_key(key), token)
+        except redis.RedisError as e:
+            print(f"Failed to release single-flight lease for {key}: {str(e)}")
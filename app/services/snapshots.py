@@ -0,0 +1,154 @@
+"""Page snapshots: follower, count and engagement history for trends.
+
+Every save or refresh of a page appends a ``page_snapshots`` row with the
+page's followers, post and employee counts and engagement totals, copied
+by one INSERT ... SELECT from ``pages`` and ``page_engagement`` in the
+same transaction. Snapshots are keyed by (page_id, taken_at), so a page's
+trend over the last N days is a primary key range scan of just that window.
+Two snapshots of a page taken at the same instant collapse into the later.
+
+``compact_snapshots`` (run daily by app.scheduler) keeps every snapshot
+for ``SNAPSHOT_RAW_DAYS`` and then only the last one of each day, and
+deletes daily snapshots older than ``SNAPSHOT_KEEP_DAYS`` when that is
+set. It walks pages in batches and only looks at the days that became
+old enough since its previous run (recorded in ``app_state``).
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, insert, literal, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import use_primary
+from app.models.app_state import AppState
+from app.models.engagement import PageEngagement
+from app.models.page import Page
+from app.models.snapshot import PageSnapshot
+
+SERIES = ("followers", "posts", "employees", "likes", "comments", "shares")
+COMPACTED_KEY = "snapshots_compacted_until"
+BATCH_SIZE = 1000
+
+
+def record_snapshot(db: Session, page_id: str, taken_at: Optional[datetime] = None):
+    """Append the page's current values to its history"""
+    query = select(
+        Page.id,
+        literal(taken_at or datetime.utcnow(), PageSnapshot.taken_at.type),
+        func.coalesce(Page.total_followers, 0),
+        Page.post_count,
+        Page.employee_count,
+        func.coalesce(PageEngagement.likes, 0),
+        func.coalesce(PageEngagement.comments, 0),
+        func.coalesce(PageEngagement.shares, 0),
+    ).outerjoin(PageEngagement, PageEngagement.page_id == Page.id).where(Page.id == page_id)
+    columns = ["page_id", "taken_at", *SERIES]
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql.insert(PageSnapshot).from_select(columns, query)
+        stmt = stmt.on_duplicate_key_update({name: stmt.inserted[name] for name in SERIES})
+    elif dialect in ("sqlite", "postgresql"):
+        stmt = (sqlite.insert if dialect == "sqlite" else postgresql.insert)(PageSnapshot).from_select(columns, query)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["page_id", "taken_at"],
+            set_={name: stmt.excluded[name] for name in SERIES},
+        )
+    else:
+        stmt = insert(PageSnapshot).from_select(columns, query)
+    db.execute(stmt)
+
+
+def page_trends(db: Session, page_id: str, days: int) -> Optional[Dict]:
+    """Snapshots of the last ``days`` days and the growth over them; None
+    if the page has none"""
+    since = datetime.utcnow() - timedelta(days=days)
+    rows = db.query(PageSnapshot).filter(
+        PageSnapshot.page_id == page_id,
+        PageSnapshot.taken_at >= since
+    ).order_by(PageSnapshot.taken_at).all()
+    if not rows:
+        return None
+
+    first, last = rows[0], rows[-1]
+    elapsed_days = (last.taken_at - first.taken_at).total_seconds() / 86400
+    return {
+        "from": first.taken_at,
+        "to": last.taken_at,
+        "growth": {name: _growth(getattr(first, name), getattr(last, name), elapsed_days) for name in SERIES},
+        "points": [dict({"taken_at": row.taken_at}, **{name: getattr(row, name) for name in SERIES}) for row in rows],
+    }
+
+
+def _growth(start: int, end: int, elapsed_days: float) -> Dict:
+    change = end - start
+    return {
+        "start": start,
+        "end": end,
+        "change": change,
+        "change_pct": round(change * 100 / start, 2) if start else None,
+        "per_day": round(change / elapsed_days, 2) if elapsed_days else None,
+    }
+
+
+def compact_snapshots(db: Session, now: Optional[datetime] = None, batch_size: int = BATCH_SIZE) -> Dict[str, int]:
+    """Downsample snapshots past the raw period to one per day and expire
+    old daily ones; returns ``{"merged": n, "expired": n}`` deleted rows"""
+    use_primary(db)
+    now = now or datetime.utcnow()
+    # Whole days only, so a day is downsampled once, after its last refresh
+    until = datetime.combine(now.date() - timedelta(days=settings.snapshot_raw_days), time.min)
+    state = db.get(AppState, COMPACTED_KEY)
+    since = datetime.fromisoformat(state.value) if state and state.value else None
+    expire_before = now - timedelta(days=settings.snapshot_keep_days) if settings.snapshot_keep_days else None
+
+    counts = {"merged": 0, "expired": 0}
+    last_id = ""
+    while True:
+        page_ids = [row.id for row in db.query(Page.id).filter(Page.id > last_id).order_by(Page.id).limit(batch_size)]
+        if not page_ids:
+            break
+        last_id = page_ids[-1]
+        if since is None or since < until:
+            counts["merged"] += _merge_days(db, page_ids, since, until)
+        if expire_before is not None:
+            counts["expired"] += db.query(PageSnapshot).filter(
+                PageSnapshot.page_id.in_(page_ids),
+                PageSnapshot.taken_at < expire_before
+            ).delete(synchronize_session=False)
+        db.commit()
+
+    if state is None:
+        db.add(AppState(key=COMPACTED_KEY, value=until.isoformat()))
+    else:
+        state.value = until.isoformat()
+    db.commit()
+    return counts
+
+
+def _merge_days(db: Session, page_ids: List[str], since: Optional[datetime], until: datetime) -> int:
+    """Delete all but the last snapshot of each page and day in [since, until)"""
+    query = db.query(PageSnapshot.page_id, PageSnapshot.taken_at).filter(
+        PageSnapshot.page_id.in_(page_ids),
+        PageSnapshot.taken_at < until
+    )
+    if since is not None:
+        query = query.filter(PageSnapshot.taken_at >= since)
+
+    days: Dict[tuple, List[datetime]] = defaultdict(list)
+    for page_id, taken_at in query:
+        days[page_id, taken_at.date()].append(taken_at)
+    stale: Dict[str, List[datetime]] = defaultdict(list)
+    for (page_id, _), taken in days.items():
+        stale[page_id].extend(sorted(taken)[:-1])
+
+    merged = 0
+    for page_id, taken in stale.items():
+        for start in range(0, len(taken), BATCH_SIZE):
+            merged += db.query(PageSnapshot).filter(
+                PageSnapshot.page_id == page_id,
+                PageSnapshot.taken_at.in_(taken[start:start + BATCH_SIZE])
+            ).delete(synchronize_session=False)
+    return merged
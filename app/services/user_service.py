@@ -1,3 +1,4 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Dict, Optional
 from sqlalchemy import func
@@ -55,9 +56,9 @@ class UserService:
         return employees
     
     def get_total_employee_count(self, page_id: str) -> int:
-        """Get total number of employees for a page"""
-        count = self.db.query(func.count(SocialMediaUser.id)).filter(
-            SocialMediaUser.page_id == page_id
+        """Get total number of employees for a page (the counter on its row)"""
+        count = self.db.query(Page.employee_count).filter(
+            Page.id == page_id
         ).scalar()
         
         return count or 0
@@ -70,4 +71,32 @@ class UserService:
             SocialMediaUser.created_at.desc()
         ).limit(limit).all()
         
-        return employees
\ No newline at end of file
+        return employees
+
+
+class AsyncUserService:
+    """UserService for the async API; queries run through AsyncSession.run_sync"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def _run(self, method: str, *args):
+        return await self.db.run_sync(lambda session: getattr(UserService(session), method)(*args))
+    
+    async def get_page_employees(self, page_id: str, limit: int = 20) -> List[SocialMediaUser]:
+        return await self._run("get_page_employees", page_id, limit)
+    
+    async def get_employee_by_position(self, page_id: str, position_keyword: str) -> List[SocialMediaUser]:
+        return await self._run("get_employee_by_position", page_id, position_keyword)
+    
+    async def get_employee_distribution(self, page_id: str) -> Dict:
+        return await self._run("get_employee_distribution", page_id)
+    
+    async def search_employees(self, page_id: str, name_keyword: str) -> List[SocialMediaUser]:
+        return await self._run("search_employees", page_id, name_keyword)
+    
+    async def get_total_employee_count(self, page_id: str) -> int:
+        return await self._run("get_total_employee_count", page_id)
+    
+    async def get_recently_added_employees(self, page_id: str, limit: int = 10) -> List[SocialMediaUser]:
+        return await self._run("get_recently_added_employees", page_id, limit)
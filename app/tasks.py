@@ -0,0 +1,107 @@
+"""Background work: Celery tasks plus an in-process fallback.
+
+``settings.task_backend`` picks where scheduled work runs: ``celery``
+sends it to the workers of app.celery_app, ``thread`` runs it on a small
+thread pool inside the API process.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Set
+
+from app.celery_app import celery_app
+from app.config import settings
+from app.database import SessionLocal
+
+_executor = ThreadPoolExecutor(max_workers=settings.background_workers, thread_name_prefix="background")
+_pending: Set[str] = set()
+_pending_lock = threading.Lock()
+
+
+def refresh_page(page_id: str):
+    """Re-scrape a page if it is still outdated"""
+    from app.services.page_service import PageService
+
+    db = SessionLocal()
+    try:
+        PageService(db).get_or_scrape_page(page_id)
+    finally:
+        db.close()
+
+
+def run_scrape_job(job_id: str):
+    """Process a queued bulk scrape job"""
+    from app.services.job_service import JobService
+
+    db = SessionLocal()
+    try:
+        JobService(db).run_job(job_id)
+    finally:
+        db.close()
+
+
+def rescore_posts():
+    """Recompute post engagement scores if the weights changed"""
+    from app.services.scoring import rescore_if_outdated
+
+    db = SessionLocal()
+    try:
+        rescored = rescore_if_outdated(db)
+        if rescored is not None:
+            print(f"Rescored {rescored} posts with the new engagement weights")
+    finally:
+        db.close()
+
+
+@celery_app.task(name="refresh_page")
+def refresh_page_task(page_id: str):
+    refresh_page(page_id)
+
+
+@celery_app.task(name="run_scrape_job")
+def run_scrape_job_task(job_id: str):
+    run_scrape_job(job_id)
+
+
+@celery_app.task(name="rescore_posts")
+def rescore_posts_task():
+    rescore_posts()
+
+
+def schedule_refresh(page_id: str):
+    """Refresh a page in the background; duplicate requests are dropped"""
+    _dispatch(refresh_page_task, refresh_page, f"page:{page_id}", page_id)
+
+
+def schedule_scrape_job(job_id: str):
+    """Run a bulk scrape job in the background"""
+    _dispatch(run_scrape_job_task, run_scrape_job, f"job:{job_id}", job_id)
+
+
+def schedule_rescore():
+    """Bring post scores in line with the configured weights in the background"""
+    _dispatch(rescore_posts_task, rescore_posts, "rescore")
+
+
+def _dispatch(task, fn, key: str, *args):
+    if settings.task_backend == "celery":
+        try:
+            task.delay(*args)
+            return
+        except Exception as e:
+            print(f"Could not queue {key}, running it in-process: {str(e)}")
+
+    with _pending_lock:
+        if key in _pending:
+            return
+        _pending.add(key)
+    _executor.submit(_run_pending, key, fn, *args)
+
+
+def _run_pending(key: str, fn, *args):
+    try:
+        fn(*args)
+    except Exception as e:
+        print(f"Background task {key} failed: {str(e)}")
+    finally:
+        with _pending_lock:
+            _pending.discard(key)
@@ -0,0 +1,118 @@
+"""Load test of the sync (/api/v1) and async (/api/v2) request paths.
+
+    python -m benchmarks.bench_api_load [--scrapes N] [--scrape-delay S] [--database-url URL]
+
+Fires N concurrent first-time page requests, each of which scrapes a local
+fake LinkedIn that answers after S seconds, while probing ``/health/db``
+every few milliseconds. Reports scrape throughput and probe latency per
+stack: sync endpoints share FastAPI's threadpool (40 threads), so slow
+scrapes queue the probes behind them; async endpoints only wait on the
+event loop. SQLite serializes writes, so use ``--database-url`` with
+MySQL for numbers that reflect production.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COMPANY_HTML = "<html><body><h1>{name}</h1><p>Industry: Software</p><p>1,000 followers</p></body></html>"
+
+
+class SlowLinkedIn(BaseHTTPRequestHandler):
+    delay = 1.0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        body = COMPANY_HTML.format(name=self.path.strip("/").split("/")[-1]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+
+async def run_stack(app, prefix: str, scrapes: int, probe_interval: float) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await client.get(f"{prefix}/health/db")  # warm up the pool
+        probes, done = [], asyncio.Event()
+
+        async def probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get(f"{prefix}/health/db")
+                probes.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(probe_interval)
+
+        async def scrape(i: int) -> int:
+            response = await client.get(f"{prefix}/pages/bench{prefix.replace('/', '-')}-{i}")
+            return response.status_code
+
+        prober = asyncio.create_task(probe())
+        start = time.perf_counter()
+        statuses = await asyncio.gather(*[scrape(i) for i in range(scrapes)])
+        elapsed = time.perf_counter() - start
+        done.set()
+        await prober
+
+    return {
+        "ok": statuses.count(200),
+        "elapsed": elapsed,
+        "throughput": scrapes / elapsed,
+        "p50": percentile(probes, 50),
+        "p99": percentile(probes, 99),
+        "max": max(probes, default=0.0),
+        "probes": len(probes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scrapes", type=int, default=100, help="concurrent page requests that scrape")
+    parser.add_argument("--scrape-delay", type=float, default=1.0, help="seconds the fake LinkedIn takes per page")
+    parser.add_argument("--probe-interval", type=float, default=0.01, help="seconds between /health/db probes")
+    parser.add_argument("--database-url", help="database to use (default: a temporary SQLite file)")
+    args = parser.parse_args()
+
+    SlowLinkedIn.delay = args.scrape_delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowLinkedIn)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # Settings are read at import time, so configure before importing the app
+    workdir = tempfile.mkdtemp(prefix="bench-api-")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir}/bench.db"
+    os.environ.update({
+        "LINKEDIN_BASE_URL": f"http://127.0.0.1:{server.server_port}",
+        "SCRAPE_RATE_PER_HOST": "100000",
+        "SCRAPE_BURST": "100000",
+        "FETCH_CACHE_DIR": f"{workdir}/fetch-cache",
+        "ARCHIVE_ENABLED": "false",
+    })
+    from app.main import app
+
+    print(f"scrapes: {args.scrapes}  scrape delay: {args.scrape_delay}s  database: {os.environ['DATABASE_URL']}")
+    print(f"{'stack':<8} {'ok':>5} {'wall s':>8} {'pages/s':>8} {'probes':>7} "
+          f"{'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, prefix in [("sync", "/api/v1"), ("async", "/api/v2")]:
+        result = asyncio.run(run_stack(app, prefix, args.scrapes, args.probe_interval))
+        print(f"{name:<8} {result['ok']:>5} {result['elapsed']:>8.2f} {result['throughput']:>8.1f} "
+              f"{result['probes']:>7} {result['p50']:>8.1f} {result['p99']:>8.1f} {result['max']:>8.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
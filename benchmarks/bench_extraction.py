@@ -0,0 +1,58 @@
+"""CPU time per page for the per-field extractors vs the single-pass engine.
+
+    python -m benchmarks.bench_extraction [--corpus DIR] [--repeat N]
+"""
+import argparse
+import time
+
+from bs4 import BeautifulSoup
+
+from app.scrapers.extraction import extract_text_fields
+from app.scrapers.linkedin_scraper import LinkedInScraper
+from benchmarks.corpus import load_corpus
+
+
+def per_field(scraper: LinkedInScraper, soup: BeautifulSoup) -> dict:
+    return {
+        "industry": scraper._extract_industry(soup),
+        "total_followers": scraper._extract_followers(soup),
+        "head_count": scraper._extract_headcount(soup),
+        "specialities": scraper._extract_specialities(soup),
+        "company_type": scraper._extract_company_type(soup),
+        "founded_year": scraper._extract_founded_year(soup),
+        "headquarters": scraper._extract_headquarters(soup),
+        "locations": scraper._extract_locations(soup),
+    }
+
+
+def cpu_ms_per_page(fn, soups, repeat: int) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        for soup in soups:
+            fn(soup)
+    return (time.process_time() - start) * 1000 / (repeat * len(soups))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="directory of saved company page *.html files")
+    parser.add_argument("--pages", type=int, default=20, help="synthetic pages when no corpus is given")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, args.pages)
+    soups = [BeautifulSoup(html, "html.parser") for _, html in corpus]
+    avg_kb = sum(len(html) for _, html in corpus) / len(corpus) / 1024
+    scraper = LinkedInScraper()
+
+    before = cpu_ms_per_page(lambda soup: per_field(scraper, soup), soups, args.repeat)
+    after = cpu_ms_per_page(extract_text_fields, soups, args.repeat)
+
+    print(f"pages: {len(soups)}  avg size: {avg_kb:.0f} KiB  repeat: {args.repeat}")
+    print(f"per-field extractors : {before:8.2f} ms CPU/page")
+    print(f"single-pass engine   : {after:8.2f} ms CPU/page")
+    print(f"speedup              : {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
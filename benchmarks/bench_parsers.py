@@ -0,0 +1,51 @@
+"""Parse and extract time per page for each HTML parser backend.
+
+    python -m benchmarks.bench_parsers [--corpus DIR] [--repeat N]
+"""
+import argparse
+import time
+
+from app.scrapers.linkedin_scraper import LinkedInScraper
+from app.scrapers.parsers import PARSER_BACKENDS, parse_html
+from benchmarks.corpus import load_corpus
+
+
+def bench_backend(backend: str, corpus, repeat: int):
+    scraper = LinkedInScraper(parser=backend)
+    parse_s = extract_s = 0.0
+    for _ in range(repeat):
+        for page_id, html in corpus:
+            start = time.perf_counter()
+            soup = parse_html(html, backend)
+            parsed = time.perf_counter()
+            scraper.extract_page(page_id, f"https://www.linkedin.com/company/{page_id}/", soup)
+            parse_s += parsed - start
+            extract_s += time.perf_counter() - parsed
+    runs = repeat * len(corpus)
+    return parse_s * 1000 / runs, extract_s * 1000 / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="directory of saved company page *.html files")
+    parser.add_argument("--pages", type=int, default=20, help="synthetic pages when no corpus is given")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backend", action="append", choices=PARSER_BACKENDS,
+                        help="backend to run (repeatable, default: all)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, args.pages)
+    avg_kb = sum(len(html) for _, html in corpus) / len(corpus) / 1024
+    print(f"pages: {len(corpus)}  avg size: {avg_kb:.0f} KiB  repeat: {args.repeat}")
+    print(f"{'backend':<12} {'parse ms':>10} {'extract ms':>11} {'total ms':>10}")
+    for backend in args.backend or PARSER_BACKENDS:
+        try:
+            parse_ms, extract_ms = bench_backend(backend, corpus, args.repeat)
+        except ImportError as e:
+            print(f"{backend:<12} skipped ({e})")
+            continue
+        print(f"{backend:<12} {parse_ms:>10.2f} {extract_ms:>11.2f} {parse_ms + extract_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Saved company pages used by the scraper benchmarks.
+
+Point ``--corpus`` at a directory of saved ``*.html`` company pages to
+benchmark against real markup. Without one, large synthetic pages with a
+LinkedIn-like structure are generated so the benchmarks are runnable anywhere.
+"""
+import random
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+FILLER_SENTENCES = [
+    "Our team shipped a new release this week with many improvements.",
+    "Thanks to everyone who joined the webinar on data platforms.",
+    "We are proud to announce a partnership with a global retailer.",
+    "Read the full case study on our blog.",
+    "Congratulations to the winners of our annual hackathon!",
+]
+
+
+def synthetic_page(seed: int, posts: int = 400) -> str:
+    """Build one large company page with the about section near the end"""
+    rng = random.Random(seed)
+    feed = []
+    for i in range(posts):
+        feed.append(
+            f'<div class="feed-shared-update-v2" data-urn="urn:li:activity:{seed}{i:05d}">'
+            f'<span class="update-components-actor">Company {seed}</span>'
+            f'<div class="update-components-text"><p>{rng.choice(FILLER_SENTENCES)}</p>'
+            f'<p>{rng.choice(FILLER_SENTENCES)}</p></div>'
+            f'<ul><li>{rng.randint(1, 900)} reactions</li><li>{rng.randint(0, 90)} comments</li></ul>'
+            f'</div>'
+        )
+    about = (
+        f"<section><p>Industry: Information Technology</p>"
+        f"<p>{rng.randint(1000, 900000):,} followers</p>"
+        f"<p>Company size: 201-500 employees</p>"
+        f"<p>Specialties: Cloud, Analytics, Machine Learning, Consulting</p>"
+        f"<p>Type: Public Company</p><p>Founded {rng.randint(1990, 2020)}</p>"
+        f"<p>Headquarters: Austin, TX</p><p>Offices: London; Berlin; Remote</p></section>"
+    )
+    return (
+        f"<html><head><title>Company {seed}</title></head><body>"
+        f"<h1 class=\"org-top-card-summary__title\">Company {seed}</h1>"
+        f"<img class=\"org-top-card-primary-content__logo\" src=\"https://example.com/{seed}.png\"/>"
+        f"<main>{''.join(feed)}</main>{about}</body></html>"
+    )
+
+
+def load_corpus(directory: Optional[str] = None, count: int = 20) -> List[Tuple[str, str]]:
+    """Return ``(page_id, html)`` pairs from a directory or synthetic pages"""
+    if directory:
+        paths = sorted(Path(directory).glob("*.html"))
+        return [(path.stem, path.read_text(encoding="utf-8", errors="replace")) for path in paths]
+    return [(f"company-{i}", synthetic_page(i)) for i in range(count)]
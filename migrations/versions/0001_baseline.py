@@ -0,0 +1,78 @@
+"""Baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+Databases created by Base.metadata.create_all before migrations existed
+already have these tables: mark them with ``alembic stamp 0001``.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "pages",
+        sa.Column("id", sa.String(100), primary_key=True),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("url", sa.String(500)),
+        sa.Column("profile_picture", sa.String(500)),
+        sa.Column("description", sa.Text),
+        sa.Column("website", sa.String(500)),
+        sa.Column("industry", sa.String(200)),
+        sa.Column("total_followers", sa.Integer),
+        sa.Column("head_count", sa.String(50)),
+        sa.Column("specialities", sa.JSON),
+        sa.Column("company_type", sa.String(100)),
+        sa.Column("founded_year", sa.Integer),
+        sa.Column("headquarters", sa.String(200)),
+        sa.Column("locations", sa.JSON),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("updated_at", sa.DateTime),
+    )
+    op.create_table(
+        "posts",
+        sa.Column("id", sa.String(100), primary_key=True),
+        sa.Column("page_id", sa.String(100), sa.ForeignKey("pages.id")),
+        sa.Column("content", sa.Text),
+        sa.Column("post_type", sa.String(50)),
+        sa.Column("media_urls", sa.JSON),
+        sa.Column("like_count", sa.Integer),
+        sa.Column("comment_count", sa.Integer),
+        sa.Column("share_count", sa.Integer),
+        sa.Column("posted_at", sa.DateTime),
+        sa.Column("created_at", sa.DateTime),
+    )
+    op.create_table(
+        "comments",
+        sa.Column("id", sa.String(100), primary_key=True),
+        sa.Column("post_id", sa.String(100), sa.ForeignKey("posts.id")),
+        sa.Column("user_name", sa.String(200)),
+        sa.Column("user_profile_url", sa.String(500)),
+        sa.Column("content", sa.Text),
+        sa.Column("commented_at", sa.DateTime),
+        sa.Column("created_at", sa.DateTime),
+    )
+    op.create_table(
+        "social_media_users",
+        sa.Column("id", sa.String(100), primary_key=True),
+        sa.Column("page_id", sa.String(100), sa.ForeignKey("pages.id")),
+        sa.Column("name", sa.String(200)),
+        sa.Column("profile_url", sa.String(500)),
+        sa.Column("profile_picture", sa.String(500)),
+        sa.Column("position", sa.String(200)),
+        sa.Column("created_at", sa.DateTime),
+    )
+
+
+def downgrade():
+    op.drop_table("social_media_users")
+    op.drop_table("comments")
+    op.drop_table("posts")
+    op.drop_table("pages")
@@ -0,0 +1,105 @@
+"""Collapse duplicate posts, comments and employees onto stable ids
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+Posts and employees used to get time-based ids (``post_{i}_{timestamp}``,
+``emp_{i}_{timestamp}``), so every refresh inserted a fresh copy of each.
+This gives every row the id the scraper now derives (see
+app.scrapers.ids), keeps the most recently created row of each id and
+deletes the rest. URN ids are kept as they are. Duplicates cannot be told
+apart from genuine repeats within one scrape, so all of them map to
+occurrence 0. The hashing is copied here so later changes to
+app.scrapers.ids do not change what this migration did.
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+CHUNK = 500
+
+posts = sa.table(
+    "posts",
+    sa.column("id"), sa.column("page_id"), sa.column("content"), sa.column("post_type"),
+    sa.column("media_urls"), sa.column("like_count"), sa.column("comment_count"),
+    sa.column("share_count"), sa.column("posted_at"), sa.column("created_at"),
+)
+comments = sa.table(
+    "comments",
+    sa.column("id"), sa.column("post_id"), sa.column("user_profile_url"),
+    sa.column("content"), sa.column("created_at"),
+)
+employees = sa.table(
+    "social_media_users",
+    sa.column("id"), sa.column("page_id"), sa.column("profile_url"), sa.column("created_at"),
+)
+
+
+def content_id(prefix, *parts):
+    digest = hashlib.sha1("\x1f".join(str(part or "") for part in parts).encode()).hexdigest()
+    return f"{prefix}_{digest[:24]}"
+
+
+def plan(bind, table, prefix, parent, parts):
+    """(ids to delete, [(old id, new id)] to rename), newest row of each id kept"""
+    rows = bind.execute(
+        sa.select(table.c.id, table.c[parent], *[table.c[p] for p in parts])
+        .order_by(table.c.created_at.desc(), table.c.id)
+    )
+    kept, drops, renames = set(), [], []
+    for row in rows:
+        old_id = row[0]
+        new_id = old_id if old_id.startswith("urn:li:") else content_id(prefix, *row[1:], 0)
+        if new_id in kept:
+            drops.append(old_id)
+            continue
+        kept.add(new_id)
+        if new_id != old_id:
+            renames.append((old_id, new_id))
+    return drops, renames
+
+
+def delete_where_in(bind, table, column, values):
+    for start in range(0, len(values), CHUNK):
+        bind.execute(table.delete().where(table.c[column].in_(values[start:start + CHUNK])))
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # Posts: comments of dropped copies go with them. Renamed posts are
+    # copied under the new id first so comments never point at a missing
+    # post (the foreign key has no ON UPDATE CASCADE).
+    drops, renames = plan(bind, posts, "post", "page_id", ["content"])
+    delete_where_in(bind, comments, "post_id", drops)
+    delete_where_in(bind, posts, "id", drops)
+    copied = [c for c in posts.c if c.name != "id"]
+    for old_id, new_id in renames:
+        bind.execute(posts.insert().from_select(
+            ["id"] + [c.name for c in copied],
+            sa.select(sa.literal(new_id), *copied).where(posts.c.id == old_id),
+        ))
+        bind.execute(comments.update().where(comments.c.post_id == old_id).values(post_id=new_id))
+        bind.execute(posts.delete().where(posts.c.id == old_id))
+
+    # Comments and employees have no dependents and are renamed in place
+    for table, prefix, parent, parts in (
+        (comments, "comment", "post_id", ["user_profile_url", "content"]),
+        (employees, "emp", "page_id", ["profile_url"]),
+    ):
+        drops, renames = plan(bind, table, prefix, parent, parts)
+        delete_where_in(bind, table, "id", drops)
+        for old_id, new_id in renames:
+            bind.execute(table.update().where(table.c.id == old_id).values(id=new_id))
+
+
+def downgrade():
+    # Deleted duplicates cannot be restored; the new ids work with old code
+    pass
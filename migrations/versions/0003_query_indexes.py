@@ -0,0 +1,32 @@
+"""Indexes for the per-page query paths
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_posts_page_id_posted_at", "posts", ["page_id", "posted_at"]),
+    ("ix_posts_page_id_engagement", "posts", ["page_id", "like_count", "comment_count", "share_count"]),
+    ("ix_comments_post_id_commented_at", "comments", ["post_id", "commented_at"]),
+    ("ix_social_media_users_page_id_position", "social_media_users", ["page_id", "position"]),
+    ("ix_social_media_users_page_id_created_at", "social_media_users", ["page_id", "created_at"]),
+    ("ix_pages_total_followers", "pages", ["total_followers"]),
+    ("ix_pages_updated_at", "pages", ["updated_at"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
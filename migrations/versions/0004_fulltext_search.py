@@ -0,0 +1,56 @@
+"""Full-text indexes for posts and pages
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+MySQL: FULLTEXT indexes. SQLite: FTS5 tables with sync triggers, filled
+from the existing rows. Other databases search with LIKE and need nothing.
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+FTS_TABLES = {"posts": ["content"], "pages": ["name", "description"]}
+
+
+def sqlite_statements(table, columns):
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', content_rowid='rowid')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "mysql":
+        op.execute("CREATE FULLTEXT INDEX ft_posts_content ON posts (content)")
+        op.execute("CREATE FULLTEXT INDEX ft_pages_name_description ON pages (name, description)")
+    elif dialect == "sqlite":
+        for table, columns in FTS_TABLES.items():
+            for statement in sqlite_statements(table, columns):
+                op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "mysql":
+        op.drop_index("ft_pages_name_description", table_name="pages")
+        op.drop_index("ft_posts_content", table_name="posts")
+    elif dialect == "sqlite":
+        for table in FTS_TABLES:
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
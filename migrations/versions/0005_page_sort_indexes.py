@@ -0,0 +1,32 @@
+"""Indexes for keyset pagination of pages
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+Each sort column is indexed together with id, the tie breaker, so every
+page of results is one range scan. These replace the single-column
+follower and updated_at indexes from 0003.
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_pages_total_followers_id", "pages", ["total_followers", "id"])
+    op.create_index("ix_pages_name_id", "pages", ["name", "id"])
+    op.create_index("ix_pages_updated_at_id", "pages", ["updated_at", "id"])
+    op.drop_index("ix_pages_total_followers", table_name="pages")
+    op.drop_index("ix_pages_updated_at", table_name="pages")
+
+
+def downgrade():
+    op.create_index("ix_pages_total_followers", "pages", ["total_followers"])
+    op.create_index("ix_pages_updated_at", "pages", ["updated_at"])
+    op.drop_index("ix_pages_updated_at_id", table_name="pages")
+    op.drop_index("ix_pages_name_id", table_name="pages")
+    op.drop_index("ix_pages_total_followers_id", table_name="pages")
@@ -0,0 +1,38 @@
+"""Denormalized post and employee counts on pages
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+Adds pages.post_count and pages.employee_count and fills them from the
+current rows. From then on the scrape persistence path keeps them up to
+date and ``python -m app.reconcile`` repairs drift.
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("pages") as batch:
+        batch.add_column(sa.Column("post_count", sa.Integer(), nullable=False, server_default="0"))
+        batch.add_column(sa.Column("employee_count", sa.Integer(), nullable=False, server_default="0"))
+
+    # updated_at is assigned to itself so MySQL's ON UPDATE does not touch it
+    op.execute(
+        "UPDATE pages SET "
+        "post_count = (SELECT COUNT(*) FROM posts WHERE posts.page_id = pages.id), "
+        "employee_count = (SELECT COUNT(*) FROM social_media_users WHERE social_media_users.page_id = pages.id), "
+        "updated_at = updated_at"
+    )
+
+
+def downgrade():
+    # Plain ALTER TABLE ... DROP COLUMN: rebuilding pages would drop its SQLite FTS triggers
+    with op.batch_alter_table("pages", recreate="never") as batch:
+        batch.drop_column("employee_count")
+        batch.drop_column("post_count")
@@ -0,0 +1,58 @@
+"""Engagement rollup tables
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+page_engagement holds each page's all-time post/like/comment/share
+totals and page_engagement_daily the same per day posted. Both are
+filled from the current posts here; the scrape persistence path keeps
+them up to date afterwards (see app.services.rollups).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+METRICS = ["posts", "likes", "comments", "shares"]
+
+SUMS = (
+    "COUNT(*), COALESCE(SUM(like_count), 0), "
+    "COALESCE(SUM(comment_count), 0), COALESCE(SUM(share_count), 0)"
+)
+
+
+def metric_columns():
+    return [sa.Column(name, sa.BigInteger, nullable=False) for name in METRICS]
+
+
+def upgrade():
+    op.create_table(
+        "page_engagement",
+        sa.Column("page_id", sa.String(100), sa.ForeignKey("pages.id"), primary_key=True),
+        *metric_columns(),
+    )
+    op.create_table(
+        "page_engagement_daily",
+        sa.Column("page_id", sa.String(100), sa.ForeignKey("pages.id"), primary_key=True),
+        sa.Column("day", sa.Date, primary_key=True),
+        *metric_columns(),
+    )
+
+    op.execute(
+        f"INSERT INTO page_engagement (page_id, {', '.join(METRICS)}) "
+        f"SELECT page_id, {SUMS} FROM posts WHERE page_id IS NOT NULL GROUP BY page_id"
+    )
+    op.execute(
+        f"INSERT INTO page_engagement_daily (page_id, day, {', '.join(METRICS)}) "
+        f"SELECT page_id, DATE(posted_at), {SUMS} FROM posts "
+        "WHERE page_id IS NOT NULL AND posted_at IS NOT NULL GROUP BY page_id, DATE(posted_at)"
+    )
+
+
+def downgrade():
+    op.drop_table("page_engagement_daily")
+    op.drop_table("page_engagement")
@@ -0,0 +1,57 @@
+"""Stored post engagement score
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+Adds posts.engagement_score with a (page_id, engagement_score) index so
+top posts are read in index order, scores the current posts with the
+configured weights, and records those weights in the new app_state table
+(see app.services.scoring). The key and the weight settings are copied
+here so later changes to app.services.scoring do not change what this
+migration did.
+"""
+from datetime import datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.config import settings
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+WEIGHTS_KEY = "engagement_weights"
+
+
+def upgrade():
+    op.create_table(
+        "app_state",
+        sa.Column("key", sa.String(100), primary_key=True),
+        sa.Column("value", sa.JSON),
+        sa.Column("updated_at", sa.DateTime),
+    )
+    with op.batch_alter_table("posts") as batch:
+        batch.add_column(sa.Column("engagement_score", sa.Double(), nullable=False, server_default="0"))
+        batch.create_index("ix_posts_page_id_engagement_score", ["page_id", "engagement_score"])
+
+    likes, comments, shares = weights = (
+        settings.engagement_like_weight, settings.engagement_comment_weight, settings.engagement_share_weight
+    )
+    op.execute(
+        "UPDATE posts SET engagement_score = "
+        f"COALESCE(like_count, 0) * {likes} + COALESCE(comment_count, 0) * {comments} "
+        f"+ COALESCE(share_count, 0) * {shares}"
+    )
+    app_state = sa.table("app_state", sa.column("key"), sa.column("value", sa.JSON), sa.column("updated_at"))
+    op.bulk_insert(app_state, [{"key": WEIGHTS_KEY, "value": list(weights), "updated_at": datetime.utcnow()}])
+
+
+def downgrade():
+    # Plain ALTER TABLE ... DROP COLUMN: rebuilding posts would drop its SQLite FTS triggers
+    with op.batch_alter_table("posts", recreate="never") as batch:
+        batch.drop_index("ix_posts_page_id_engagement_score")
+        batch.drop_column("engagement_score")
+    op.drop_table("app_state")
@@ -0,0 +1,44 @@
+"""Page snapshot history
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+
+page_snapshots holds a page's followers, post and employee counts and
+engagement totals as of each refresh (see app.services.snapshots). Each
+existing page starts its history with one snapshot of its current values,
+taken at its last refresh.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "page_snapshots",
+        sa.Column("page_id", sa.String(100), sa.ForeignKey("pages.id"), primary_key=True),
+        sa.Column("taken_at", sa.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"), primary_key=True),
+        sa.Column("followers", sa.Integer, nullable=False),
+        sa.Column("posts", sa.Integer, nullable=False),
+        sa.Column("employees", sa.Integer, nullable=False),
+        sa.Column("likes", sa.BigInteger, nullable=False),
+        sa.Column("comments", sa.BigInteger, nullable=False),
+        sa.Column("shares", sa.BigInteger, nullable=False),
+    )
+    op.execute(
+        "INSERT INTO page_snapshots (page_id, taken_at, followers, posts, employees, likes, comments, shares) "
+        "SELECT pages.id, COALESCE(pages.updated_at, CURRENT_TIMESTAMP), COALESCE(pages.total_followers, 0), "
+        "pages.post_count, pages.employee_count, COALESCE(page_engagement.likes, 0), "
+        "COALESCE(page_engagement.comments, 0), COALESCE(page_engagement.shares, 0) "
+        "FROM pages LEFT JOIN page_engagement ON page_engagement.page_id = pages.id"
+    )
+
+
+def downgrade():
+    op.drop_table("page_snapshots")
@@ -0,0 +1,44 @@
+"""Cold storage bookkeeping
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+
+cold_partitions records each Parquet file of posts or comments moved out
+of the database, with its row count and engagement totals, and
+pages.posts_archived_before / comments_archived_before the retention
+cutoffs applied to each page (see app.services.cold_storage).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "cold_partitions",
+        sa.Column("page_id", sa.String(100), sa.ForeignKey("pages.id"), primary_key=True),
+        sa.Column("kind", sa.String(20), primary_key=True),
+        sa.Column("month", sa.String(7), primary_key=True),
+        sa.Column("file", sa.String(255), primary_key=True),
+        sa.Column("row_count", sa.Integer, nullable=False),
+        sa.Column("likes", sa.BigInteger, nullable=False),
+        sa.Column("comments", sa.BigInteger, nullable=False),
+        sa.Column("shares", sa.BigInteger, nullable=False),
+        sa.Column("created_at", sa.DateTime),
+    )
+    with op.batch_alter_table("pages") as batch:
+        batch.add_column(sa.Column("posts_archived_before", sa.DateTime))
+        batch.add_column(sa.Column("comments_archived_before", sa.DateTime))
+
+
+def downgrade():
+    # Plain ALTER TABLE ... DROP COLUMN: rebuilding pages would drop its SQLite FTS triggers
+    with op.batch_alter_table("pages", recreate="never") as batch:
+        batch.drop_column("comments_archived_before")
+        batch.drop_column("posts_archived_before")
+    op.drop_table("cold_partitions")
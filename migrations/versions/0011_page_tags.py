@@ -0,0 +1,100 @@
+"""Native JSON lists and indexed page tags
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+
+pages.specialities, pages.locations and posts.media_urls were written as
+json.dumps() strings into JSON columns, so each value was stored as a
+JSON string holding the encoded list. They are unwrapped into the list
+itself. page_tags gets a row per speciality and location of each page,
+with a (kind, value, page_id) index for the /pages filters (see
+app.services.page_tags).
+
+The downgrade drops page_tags and keeps the lists unwrapped: the earlier
+code never read them back. The normalization of tag values is copied
+here so later changes to app.services.page_tags do not change what this
+migration did.
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = {"pages": ["specialities", "locations"], "posts": ["media_urls"]}
+
+BATCH_SIZE = 500
+
+KIND_ATTRIBUTES = {"speciality": "specialities", "location": "locations"}
+
+
+def normalize(value):
+    return " ".join(str(value).split()).lower()[:200].rstrip()
+
+
+def page_tags(page):
+    """(kind, value) pairs of a page row's specialities and locations"""
+    tags = set()
+    for kind, attribute in KIND_ATTRIBUTES.items():
+        values = getattr(page, attribute)
+        if isinstance(values, list):
+            tags.update((kind, normalize(value)) for value in values if normalize(value))
+    return tags
+
+
+def unwrap_statement(dialect, table, column):
+    """UPDATE turning a JSON string value into the JSON it encodes"""
+    if dialect == "mysql":
+        return (f"UPDATE {table} SET {column} = CAST(JSON_UNQUOTE({column}) AS JSON) "
+                f"WHERE JSON_TYPE({column}) = 'STRING'")
+    if dialect == "sqlite":
+        return (f"UPDATE {table} SET {column} = json(json_extract({column}, '$')) "
+                f"WHERE json_type({column}) = 'text'")
+    if dialect == "postgresql":
+        return (f"UPDATE {table} SET {column} = ({column} #>> '{{}}')::json "
+                f"WHERE json_typeof({column}) = 'string'")
+    return None
+
+
+def upgrade():
+    bind = op.get_bind()
+    for table, columns in JSON_COLUMNS.items():
+        for column in columns:
+            statement = unwrap_statement(bind.dialect.name, table, column)
+            if statement:
+                op.execute(statement)
+
+    page_tags_table = op.create_table(
+        "page_tags",
+        sa.Column("page_id", sa.String(100), sa.ForeignKey("pages.id"), primary_key=True),
+        sa.Column("kind", sa.String(20), primary_key=True),
+        sa.Column("value", sa.String(200).with_variant(mysql.VARCHAR(200, collation="utf8mb4_bin"), "mysql"),
+                  primary_key=True),
+    )
+    op.create_index("ix_page_tags_kind_value_page_id", "page_tags", ["kind", "value", "page_id"])
+
+    pages = sa.table("pages", sa.column("id", sa.String), sa.column("specialities", sa.JSON),
+                     sa.column("locations", sa.JSON))
+    last_id = ""
+    while True:
+        batch = bind.execute(
+            sa.select(pages).where(pages.c.id > last_id).order_by(pages.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+        rows = [
+            {"page_id": page.id, "kind": kind, "value": value}
+            for page in batch for kind, value in sorted(page_tags(page))
+        ]
+        if rows:
+            op.bulk_insert(page_tags_table, rows)
+
+
+def downgrade():
+    op.drop_index("ix_page_tags_kind_value_page_id", table_name="page_tags")
+    op.drop_table("page_tags")
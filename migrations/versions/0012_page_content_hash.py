@@ -0,0 +1,30 @@
+"""Body hash of the stored page
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18
+
+pages.content_hash is the SHA-256 of the fetched body the page was last
+parsed from. Refreshes compare the fetched body against it instead of
+the local fetch cache, which can be ahead of the database when saving a
+scrape failed. Existing pages start without one and are parsed on their
+next refresh.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("pages") as batch:
+        batch.add_column(sa.Column("content_hash", sa.String(64)))
+
+
+def downgrade():
+    # Plain ALTER TABLE ... DROP COLUMN: rebuilding pages would drop its SQLite FTS triggers
+    with op.batch_alter_table("pages", recreate="never") as batch:
+        batch.drop_column("content_hash")
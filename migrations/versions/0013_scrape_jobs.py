@@ -0,0 +1,39 @@
+"""Bulk scrape jobs
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18
+
+scrape_jobs holds the bulk scrape jobs behind /pages/bulk and /jobs/{id}.
+It came after the baseline, so databases stamped 0001 get it here.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "scrape_jobs",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("status", sa.String(20)),
+        sa.Column("page_ids", sa.JSON),
+        sa.Column("concurrency", sa.Integer),
+        sa.Column("total", sa.Integer),
+        sa.Column("refreshed", sa.Integer),
+        sa.Column("unchanged", sa.Integer),
+        sa.Column("failed", sa.Integer),
+        sa.Column("errors", sa.JSON),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("started_at", sa.DateTime),
+        sa.Column("heartbeat_at", sa.DateTime),
+        sa.Column("finished_at", sa.DateTime),
+    )
+
+
+def downgrade():
+    op.drop_table("scrape_jobs")
@@ -0,0 +1,25 @@
+"""Drop the covering index of the old engagement aggregates
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-18
+
+ix_posts_page_id_engagement (page_id, like_count, comment_count,
+share_count) served the per-request COUNT/SUM over a page's posts. The
+engagement endpoint reads the rollups (0007) instead, so the index only
+cost a write on every post insert and counter update.
+"""
+from alembic import op
+
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index("ix_posts_page_id_engagement", table_name="posts")
+
+
+def downgrade():
+    op.create_index("ix_posts_page_id_engagement", "posts", ["page_id", "like_count", "comment_count", "share_count"])
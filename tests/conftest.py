@@ -1,7 +1,67 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 from fastapi.testclient import TestClient
+from app.config import settings
 from app.main import app
 
+COMPANY_HTML = """
+<html><body>
+  <h1>{name}</h1>
+  <p>Industry: Software</p>
+  <p>4,200 followers</p>
+  <p>Founded 2011</p>
+</body></html>
+"""
+
+
 @pytest.fixture(scope="session")
 def client():
     return TestClient(app)
+
+
+class FakeLinkedIn(BaseHTTPRequestHandler):
+    """Local stand-in for linkedin.com company pages; 'missing' returns 404
+    and 'throttled' a 429 with Retry-After"""
+
+    def do_GET(self):
+        page_id = self.path.strip("/").split("/")[-1]
+        if page_id == "missing":
+            self.send_response(404)
+            self.end_headers()
+            return
+        if page_id == "throttled":
+            self.send_response(429)
+            self.send_header("Retry-After", "120")
+            self.end_headers()
+            return
+        etag = f'"{page_id}-v1"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = COMPANY_HTML.format(name=page_id.title()).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_linkedin(monkeypatch, tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeLinkedIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(settings, "linkedin_base_url", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(settings, "scrape_rate_per_host", 1000)
+    monkeypatch.setattr(settings, "scrape_burst", 1000)
+    monkeypatch.setattr(settings, "fetch_cache_dir", str(tmp_path / "fetch-cache"))
+    monkeypatch.setattr(settings, "archive_dir", str(tmp_path / "archive"))
+    yield server
+    server.shutdown()
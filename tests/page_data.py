@@ -0,0 +1,35 @@
+import random
+from typing import Dict
+
+from app.scrapers.linkedin_scraper import LinkedInScraper
+from app.scrapers.parsers import parse_html
+
+
+def mock_page_data(scraper: LinkedInScraper, page_id: str) -> Dict:
+    """Scraped data for a made-up page, the same for the same page_id"""
+    # Generate consistent mock data based on page_id
+    seed_value = sum(ord(c) for c in page_id)
+    random.seed(seed_value)
+
+    industries = ["Technology", "Software", "Consulting", "Finance", "Healthcare"]
+    company_types = ["Private Company", "Public Company", "Startup", "Non-profit"]
+    locations_list = ["San Francisco, CA", "New York, NY", "Austin, TX", "Remote"]
+
+    return {
+        "id": page_id,
+        "name": f"{page_id.replace('-', ' ').title()} Inc.",
+        "url": f"https://linkedin.com/company/{page_id}",
+        "profile_picture": "https://via.placeholder.com/150",
+        "description": f"{page_id.replace('-', ' ').title()} is a leading company in its industry, focused on innovation and customer satisfaction.",
+        "website": f"https://{page_id}.com",
+        "industry": random.choice(industries),
+        "total_followers": random.randint(1000, 50000),
+        "head_count": random.choice(["1-10", "11-50", "51-200", "201-500"]),
+        "specialities": ["Software Development", "AI/ML", "Cloud Solutions", "Data Analytics"][:random.randint(2, 4)],
+        "company_type": random.choice(company_types),
+        "founded_year": random.randint(2000, 2020),
+        "headquarters": random.choice(locations_list),
+        "locations": random.sample(locations_list, random.randint(1, 3)),
+        "posts": scraper._extract_posts(parse_html("<div></div>", scraper.parser), page_id, limit=10),
+        "employees": scraper._extract_employees(parse_html("<div></div>", scraper.parser), page_id)
+    }
@@ -0,0 +1,94 @@
+import subprocess
+import sys
+from datetime import datetime
+
+from app.models.page import Page
+from app.models.snapshot import PageSnapshot
+from app.database import SessionLocal
+from app.reextract import reextract
+from app.scrapers.archive import GZIP, ZSTD, PageArchive
+from app.scrapers.linkedin_scraper import LinkedInScraper, company_url
+
+
+def test_append_and_read_back_across_segments(tmp_path):
+    archive = PageArchive(str(tmp_path), segment_bytes=32, codec=GZIP)
+    first = archive.append("acme", "https://example.com/acme", b"<html>v1</html>" * 20)
+    archive.codec = ZSTD
+    second = archive.append("acme", "https://example.com/acme", b"<html>v2</html>" * 20)
+    other = archive.append("globex", "https://example.com/globex", b"<html>globex</html>")
+
+    assert first.segment != second.segment  # the first segment filled up
+    assert archive.read(first) == b"<html>v1</html>" * 20
+    assert archive.read(second) == b"<html>v2</html>" * 20
+
+    latest = {record.page_id: record for record in archive.latest()}
+    assert latest["acme"] == second
+    assert latest["globex"] == other
+    assert [r.page_id for r in archive.latest(["globex"])] == ["globex"]
+    archive.close()
+
+
+WINDOWS_APPEND = """
+import asyncio, subprocess, sys, types  # stdlib modules that need fcntl on POSIX
+sys.modules["fcntl"] = None  # as on Windows
+calls = []
+msvcrt = sys.modules["msvcrt"] = types.ModuleType("msvcrt")
+msvcrt.LK_LOCK, msvcrt.LK_UNLCK = 1, 0
+msvcrt.locking = lambda fd, mode, size: calls.append(mode)
+import app.scrapers.linkedin_scraper
+from app.scrapers.archive import GZIP, PageArchive
+archive = PageArchive(sys.argv[1], codec=GZIP)
+assert archive.read(archive.append("acme", "u", b"body")) == b"body"
+assert calls == [1, 0], calls
+"""
+
+
+def test_archive_locks_without_fcntl(tmp_path):
+    subprocess.run([sys.executable, "-c", WINDOWS_APPEND, str(tmp_path)], check=True)
+
+
+def test_scraper_archives_changed_bodies_only(fake_linkedin):
+    scraper = LinkedInScraper()
+    scraper.scrape_page("initech")
+    scraper.scrape_page("initech")  # 304, already archived
+
+    records = list(scraper.archive.records())
+    assert [r.url for r in records] == [company_url("initech")]
+    assert b"<h1>Initech</h1>" in scraper.archive.read(records[0])
+
+
+def test_reextract_upserts_archived_pages(client, fake_linkedin):
+    LinkedInScraper().scrape_page("umbrella")
+
+    summary = reextract(workers=2)
+    assert summary["refreshed"] == ["umbrella"]
+    assert not summary["failed"]
+
+    db = SessionLocal()
+    try:
+        page = db.query(Page).filter(Page.id == "umbrella").first()
+        assert page.name == "Umbrella"
+        assert page.total_followers == 4200
+        assert page.updated_at.isoformat() == PageArchive().latest(["umbrella"])[0].fetched_at
+    finally:
+        db.close()
+
+
+def test_reextract_is_not_a_fresh_scrape(client, fake_linkedin):
+    client.get("/api/v1/pages/initech")
+    refreshed_at = datetime(2024, 1, 1)
+    db = SessionLocal()
+    try:
+        db.query(Page).filter(Page.id == "initech").update({Page.updated_at: refreshed_at, Page.content_hash: None})
+        db.commit()
+        snapshots = db.query(PageSnapshot).filter(PageSnapshot.page_id == "initech").count()
+
+        assert reextract(["initech"], workers=1)["refreshed"] == ["initech"]
+
+        page = db.query(Page).filter(Page.id == "initech").populate_existing().first()
+        record, = PageArchive().latest(["initech"])
+        assert page.updated_at == refreshed_at
+        assert page.content_hash == record.body_hash
+        assert db.query(PageSnapshot).filter(PageSnapshot.page_id == "initech").count() == snapshots
+    finally:
+        db.close()
@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+
+def test_v2_scrapes_and_serves_a_page(client, fake_linkedin):
+    response = client.get("/api/v2/pages/async-acme")
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["id"] == "async-acme"
+    assert data["name"] == "Async-Acme"
+    assert data["stale"] is False
+
+    # The same row is visible to the sync API
+    assert client.get("/api/v1/pages/async-acme").json()["name"] == "Async-Acme"
+
+
+def test_v2_scrape_builds_no_sync_scraper(client, fake_linkedin, monkeypatch):
+    from app.scrapers import async_scraper
+    from app.scrapers.linkedin_scraper import LinkedInScraper
+
+    async_scraper.page_parser(async_scraper.settings.html_parser)  # the parser is built once per process
+    built = []
+    original_init = LinkedInScraper.__init__
+
+    def counting_init(self, *args, **kwargs):
+        built.append(self)
+        original_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(LinkedInScraper, "__init__", counting_init)
+
+    assert client.get("/api/v2/pages/async-lean").status_code == 200
+    assert client.get("/api/v2/pages/async-lean/trends").status_code == 200
+    assert built == []
+
+
+def test_v2_read_endpoints_match_v1(client, fake_linkedin):
+    client.get("/api/v1/pages/google")
+    for path in [
+        "/pages/google/posts/recent",
+        "/pages/google/engagement",
+        "/pages/google/employees",
+        "/pages?name=goo",
+    ]:
+        v1 = client.get(f"/api/v1{path}")
+        v2 = client.get(f"/api/v2{path}")
+        assert v2.status_code == 200
+        assert v2.json() == v1.json()
+
+
+def test_v2_health_db(client):
+    response = client.get("/api/v2/health/db")
+    assert response.status_code == 200
+    assert response.json() == {"database": "connected"}
+
+
+def test_async_callers_share_one_scrape(fake_linkedin, monkeypatch):
+    from app.database import AsyncSessionLocal
+    from app.scrapers.async_scraper import AsyncLinkedInScraper
+    from app.services.page_service import AsyncPageService
+
+    calls = []
+    fetch_page = AsyncLinkedInScraper.fetch_page
+
+    async def slow_fetch(self, page_id, stored_hash=None):
+        calls.append(page_id)
+        await asyncio.sleep(0.2)
+        return await fetch_page(self, page_id, stored_hash)
+
+    monkeypatch.setattr(AsyncLinkedInScraper, "fetch_page", slow_fetch)
+
+    async def request():
+        async with AsyncSessionLocal() as db:
+            return (await AsyncPageService(db).get_or_scrape_page("async-burst")).id
+
+    async def burst():
+        return await asyncio.gather(*[request() for _ in range(6)])
+
+    assert asyncio.run(burst()) == ["async-burst"] * 6
+    assert calls == ["async-burst"]
+
+
+def test_v2_failed_scrape_serves_stored_row(client, fake_linkedin, monkeypatch):
+    from datetime import datetime, timedelta
+    from app.database import SessionLocal
+    from app.models.page import Page
+    from app.scrapers import async_scraper
+    from app.scrapers.circuit_breaker import CircuitBreaker
+
+    monkeypatch.setattr(async_scraper, "linkedin_breaker", CircuitBreaker("test"))
+
+    db = SessionLocal()
+    db.merge(Page(id="throttled", name="Throttled Co", updated_at=datetime.utcnow() - timedelta(days=30)))
+    db.commit()
+    db.close()
+
+    response = client.get("/api/v2/pages/throttled?refresh=true")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Throttled Co"
+    monkeypatch.setattr(async_scraper, "linkedin_breaker", CircuitBreaker("test"))
+    assert client.get("/api/v2/pages/missing").status_code == 404
+
+
+def test_fetch_cache_runs_off_the_event_loop(fake_linkedin):
+    import threading
+    from app.scrapers.async_scraper import AsyncLinkedInScraper
+    from app.scrapers.fetch_cache import FetchCache
+    from app.scrapers.circuit_breaker import CircuitBreaker
+
+    threads = set()
+
+    class RecordingCache(FetchCache):
+        def conditional_headers(self, url):
+            threads.add(threading.current_thread())
+            return super().conditional_headers(url)
+
+        def store(self, url, status_code, headers, body):
+            threads.add(threading.current_thread())
+            return super().store(url, status_code, headers, body)
+
+    scraper = AsyncLinkedInScraper(fetch_cache=RecordingCache(), breaker=CircuitBreaker("test"))
+    assert asyncio.run(scraper.fetch_page("cache-co"))["name"] == "Cache-Co"
+    assert threads and threading.main_thread() not in threads
+
+
+def test_v2_without_async_driver_answers_503(client, monkeypatch):
+    from app import database
+
+    def unavailable():
+        raise database.AsyncDriverUnavailable("The asyncio driver for mssql is not installed")
+
+    monkeypatch.setattr(database, "async_engines", unavailable)
+    assert client.get("/api/v2/health/db").status_code == 503
+    assert client.get("/api/v1/health/db").status_code == 200
+
+    with pytest.raises(database.AsyncDriverUnavailable):
+        database.async_url("mssql+pyodbc://user:secret@db/linkedin")
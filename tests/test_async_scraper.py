@@ -0,0 +1,37 @@
+import asyncio
+
+from app.scrapers.async_scraper import AsyncLinkedInScraper
+
+def test_scrape_many_streams_every_page(fake_linkedin):
+    page_ids = [f"company-{i}" for i in range(12)] + ["missing"]
+
+    async def collect():
+        scraper = AsyncLinkedInScraper(concurrency=4)
+        return [result async for result in scraper.scrape_many(page_ids)]
+
+    results = {r.page_id: r for r in asyncio.run(collect())}
+
+    assert set(results) == set(page_ids)
+    assert results["missing"].data is None
+    assert "404" in results["missing"].error
+    page = results["company-3"].data
+    assert page["name"] == "Company-3"
+    assert page["industry"] == "Software"
+    assert page["total_followers"] == 4200
+    assert page["founded_year"] == 2011
+
+
+def test_page_service_refresh_pages(fake_linkedin):
+    from app.database import SessionLocal
+    from app.models.page import Page
+    from app.services.page_service import PageService
+
+    db = SessionLocal()
+    try:
+        summary = PageService(db).refresh_pages(["bulk-a", "missing"], concurrency=2)
+
+        assert summary["refreshed"] == ["bulk-a"]
+        assert list(summary["failed"]) == ["missing"]
+        assert db.query(Page).filter(Page.id == "bulk-a").one().total_followers == 4200
+    finally:
+        db.close()
@@ -0,0 +1,161 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.scrapers import linkedin_scraper
+from app.scrapers.async_scraper import AsyncLinkedInScraper
+from app.scrapers.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from app.scrapers.linkedin_scraper import LinkedInScraper, ScrapeError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(clock):
+    return CircuitBreaker("test", failure_rate=0.5, min_requests=4, window_seconds=60,
+                          base_backoff=10, max_backoff=100, clock=clock)
+
+
+def test_breaker_opens_on_error_rate_and_recovers_through_half_open():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+
+    for ok in (True, False, True, False):
+        breaker.before_request()
+        breaker.record_success() if ok else breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    clock.now += 10
+    assert breaker.state == HALF_OPEN
+    breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()  # only one probe at a time
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.stats()["open_for_seconds"] == 20  # backoff doubled
+
+    clock.now += 20
+    breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.stats()["opened"] == 2
+
+
+def _half_open(clock):
+    breaker = _breaker(clock)
+    breaker.record_failure(throttled=True)
+    clock.now += 10
+    assert breaker.state == HALF_OPEN
+    return breaker
+
+
+def test_probe_without_outcome_reopens_circuit():
+    clock = FakeClock()
+    breaker = _half_open(clock)
+
+    probe = breaker.before_request()
+    breaker.release_probe(probe)  # e.g. the request was cancelled
+    assert breaker.state == OPEN
+    assert breaker.stats()["open_for_seconds"] == 20
+
+    clock.now += 20
+    probe = breaker.before_request()
+    breaker.record_success()
+    breaker.release_probe(probe)
+    assert breaker.state == CLOSED
+
+
+class HangingLimiter:
+    async def acquire_async(self, host):
+        await asyncio.Event().wait()
+
+
+def test_cancelled_async_probe_does_not_wedge_circuit():
+    clock = FakeClock()
+    breaker = _half_open(clock)
+    scraper = AsyncLinkedInScraper(breaker=breaker, rate_limiter=HangingLimiter())
+
+    async def cancel_probe():
+        task = asyncio.create_task(scraper.fetch_page("acme"))
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(cancel_probe())
+    assert breaker.state == OPEN
+    clock.now += 20
+    breaker.before_request()  # a new probe is let through
+
+
+def test_throttling_opens_immediately_for_retry_after():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+
+    breaker.before_request()
+    breaker.record_response(429, {"Retry-After": "90"})
+
+    assert breaker.state == OPEN
+    assert breaker.stats()["open_for_seconds"] == 90
+
+
+def test_scraper_fails_fast_after_throttling(fake_linkedin):
+    scraper = LinkedInScraper(breaker=CircuitBreaker("test"))
+
+    with pytest.raises(ScrapeError) as error:
+        scraper.scrape_page("throttled")  # 429, circuit opens
+    assert error.value.status_code == 429
+    assert scraper.breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as error:
+        scraper.scrape_page("acme")
+    assert error.value.retry_after > 100
+
+
+def test_open_circuit_serves_stored_row_or_503(client, monkeypatch):
+    from app.database import SessionLocal
+    from app.models.page import Page
+
+    db = SessionLocal()
+    db.merge(Page(id="outage-co", name="Outage Co", updated_at=datetime.utcnow() - timedelta(days=30)))
+    db.commit()
+    db.close()
+
+    breaker = CircuitBreaker("test")
+    breaker.record_failure(throttled=True, retry_after=300)
+    monkeypatch.setattr(linkedin_scraper, "linkedin_breaker", breaker)
+
+    response = client.get("/api/v1/pages/outage-co")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Outage Co"
+
+    response = client.get("/api/v1/pages/never-scraped-co")
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 299
+
+
+def test_failed_scrape_keeps_stored_row(client, fake_linkedin, monkeypatch):
+    from app.database import SessionLocal
+    from app.models.page import Page
+
+    db = SessionLocal()
+    db.merge(Page(id="throttled", name="Throttled Co", total_followers=321,
+                  updated_at=datetime.utcnow() - timedelta(days=30)))
+    db.commit()
+    db.close()
+    monkeypatch.setattr(linkedin_scraper, "linkedin_breaker", CircuitBreaker("test"))
+
+    # 429: the stored row is served as it was, not overwritten
+    response = client.get("/api/v1/pages/throttled?refresh=true")
+    assert response.status_code == 200
+    assert (response.json()["name"], response.json()["followers"]) == ("Throttled Co", 321)
+
+    monkeypatch.setattr(linkedin_scraper, "linkedin_breaker", CircuitBreaker("test"))
+    assert client.get("/api/v1/pages/missing").status_code == 404
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.cold_partition import ColdPartition
+from app.models.comment import Comment
+from app.models.post import Post
+from app.reconcile import reconcile_counters, reconcile_rollups
+from app.scrapers.linkedin_scraper import LinkedInScraper
+from app.services.cold_storage import ColdStorage, archive_old_rows
+
+from page_data import mock_page_data
+
+pytest.importorskip("pyarrow")
+
+
+def days_ago(n):
+    return (datetime.utcnow() - timedelta(days=n)).isoformat()
+
+
+def scrape_with_posts(monkeypatch, posts):
+    def scrape_page(self, page_id, stored_hash=None):
+        data = mock_page_data(self, page_id)
+        data["posts"] = [dict(post, comments=list(post.get("comments", []))) for post in posts]
+        return data
+
+    monkeypatch.setattr(LinkedInScraper, "scrape_page", scrape_page)
+
+
+def comment(comment_id, days):
+    return {"id": comment_id, "user_name": "Ann", "content": "Nice", "commented_at": days_ago(days)}
+
+
+POSTS = [
+    {"id": "cold-old", "like_count": 7, "comment_count": 1, "share_count": 2, "posted_at": days_ago(400),
+     "comments": [comment("cold-old-c1", 399)]},
+    {"id": "cold-recent", "like_count": 3, "comment_count": 2, "share_count": 0, "posted_at": days_ago(100),
+     "comments": [comment("cold-recent-c1", 95), comment("cold-recent-c2", 2)]},
+]
+
+
+def archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "post_retention_days", 365)
+    monkeypatch.setattr(settings, "comment_retention_days", 90)
+    monkeypatch.setattr(settings, "cold_storage_dir", str(tmp_path / "cold"))
+    db = SessionLocal()
+    try:
+        return archive_old_rows(db, ColdStorage(), ["cold-co"])
+    finally:
+        db.close()
+
+
+def test_old_rows_move_to_parquet(client, monkeypatch, tmp_path):
+    scrape_with_posts(monkeypatch, POSTS)
+    client.get("/api/v1/pages/cold-co")
+    engagement = client.get("/api/v1/pages/cold-co/engagement").json()
+
+    assert archive(tmp_path, monkeypatch) == {"pages": 1, "posts": 1, "comments": 2}
+
+    db = SessionLocal()
+    try:
+        assert [p.id for p in db.query(Post).filter(Post.page_id == "cold-co")] == ["cold-recent"]
+        assert {c.id for c in db.query(Comment).filter(Comment.post_id.in_(["cold-old", "cold-recent"]))} == {"cold-recent-c2"}
+        files = db.query(ColdPartition).filter(ColdPartition.page_id == "cold-co").all()
+        assert sorted((f.kind, f.row_count) for f in files) == [("comments", 1), ("comments", 1), ("posts", 1)]
+        assert all((tmp_path / "cold" / f.file).exists() for f in files)
+
+        # Archived posts still count, and reconciliation agrees
+        assert reconcile_counters(db, ["cold-co"]) == {}
+        assert reconcile_rollups(db, ["cold-co"]) == []
+    finally:
+        db.close()
+    assert client.get("/api/v1/pages/cold-co/engagement").json() == engagement
+
+    archived = client.get("/api/v1/pages/cold-co/archive/posts").json()["posts"]
+    assert [(p["id"], p["like_count"]) for p in archived] == [("cold-old", 7)]
+    comments = client.get("/api/v1/pages/cold-co/archive/comments").json()["comments"]
+    assert [c["id"] for c in comments] == ["cold-recent-c1", "cold-old-c1"]
+    assert [c["id"] for c in client.get(
+        "/api/v1/pages/cold-co/archive/comments?post_id=cold-old"
+    ).json()["comments"]] == ["cold-old-c1"]
+    start = (datetime.utcnow() - timedelta(days=200)).date()
+    assert client.get(f"/api/v1/pages/cold-co/archive/posts?start={start}").json()["posts"] == []
+
+
+def test_refresh_does_not_restore_archived_rows(client, monkeypatch, tmp_path):
+    scrape_with_posts(monkeypatch, POSTS)
+    client.get("/api/v1/pages/cold-co?refresh=true")
+    archive(tmp_path, monkeypatch)
+
+    client.get("/api/v1/pages/cold-co?refresh=true")
+
+    db = SessionLocal()
+    try:
+        assert db.get(Post, "cold-old") is None
+        assert db.get(Comment, "cold-recent-c1") is None
+        assert db.get(Comment, "cold-recent-c2") is not None
+        assert reconcile_counters(db, ["cold-co"]) == {}
+    finally:
+        db.close()
@@ -0,0 +1,76 @@
+from app.database import SessionLocal
+from app.models.page import Page
+from app.models.post import Post
+from app.models.user import SocialMediaUser
+from app.reconcile import reconcile_counters
+from app.scrapers.linkedin_scraper import LinkedInScraper
+
+from page_data import mock_page_data
+
+
+def mock_scrape(monkeypatch):
+    def scrape_page(self, page_id, stored_hash=None):
+        data = mock_page_data(self, page_id)
+        data["posts"] = [
+            {"id": f"{page_id}-post-{i}", "content": f"Post {i}", "like_count": i, "comments": []}
+            for i in range(3)
+        ]
+        data["employees"] = [{"id": f"{page_id}-emp-{i}", "name": f"Employee {i}"} for i in range(2)]
+        return data
+
+    monkeypatch.setattr(LinkedInScraper, "scrape_page", scrape_page)
+
+
+def actual_counts(db, page_id):
+    return (
+        db.query(Post).filter(Post.page_id == page_id).count(),
+        db.query(SocialMediaUser).filter(SocialMediaUser.page_id == page_id).count(),
+    )
+
+
+def test_counters_follow_scrapes(client, monkeypatch):
+    mock_scrape(monkeypatch)
+    data = client.get("/api/v1/pages/counted-co").json()
+    # A refresh upserts the same rows: the counters must not grow
+    client.get("/api/v1/pages/counted-co?refresh=true")
+
+    db = SessionLocal()
+    try:
+        page = db.get(Page, "counted-co")
+        posts, employees = actual_counts(db, "counted-co")
+        assert (posts, employees) == (3, 2)
+        assert (page.post_count, page.employee_count) == (posts, employees)
+    finally:
+        db.close()
+
+    assert (data["post_count"], data["employee_count"]) == (posts, employees)
+    assert client.get("/api/v1/pages/counted-co/employees").json()["total"] == employees
+    summary = client.get("/api/v1/pages?name=Counted Co").json()["pages"][0]
+    assert summary["post_count"] == posts
+
+
+def test_reconcile_repairs_drift(client, monkeypatch):
+    mock_scrape(monkeypatch)
+    client.get("/api/v1/pages/drifted-co")
+
+    db = SessionLocal()
+    try:
+        page = db.get(Page, "drifted-co")
+        scraped_at = page.updated_at
+        page.post_count, page.employee_count = 999, 0
+        db.commit()
+        db.query(Page).filter(Page.id == "drifted-co").update(
+            {Page.updated_at: scraped_at}, synchronize_session=False
+        )
+        db.commit()
+
+        posts, employees = actual_counts(db, "drifted-co")
+        fixed = reconcile_counters(db, ["drifted-co", "counted-co"], batch_size=1)
+        assert fixed == {"drifted-co": {"post_count": (999, posts), "employee_count": (0, employees)}}
+
+        db.expire_all()
+        page = db.get(Page, "drifted-co")
+        assert (page.post_count, page.employee_count) == (posts, employees)
+        assert page.updated_at == scraped_at
+    finally:
+        db.close()
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+from bs4 import BeautifulSoup
+
+from app.scrapers.extraction import extract_text_fields
+from app.scrapers.linkedin_scraper import LinkedInScraper
+from app.scrapers.parsers import PARSER_BACKENDS
+
+ABOUT_PAGE = """
+<html><body>
+  <h1>Acme Corp</h1>
+  <section>
+    <p>Industry: Software Development</p>
+    <p>12,345 followers</p>
+    <p>Company size: 51-200 employees</p>
+    <p>Specialties: Cloud, AI; Data Engineering, Analytics</p>
+    <p>Expertise: Consulting, services: Training</p>
+    <p>Company type: Privately Held</p>
+    <p>Founded 2014</p>
+    <p>Headquarters: Bengaluru, Karnataka</p>
+    <p>Other office: Austin, TX; Remote</p>
+  </section>
+  <div class="feed-shared-update">We are hiring across every office.</div>
+</body></html>
+"""
+
+
+def _legacy_fields(scraper, soup):
+    return {
+        "industry": scraper._extract_industry(soup),
+        "total_followers": scraper._extract_followers(soup),
+        "head_count": scraper._extract_headcount(soup),
+        "specialities": scraper._extract_specialities(soup),
+        "company_type": scraper._extract_company_type(soup),
+        "founded_year": scraper._extract_founded_year(soup),
+        "headquarters": scraper._extract_headquarters(soup),
+        "locations": scraper._extract_locations(soup),
+    }
+
+
+def test_single_pass_matches_per_field_extractors():
+    soup = BeautifulSoup(ABOUT_PAGE, "html.parser")
+    assert extract_text_fields(soup) == _legacy_fields(LinkedInScraper(), soup)
+
+
+def test_single_pass_defaults_match_per_field_extractors():
+    soup = BeautifulSoup("<html><body><p>Nothing useful here</p></body></html>", "html.parser")
+
+    random.seed(42)
+    expected = _legacy_fields(LinkedInScraper(), soup)
+    random.seed(42)
+    assert extract_text_fields(soup) == expected
+
+
+@pytest.mark.parametrize("backend", PARSER_BACKENDS)
+def test_parser_backends_extract_same_page(backend):
+    expected = LinkedInScraper(parser="html.parser").parse_page("acme", "https://example.com", ABOUT_PAGE)
+    page = LinkedInScraper(parser=backend).parse_page("acme", "https://example.com", ABOUT_PAGE)
+
+    for field in ("name", "industry", "total_followers", "head_count", "specialities",
+                  "company_type", "founded_year", "headquarters", "locations"):
+        assert page[field] == expected[field]
+    assert len(page["posts"]) == len(expected["posts"]) == 1
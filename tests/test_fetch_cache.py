@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+from app.database import SessionLocal
+from app.models.page import Page
+from app.scrapers.fetch_cache import FetchCache
+from app.scrapers.linkedin_scraper import LinkedInScraper, company_url
+
+
+def test_store_reports_changes_and_validators(tmp_path):
+    cache = FetchCache(str(tmp_path))
+    url = "https://www.linkedin.com/company/acme/"
+    assert cache.conditional_headers(url) == {}
+
+    first = cache.store(url, 200, {"ETag": '"v1"'}, b"<html>v1</html>")
+    assert first.changed
+    assert cache.conditional_headers(url) == {"If-None-Match": '"v1"'}
+
+    same = cache.store(url, 200, {"ETag": '"v1"'}, b"<html>v1</html>")
+    assert not same.changed
+    assert same.body_hash == first.body_hash
+
+    not_modified = cache.store(url, 304, {}, b"")
+    assert not not_modified.changed
+    assert not_modified.body == b"<html>v1</html>"
+
+    assert cache.store(url, 200, {"ETag": '"v2"'}, b"<html>v2</html>").changed
+
+
+def test_scraper_skips_pages_parsed_from_the_same_body(fake_linkedin):
+    scraper = LinkedInScraper()
+
+    page = scraper.scrape_page("acme")
+    assert page["name"] == "Acme"
+    assert scraper.fetch_cache.conditional_headers(company_url("acme")) == {"If-None-Match": '"acme-v1"'}
+
+    assert scraper.scrape_page("acme", stored_hash=page["content_hash"]) is None
+    # A 304 whose body was never saved to the page is parsed again
+    assert scraper.scrape_page("acme", stored_hash="0" * 64)["name"] == "Acme"
+
+
+def test_refresh_reparses_body_cached_but_not_saved(client, fake_linkedin):
+    # The fetch cache has the body, but saving its scrape failed
+    LinkedInScraper().scrape_page("hash-co")
+    db = SessionLocal()
+    db.merge(Page(id="hash-co", name="Stale", updated_at=datetime.utcnow() - timedelta(days=30)))
+    db.commit()
+    db.close()
+
+    assert client.get("/api/v1/pages/hash-co").json()["name"] == "Hash-Co"
+
+    db = SessionLocal()
+    try:
+        assert db.get(Page, "hash-co").content_hash is not None
+    finally:
+        db.close()
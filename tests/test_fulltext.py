@@ -0,0 +1,65 @@
+from app.database import SessionLocal
+from app.services.fulltext import Term, fts5_query, highlight, mysql_boolean_query, parse_query
+from app.services.page_service import PageService
+
+FTS_PAGE = {
+    "id": "fts-rocketry",
+    "name": "Fts Rocketry",
+    "description": "Reusable launch vehicles and orbital logistics",
+    "posts": [
+        {"id": "fts-post-1", "content": "We completed the static fire test of our new reusable booster engine."},
+        {"id": "fts-post-2", "content": "Hiring engineers for the booster recovery team in Texas."},
+        {"id": "fts-post-3", "content": "Quarterly results are in: revenue grew for the third year."},
+    ],
+    "employees": [],
+}
+
+
+def setup_module():
+    db = SessionLocal()
+    try:
+        service = PageService(db)
+        service._save_scraped_data(None, FTS_PAGE)
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_parse_query_supports_phrases_and_prefixes():
+    terms = parse_query('"static fire" boost* AND')
+    assert terms == [Term(("static", "fire")), Term(("boost",), prefix=True), Term(("and",))]
+    assert fts5_query(terms) == '"static fire" AND "boost"* AND "and"'
+    assert mysql_boolean_query(terms) == '+"static fire" +boost* +and'
+
+
+def test_highlight_marks_matches_in_a_window():
+    content = " ".join(f"word{i}" for i in range(40)) + " the booster landed " + " ".join(["tail"] * 40)
+    snippet = highlight(content, parse_query("boost*"), words=8)
+    assert "<mark>booster</mark>" in snippet
+    assert snippet.startswith("…") and snippet.endswith("…")
+
+
+def test_page_post_search_ranks_and_highlights(client):
+    response = client.get("/api/v1/pages/fts-rocketry/posts/search", params={"keyword": "booster"})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert {r["id"] for r in results} == {"fts-post-1", "fts-post-2"}
+    assert all("<mark>booster</mark>" in r["snippet"] for r in results)
+    assert results[0]["score"] >= results[1]["score"]
+
+    phrase = client.get("/api/v1/pages/fts-rocketry/posts/search", params={"keyword": '"static fire"'}).json()
+    assert [r["id"] for r in phrase["results"]] == ["fts-post-1"]
+
+
+def test_cross_page_post_search_with_prefix(client):
+    response = client.get("/api/v1/posts/search", params={"q": "revenu*"})
+    assert response.status_code == 200
+    assert [r["id"] for r in response.json()["results"]] == ["fts-post-3"]
+    assert response.json()["results"][0]["page_id"] == "fts-rocketry"
+
+
+def test_page_search_by_full_text_query(client):
+    data = client.get("/api/v1/pages", params={"q": "orbital logistics"}).json()
+    assert [p["id"] for p in data["pages"]] == ["fts-rocketry"]
+    assert data["total"] == 1
+    assert client.get("/api/v1/pages", params={"q": "submarines"}).json()["total"] == 0
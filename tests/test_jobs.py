@@ -0,0 +1,68 @@
+import time
+from datetime import datetime, timedelta
+
+from app.database import SessionLocal
+from app.models.job import ScrapeJob
+from app.services.job_service import JobService
+
+
+def test_bulk_scrape_job_reports_progress(client, fake_linkedin):
+    page_ids = ["job-alpha", "job-beta", "job-gamma", "missing"]
+    response = client.post("/api/v1/pages/bulk", json={"page_ids": page_ids, "concurrency": 2})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert response.json()["total"] == 4
+
+    deadline = time.monotonic() + 10
+    while True:
+        status = client.get(f"/api/v1/jobs/{job_id}").json()
+        if status["status"] in ("completed", "failed") or time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+
+    assert status["status"] == "completed"
+    assert status["processed"] == 4
+    assert status["refreshed"] == 3
+    assert status["failed"] == 1
+    assert "missing" in status["errors"]
+    assert status["pages_per_minute"] > 0
+
+    page = client.get("/api/v1/pages/job-beta").json()
+    assert page["followers"] == 4200
+
+
+def test_unknown_job_returns_404(client):
+    assert client.get("/api/v1/jobs/does-not-exist").status_code == 404
+
+
+def test_job_is_claimed_once(client):
+    db = SessionLocal()
+    try:
+        job = JobService(db).create_job(["job-alpha"])
+        assert JobService(db).claim_job(job.id)
+        assert not JobService(db).claim_job(job.id)  # a second delivery of the task
+    finally:
+        db.close()
+
+
+def test_redelivered_job_takes_over_a_stale_run(client, fake_linkedin):
+    db = SessionLocal()
+    try:
+        service = JobService(db)
+        job = service.create_job(["job-alpha", "job-beta"])
+        assert service.claim_job(job.id)
+        service.run_job(job.id)  # still running in a live worker
+        assert service.get_job(job.id).status == "running"
+
+        # The worker crashed without finishing
+        db.query(ScrapeJob).filter(ScrapeJob.id == job.id).update(
+            {ScrapeJob.heartbeat_at: datetime.utcnow() - timedelta(hours=1)}
+        )
+        db.commit()
+        service.run_job(job.id)
+
+        job = db.query(ScrapeJob).filter(ScrapeJob.id == job.id).populate_existing().first()
+        assert job.status == "completed"
+        assert job.refreshed + job.unchanged == 2
+    finally:
+        db.close()
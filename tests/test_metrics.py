@@ -0,0 +1,23 @@
+from app.metrics import Histogram
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram([1, 10, 100])
+    for value in (0.5, 5, 5, 50, 500):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"1": 1, "10": 3, "100": 4, "+Inf": 5}
+    assert snapshot["count"] == 5
+    assert snapshot["max"] == 500
+
+
+def test_metrics_endpoint_reports_pool_and_query_counts(client):
+    response = client.get("/api/v1/pages/google/posts/recent")
+    assert int(response.headers["X-DB-Queries"]) >= 1
+
+    data = client.get("/api/v1/health/metrics").json()
+    primary = data["pools"]["primary"]
+    assert primary["size"] >= 1
+    assert primary["checkout_latency_ms"]["count"] >= 1
+    assert primary["checked_out"] >= 0
+    assert data["queries_per_request"]["count"] >= 1
@@ -0,0 +1,122 @@
+from datetime import datetime
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+
+from app.scrapers.linkedin_scraper import LinkedInScraper
+from app.scrapers.parsers import parse_html
+
+POST_HTML = '<div class="feed-shared-update-v2"><p class="break-words">{}</p></div>'
+
+
+def alembic_config(url):
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+def test_dedupe_migration_collapses_refresh_copies(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrate.db'}"
+    config = alembic_config(url)
+    command.upgrade(config, "0001")
+
+    engine = create_engine(url)
+    old, new = datetime(2024, 1, 1), datetime(2024, 1, 2)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO pages (id, name) VALUES ('acme', 'Acme')"))
+        for post_id, likes, created_at in (("post_0_1700000000", 5, old), ("post_0_1700000900", 9, new)):
+            conn.execute(text(
+                "INSERT INTO posts (id, page_id, content, like_count, created_at) "
+                "VALUES (:id, 'acme', 'Hello world from Acme', :likes, :created_at)"
+            ), {"id": post_id, "likes": likes, "created_at": created_at})
+            conn.execute(text(
+                "INSERT INTO comments (id, post_id, user_profile_url, content, created_at) "
+                "VALUES (:id, :post_id, 'https://linkedin.com/in/user0', 'Nice', :created_at)"
+            ), {"id": f"comment_{post_id}_0", "post_id": post_id, "created_at": created_at})
+        conn.execute(text("INSERT INTO posts (id, page_id, content) VALUES ('urn:li:activity:1', 'acme', 'x')"))
+        for emp_id in ("emp_0_1700000000", "emp_0_1700000900"):
+            conn.execute(text(
+                "INSERT INTO social_media_users (id, page_id, profile_url, created_at) "
+                "VALUES (:id, 'acme', 'https://linkedin.com/in/employee0', :created_at)"
+            ), {"id": emp_id, "created_at": new if emp_id.endswith("900") else old})
+
+    command.upgrade(config, "0002")
+
+    scraper = LinkedInScraper()
+    soup = parse_html(POST_HTML.format("Hello world from Acme"))
+    expected_post_id = scraper._extract_posts(soup, "acme")[0]["id"]
+    with engine.connect() as conn:
+        posts = conn.execute(text("SELECT id, like_count FROM posts ORDER BY id")).all()
+        assert posts == [(expected_post_id, 9), ("urn:li:activity:1", None)]
+        comments = conn.execute(text("SELECT post_id FROM comments")).all()
+        assert comments == [(expected_post_id,)]
+        assert conn.execute(text("SELECT count(*) FROM social_media_users")).scalar() == 1
+
+
+def test_scraped_ids_are_stable_across_scrapes():
+    scraper = LinkedInScraper()
+    html = (
+        POST_HTML.format("Same post text here")
+        + POST_HTML.format("Same post text here")
+        + '<article class="feed-shared-update-v2" data-urn="urn:li:activity:7123"><p class="break-words">Other text</p></article>'
+    )
+    first = scraper._extract_posts(parse_html(html), "acme")
+    second = scraper._extract_posts(parse_html(html), "acme")
+    assert [p["id"] for p in first] == [p["id"] for p in second]
+    assert len({p["id"] for p in first}) == 3
+    assert first[2]["id"] == "urn:li:activity:7123"
+    assert scraper._extract_posts(parse_html(html), "globex")[0]["id"] != first[0]["id"]
+
+
+def test_json_lists_are_unwrapped_and_tagged(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrate.db'}"
+    config = alembic_config(url)
+    command.upgrade(config, "0010")
+
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        # What json.dumps() into a JSON column stored: a JSON string of the list
+        conn.execute(text(
+            "INSERT INTO pages (id, name, specialities, locations) VALUES "
+            "('acme', 'Acme', json_quote('[\"AI/ML\", \"Cloud\"]'), json_quote('[\"Austin, TX\"]'))"
+        ))
+        conn.execute(text("INSERT INTO posts (id, page_id, media_urls) VALUES ('p1', 'acme', json_quote('[]'))"))
+
+    command.upgrade(config, "0011")
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT specialities, locations FROM pages")).one() == (
+            '["AI/ML","Cloud"]', '["Austin, TX"]'
+        )
+        assert conn.execute(text("SELECT media_urls FROM posts")).scalar() == "[]"
+        assert conn.execute(text("SELECT kind, value FROM page_tags ORDER BY kind, value")).all() == [
+            ("location", "austin, tx"), ("speciality", "ai/ml"), ("speciality", "cloud")
+        ]
+
+
+def test_downgrades_keep_fulltext_triggers(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrate.db'}"
+    config = alembic_config(url)
+    command.upgrade(config, "head")
+    command.downgrade(config, "0005")
+
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        triggers = set(conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).scalars())
+    assert triggers == {f"{table}_fts_{event}" for table in ("posts", "pages") for event in ("ai", "ad", "au")}
+
+
+def test_baseline_holds_only_the_baseline_tables(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrate.db'}"
+    config = alembic_config(url)
+    command.upgrade(config, "0001")
+
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        tables = set(conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars())
+    assert tables - {"alembic_version"} == {"pages", "posts", "comments", "social_media_users"}
+
+    command.upgrade(config, "head")
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM scrape_jobs")).scalar() == 0
@@ -0,0 +1,84 @@
+from sqlalchemy import text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateTable
+
+from app.database import SessionLocal
+from app.models.page_tag import PageTag
+from app.scrapers.linkedin_scraper import LinkedInScraper
+from app.services.page_tags import normalize
+
+from page_data import mock_page_data
+
+
+def scrape_with_tags(monkeypatch, tags):
+    def scrape_page(self, page_id, stored_hash=None):
+        data = mock_page_data(self, page_id)
+        data["specialities"], data["locations"] = tags[page_id]
+        data["posts"] = [{"id": f"{page_id}-post", "content": "Hello"}]
+        return data
+
+    monkeypatch.setattr(LinkedInScraper, "scrape_page", scrape_page)
+
+
+TAGS = {
+    "tags-acme": (["AI/ML", "Cloud Solutions"], ["San Francisco, CA", "Remote"]),
+    "tags-globex": (["Data Analytics", "ai_ops"], ["Austin, TX"]),
+}
+
+
+def search(client, **params):
+    pages = client.get("/api/v1/pages", params=dict(params, limit=100)).json()["pages"]
+    return sorted(p["id"] for p in pages if p["id"].startswith("tags-"))
+
+
+def test_specialities_and_locations_are_stored_as_lists(client, monkeypatch):
+    scrape_with_tags(monkeypatch, TAGS)
+    details = client.get("/api/v1/pages/tags-acme").json()
+    assert details["specialities"] == ["AI/ML", "Cloud Solutions"]
+    assert details["locations"] == ["San Francisco, CA", "Remote"]
+
+    db = SessionLocal()
+    try:
+        assert db.execute(text(
+            "SELECT json_type(specialities), json_type(locations) FROM pages WHERE id = 'tags-acme'"
+        )).one() == ("array", "array")
+        assert db.execute(text(
+            "SELECT DISTINCT json_type(media_urls) FROM posts WHERE page_id = 'tags-acme'"
+        )).scalars().all() == ["array"]
+    finally:
+        db.close()
+
+
+def test_search_filters_by_speciality_and_location(client, monkeypatch):
+    tags = dict(TAGS)
+    scrape_with_tags(monkeypatch, tags)
+    for page_id in tags:
+        client.get(f"/api/v1/pages/{page_id}")
+
+    assert search(client, speciality="ai") == ["tags-acme", "tags-globex"]
+    assert search(client, speciality="AI/ML") == ["tags-acme"]
+    assert search(client, speciality="ai_") == ["tags-globex"]
+    assert search(client, location="austin") == ["tags-globex"]
+    assert search(client, speciality="cloud", location="remote") == ["tags-acme"]
+    assert search(client, speciality="cloud", location="austin") == []
+    v2 = client.get("/api/v2/pages", params={"location": "san francisco", "limit": 100}).json()["pages"]
+    assert "tags-acme" in [p["id"] for p in v2]
+
+    # A refresh replaces the page's tags
+    tags["tags-acme"] = (["Robotics"], ["Remote"])
+    client.get("/api/v1/pages/tags-acme?refresh=true")
+    assert search(client, speciality="ai") == ["tags-globex"]
+    db = SessionLocal()
+    try:
+        assert {(t.kind, t.value) for t in db.query(PageTag).filter(PageTag.page_id == "tags-acme")} == {
+            ("speciality", "robotics"), ("location", "remote")
+        }
+    finally:
+        db.close()
+
+
+def test_tag_values_compare_byte_for_byte_on_mysql():
+    ddl = str(CreateTable(PageTag.__table__).compile(dialect=mysql.dialect()))
+    assert "value VARCHAR(200) COLLATE utf8mb4_bin" in ddl
+    assert normalize("  Zürich ") != normalize("Zurich")
+    assert normalize("x" * 199 + " yz") == "x" * 199
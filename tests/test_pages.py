@@ -6,7 +6,7 @@ def test_list_pages(client):
     assert isinstance(data.get("pages"), list)
 
 
-def test_get_page_details(client):
+def test_get_page_details(client, fake_linkedin):
     response = client.get("/api/v1/pages/google")
     assert response.status_code == 200
 
@@ -18,3 +18,26 @@ def test_get_page_details(client):
     assert "name" in data
     assert "industry" in data
     assert "followers" in data
+
+
+def test_stale_page_is_served_and_refreshed_in_background(client, monkeypatch):
+    from datetime import datetime, timedelta
+    from app.database import SessionLocal
+    from app.models.page import Page
+    from app.services import page_service
+
+    db = SessionLocal()
+    db.merge(Page(id="stale-co", name="Stale Co", updated_at=datetime.utcnow() - timedelta(days=2)))
+    db.commit()
+    db.close()
+
+    scheduled = []
+    monkeypatch.setattr(page_service, "schedule_refresh", scheduled.append)
+
+    response = client.get("/api/v1/pages/stale-co")
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["name"] == "Stale Co"
+    assert data["stale"] is True
+    assert scheduled == ["stale-co"]
@@ -0,0 +1,90 @@
+from sqlalchemy import text
+
+from app.database import SessionLocal
+from app.models.page import Page
+from app.services.page_service import PageService
+from app.services.pagination import decode_cursor, encode_cursor
+
+PAGE_IDS = [f"keyset-{i:02d}" for i in range(7)]
+
+
+def setup_module():
+    db = SessionLocal()
+    try:
+        for i, page_id in enumerate(PAGE_IDS):
+            # Two pages share each follower count to exercise the id tie breaker
+            db.add(Page(id=page_id, name=f"Keyset {6 - i}", industry="Keysetting",
+                        total_followers=1000 + (i // 2) * 10))
+        db.commit()
+    finally:
+        db.close()
+
+
+def walk(client, industry="Keysetting", **params):
+    ids, cursor = [], None
+    while True:
+        query = dict(params, industry=industry, limit=3)
+        if cursor:
+            query["cursor"] = cursor
+        data = client.get("/api/v1/pages", params=query).json()
+        ids += [p["id"] for p in data["pages"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return ids, data
+
+
+def test_keyset_pages_cover_every_row_once(client):
+    ids, last = walk(client, sort="followers")
+    followers = sorted(((1000 + (i // 2) * 10, page_id) for i, page_id in enumerate(PAGE_IDS)), reverse=True)
+    assert ids == [page_id for _, page_id in followers]
+    assert last["total"] == 7
+
+    ids, _ = walk(client, sort="name", count="none")
+    assert ids == list(reversed(PAGE_IDS))
+
+
+def test_keyset_pages_include_rows_without_sort_value(client):
+    db = SessionLocal()
+    try:
+        for i, followers in enumerate([500, None, 700, None, 500]):
+            db.add(Page(id=f"keynull-{i}", name=f"Keynull {i}", industry="Keynulls", total_followers=followers))
+        db.commit()
+    finally:
+        db.close()
+
+    ids, _ = walk(client, industry="Keynulls", sort="followers")
+    assert ids == ["keynull-2", "keynull-4", "keynull-0", "keynull-3", "keynull-1"]
+
+
+def test_counts_and_offset_mode(client):
+    params = {"industry": "Keysetting", "limit": 2}
+    assert client.get("/api/v1/pages", params=dict(params, count="none")).json()["total"] is None
+    assert client.get("/api/v1/pages", params=dict(params, count="cached")).json()["total"] == 7
+    # SQLite has no planner estimate, so "estimated" falls back to an exact count
+    assert client.get("/api/v1/pages", params=dict(params, count="estimated")).json()["total"] == 7
+
+    offset = client.get("/api/v1/pages", params=dict(params, page=2)).json()
+    assert offset["page"] == 2 and len(offset["pages"]) == 2 and offset["total"] == 7
+
+
+def test_bad_cursor_is_rejected(client):
+    assert client.get("/api/v1/pages", params={"cursor": "not-a-cursor"}).status_code == 400
+    cursor = encode_cursor("name", "Keyset 3", "keyset-03")
+    assert decode_cursor(cursor) == ("name", "Keyset 3", "keyset-03")
+    response = client.get("/api/v1/pages", params={"cursor": cursor, "sort": "followers"})
+    assert response.status_code == 400
+    # Well-formed JSON with a malformed datetime value
+    for value in ({"x": 1}, {"dt": "yesterday"}):
+        cursor = encode_cursor("updated_at", value, "keyset-03")
+        assert client.get("/api/v1/pages", params={"cursor": cursor}).status_code == 400
+
+
+def test_keyset_query_uses_sort_index(client):
+    db = SessionLocal()
+    try:
+        query = PageService(db)._filtered_pages({}, rank=False).order_by(Page.name, Page.id).limit(3)
+        sql = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        plan = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        assert any("ix_pages_name_id" in row[-1] for row in plan)
+    finally:
+        db.close()
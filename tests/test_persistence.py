@@ -0,0 +1,83 @@
+from app.database import SessionLocal
+from app.models.comment import Comment
+from app.models.engagement import PageEngagement
+from app.models.page import Page
+from app.models.post import Post
+from app.services import persistence
+from app.services.page_service import PageService
+from app.services.persistence import bulk_increment, bulk_upsert
+from app.services.rollups import METRICS
+
+SCRAPED = {
+    "id": "upsert-co",
+    "name": "Upsert Co",
+    "url": "https://www.linkedin.com/company/upsert-co/",
+    "posts": [
+        {
+            "id": f"upsert-post-{i}",
+            "content": f"Post {i}",
+            "like_count": i,
+            "posted_at": "2024-01-0{}T10:00:00".format(i + 1),
+            "comments": [{"id": f"upsert-comment-{i}", "user_name": "Ann", "content": "Nice"}],
+        }
+        for i in range(3)
+    ],
+    "employees": [{"id": "upsert-emp-1", "name": "Bob", "position": "Engineer"}],
+}
+
+
+def test_refresh_is_idempotent_and_counts_rows(client):
+    db = SessionLocal()
+    try:
+        service = PageService(db)
+        page = service._save_scraped_data(None, SCRAPED)
+        db.commit()
+        assert service._save_related(page.id, SCRAPED) == {
+            "posts": {"inserted": 0, "updated": 3},
+            "comments": {"inserted": 0, "updated": 3},
+            "employees": {"inserted": 0, "updated": 1},
+        }
+        assert service.row_counts["posts"] == {"inserted": 3, "updated": 3}
+
+        refreshed = dict(SCRAPED, posts=[dict(SCRAPED["posts"][0], like_count=99, comments=[])])
+        service._save_scraped_data(page, refreshed)
+        db.commit()
+        assert db.query(Post).filter(Post.page_id == "upsert-co").count() == 3
+        assert db.query(Post).filter(Post.id == "upsert-post-0").one().like_count == 99
+        assert db.query(Comment).filter(Comment.post_id == "upsert-post-0").count() == 1
+    finally:
+        db.close()
+
+
+def test_bulk_upsert_batches_and_collapses_duplicate_keys(client):
+    db = SessionLocal()
+    try:
+        rows = [{"id": f"batch-post-{i % 5}", "content": str(i)} for i in range(7)]
+        assert bulk_upsert(db, Post, rows, ["content"], batch_size=2) == {"inserted": 5, "updated": 0}
+        assert db.query(Post).filter(Post.id == "batch-post-1").one().content == "6"
+        db.rollback()
+    finally:
+        db.close()
+
+
+def test_dialects_without_native_upsert_select_then_write(client, monkeypatch):
+    monkeypatch.setattr(persistence, "UPSERT_DIALECTS", ())
+    db = SessionLocal()
+    try:
+        db.add(Page(id="generic-co", name="Generic Co"))
+        rows = [{"id": f"generic-post-{i}", "page_id": "generic-co", "content": "old"} for i in range(2)]
+        assert bulk_upsert(db, Post, rows, ["content"]) == {"inserted": 2, "updated": 0}
+        rows = [{"id": f"generic-post-{i}", "page_id": "generic-co", "content": "new"} for i in range(1, 3)]
+        assert bulk_upsert(db, Post, rows, ["content"]) == {"inserted": 1, "updated": 1}
+        assert [post.content for post in db.query(Post).filter(Post.page_id == "generic-co").order_by(Post.id)] == [
+            "old", "new", "new"
+        ]
+
+        totals = {"page_id": "generic-co", "posts": 2, "likes": 5, "comments": 0, "shares": 1}
+        bulk_increment(db, PageEngagement, [totals], METRICS)
+        bulk_increment(db, PageEngagement, [totals], METRICS)
+        stored = db.get(PageEngagement, "generic-co")
+        assert (stored.posts, stored.likes, stored.shares) == (4, 10, 2)
+        db.rollback()
+    finally:
+        db.close()
@@ -0,0 +1,96 @@
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.services.page_service import PageService
+from app.services.post_service import PostService
+from app.services.user_service import UserService
+
+# SQLite reports a full table scan as "SCAN <table>" (without "USING ... INDEX")
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+@pytest.fixture
+def captured_queries(tmp_path):
+    """Run service queries on a scratch SQLite database, collecting each SELECT"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    Base.metadata.create_all(engine)
+    queries = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            queries.append((statement, parameters))
+
+    db = sessionmaker(bind=engine)()
+    yield db, queries, engine
+    db.close()
+
+
+def full_scans(engine, queries):
+    scans = []
+    with engine.connect() as conn:
+        for statement, parameters in queries:
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            for row in plan:
+                match = FULL_SCAN.match(row[-1])
+                if match:
+                    scans.append((match.group(1), statement))
+    return scans
+
+
+def test_service_queries_use_indexes(captured_queries):
+    db, queries, engine = captured_queries
+    now = datetime.utcnow()
+
+    posts = PostService(db)
+    posts.get_recent_posts("acme")
+    posts.get_posts_by_date_range("acme", now - timedelta(days=7), now)
+    posts.get_top_performing_posts("acme")
+    posts.get_top_posts_all_pages()
+    posts.get_post_engagement_stats("acme")
+    posts.search_posts("acme", "launch")
+
+    users = UserService(db)
+    users.get_page_employees("acme")
+    users.get_employee_by_position("acme", "engineer")
+    users.get_employee_distribution("acme")
+    users.search_employees("acme", "ann")
+    users.get_total_employee_count("acme")
+    users.get_recently_added_employees("acme")
+
+    pages = PageService(db)
+    pages.search_pages({"min_followers": 1000})
+    pages.search_pages({"speciality": "ai", "location": "austin"})
+    pages.get_page_posts("acme")
+
+    assert len(queries) >= 13
+    assert full_scans(engine, queries) == []
+
+
+def test_comment_query_of_posts_with_comments_uses_index(captured_queries):
+    db, queries, engine = captured_queries
+    db.execute(text("INSERT INTO pages (id, name) VALUES ('acme', 'Acme')"))
+    db.execute(text("INSERT INTO posts (id, page_id, posted_at) VALUES ('p1', 'acme', '2024-01-01')"))
+    PostService(db).get_posts_with_comments("acme")
+
+    assert any("FROM comments" in statement for statement, _ in queries)
+    assert full_scans(engine, queries) == []
+
+
+def test_top_posts_read_in_index_order(captured_queries):
+    db, queries, engine = captured_queries
+    db.execute(text("INSERT INTO pages (id, name) VALUES ('acme', 'Acme')"))
+    posts = PostService(db)
+    posts.get_top_performing_posts("acme")
+    posts.get_top_posts_all_pages()
+
+    with engine.connect() as conn:
+        for statement, parameters in queries:
+            if "engagement_score" in statement:
+                plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+                assert not any("TEMP B-TREE" in row[-1] for row in plan), plan
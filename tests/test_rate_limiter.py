@@ -0,0 +1,74 @@
+import time
+import uuid
+
+import pytest
+
+from app.scrapers import rate_limiter
+from app.scrapers.rate_limiter import TokenBucketLimiter
+
+
+def _limiter(rate, capacity):
+    return TokenBucketLimiter(rate=rate, capacity=capacity, prefix=f"test-{uuid.uuid4().hex}")
+
+
+def test_non_blocking_acquire_respects_burst():
+    limiter = _limiter(rate=1, capacity=2)
+
+    assert limiter.acquire("example.com", blocking=False)
+    assert limiter.acquire("example.com", blocking=False)
+    assert not limiter.acquire("example.com", blocking=False)
+    # Buckets are per host
+    assert limiter.acquire("other.example.com", blocking=False)
+
+
+def test_blocking_acquire_waits_for_refill():
+    limiter = _limiter(rate=20, capacity=1)
+    assert limiter.acquire("example.com")
+
+    start = time.monotonic()
+    assert limiter.acquire("example.com", timeout=1)
+    assert time.monotonic() - start >= 0.03
+
+
+def test_acquire_gives_up_after_timeout():
+    limiter = _limiter(rate=0.1, capacity=1)
+    assert limiter.acquire("example.com")
+    assert not limiter.acquire("example.com", timeout=0.1)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """The limiter talking to an in-memory Redis that runs its Lua script"""
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(rate_limiter, "get_redis", lambda: client)
+
+    def no_fallback(self, key, tokens):
+        raise AssertionError("used the local bucket instead of Redis")
+
+    monkeypatch.setattr(TokenBucketLimiter, "_local_try_acquire", no_fallback)
+    return client
+
+
+def test_redis_bucket_allows_the_burst_then_refills(fake_redis):
+    limiter = _limiter(rate=20, capacity=2)
+
+    assert limiter.try_acquire("example.com") == 0
+    assert limiter.try_acquire("example.com") == 0
+    wait = limiter.try_acquire("example.com")
+    assert 0 < wait <= 0.05
+    assert float(fake_redis.hget(f"{limiter.prefix}:example.com", "tokens")) < 1
+
+    time.sleep(wait + 0.01)
+    assert limiter.try_acquire("example.com") == 0
+    assert limiter.try_acquire("example.com") > 0
+
+
+def test_redis_buckets_are_per_host(fake_redis):
+    limiter = _limiter(rate=0.1, capacity=1)
+
+    assert limiter.try_acquire("example.com") == 0
+    assert limiter.try_acquire("example.com") > 0
+    assert limiter.try_acquire("other.example.com") == 0
+    # Another limiter (process) with the same prefix shares the host's bucket
+    assert TokenBucketLimiter(rate=0.1, capacity=1, prefix=limiter.prefix).try_acquire("example.com") > 0
@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import database
+from app.database import Base, SessionLocal
+from app.models.page import Page
+from app.models.post import Post
+from app.scrapers.async_scraper import ScrapeResult
+from app.services import read_your_writes
+from app.services.page_service import PageService
+from app.services.read_your_writes import mark_written
+
+
+@pytest.fixture
+def primary_and_replica(tmp_path, monkeypatch):
+    """Two SQLite files standing in for a primary and its (lagging) replica"""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine in (primary, replica):
+        Base.metadata.create_all(engine)
+    monkeypatch.setattr(database, "engine", primary)
+    monkeypatch.setattr(database, "replica_engines", [replica])
+    monkeypatch.setattr(read_your_writes, "_written", {})
+    yield primary, replica
+
+
+def test_reads_use_the_replica_and_writes_the_primary(primary_and_replica):
+    primary, replica = primary_and_replica
+    with sessionmaker(bind=replica)() as seed:
+        seed.add(Page(id="routed-co", name="Replica copy"))
+        seed.commit()
+
+    db = SessionLocal()
+    try:
+        assert db.query(Page).filter(Page.id == "routed-co").one().name == "Replica copy"
+        summary = PageService(db).save_results([ScrapeResult("routed-co", {"id": "routed-co", "name": "Fresh"})])
+        assert summary["refreshed"] == ["routed-co"]
+    finally:
+        db.close()
+
+    with sessionmaker(bind=primary)() as check:
+        assert check.query(Page).filter(Page.id == "routed-co").one().name == "Fresh"
+    with sessionmaker(bind=replica)() as check:
+        assert check.query(Page).filter(Page.id == "routed-co").one().name == "Replica copy"
+
+
+def test_recent_writes_are_read_from_the_primary(client, primary_and_replica):
+    primary, replica = primary_and_replica
+    with sessionmaker(bind=primary)() as seed:
+        seed.add(Page(id="sticky-co", name="Sticky"))
+        seed.add(Post(id="sticky-post", page_id="sticky-co", content="Only on the primary so far"))
+        seed.commit()
+
+    url = "/api/v1/pages/sticky-co/posts/recent"
+    assert client.get(url).json()["recent_posts"] == []  # replica has not caught up
+
+    mark_written(["sticky-co"])
+    posts = client.get(url).json()["recent_posts"]
+    assert [p["id"] for p in posts] == ["sticky-post"]
+    assert client.get("/api/v1/pages/other-co/posts/recent").json()["recent_posts"] == []
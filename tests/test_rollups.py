@@ -0,0 +1,87 @@
+from datetime import date, datetime, timedelta
+
+from app.database import SessionLocal
+from app.models.engagement import PageEngagement, PageEngagementDaily
+from app.reconcile import reconcile_rollups
+from app.scrapers.linkedin_scraper import LinkedInScraper
+from app.services.rollups import engagement_deltas
+
+from page_data import mock_page_data
+
+
+def scrape_with_posts(monkeypatch, posts):
+    def scrape_page(self, page_id, stored_hash=None):
+        data = mock_page_data(self, page_id)
+        data["posts"] = [dict(post, comments=[]) for post in posts]
+        return data
+
+    monkeypatch.setattr(LinkedInScraper, "scrape_page", scrape_page)
+
+
+def days_ago(n):
+    return (datetime.utcnow() - timedelta(days=n)).isoformat()
+
+
+def test_engagement_reads_incremental_rollups(client, monkeypatch):
+    posts = [
+        {"id": "rollup-new", "like_count": 10, "comment_count": 2, "share_count": 1, "posted_at": days_ago(1)},
+        {"id": "rollup-month", "like_count": 20, "comment_count": 4, "share_count": 0, "posted_at": days_ago(20)},
+        {"id": "rollup-old", "like_count": 30, "comment_count": 0, "share_count": 3, "posted_at": days_ago(200)},
+    ]
+    scrape_with_posts(monkeypatch, posts)
+    client.get("/api/v1/pages/rollup-co")
+
+    engagement = client.get("/api/v1/pages/rollup-co/engagement").json()["engagement"]
+    assert engagement["total_posts"] == 3
+    assert engagement["total_likes"] == 60
+    assert engagement["average_likes"] == 20.0
+
+    week = client.get("/api/v1/pages/rollup-co/engagement?days=7").json()
+    assert week["days"] == 7
+    assert week["engagement"]["total_likes"] == 10
+    assert client.get("/api/v1/pages/rollup-co/engagement?days=30").json()["engagement"]["total_posts"] == 2
+
+    # A refresh moves the rollups by the change only
+    posts[0]["like_count"] = 15
+    posts[1]["posted_at"] = days_ago(3)
+    scrape_with_posts(monkeypatch, posts)
+    client.get("/api/v1/pages/rollup-co?refresh=true")
+
+    week = client.get("/api/v1/pages/rollup-co/engagement?days=7").json()["engagement"]
+    assert (week["total_posts"], week["total_likes"]) == (2, 35)
+    assert client.get("/api/v1/pages/rollup-co/engagement").json()["engagement"]["total_likes"] == 65
+    assert client.get("/api/v2/pages/rollup-co/engagement?days=7").json()["engagement"] == week
+
+
+def test_engagement_deltas_move_a_post_between_days():
+    old = {"p": {"id": "p", "page_id": "a", "posted_at": datetime(2024, 1, 1, 9),
+                 "like_count": 5, "comment_count": 1, "share_count": 0}}
+    new = [{"id": "p", "page_id": "a", "posted_at": datetime(2024, 1, 2, 9),
+            "like_count": 7, "comment_count": 1, "share_count": 0}]
+
+    assert engagement_deltas(old, new) == {
+        ("a", date(2024, 1, 1)): [-1, -5, -1, 0],
+        ("a", date(2024, 1, 2)): [1, 7, 1, 0],
+    }
+
+
+def test_reconcile_rebuilds_drifted_rollups(client, monkeypatch):
+    scrape_with_posts(monkeypatch, [
+        {"id": "drift-post", "like_count": 4, "comment_count": 1, "share_count": 1, "posted_at": days_ago(2)},
+    ])
+    client.get("/api/v1/pages/rollup-drift")
+    expected = client.get("/api/v1/pages/rollup-drift/engagement").json()
+
+    db = SessionLocal()
+    try:
+        db.query(PageEngagementDaily).filter(PageEngagementDaily.page_id == "rollup-drift").delete()
+        db.query(PageEngagement).filter(PageEngagement.page_id == "rollup-drift").update({PageEngagement.likes: 99})
+        db.commit()
+
+        assert reconcile_rollups(db, ["rollup-drift", "rollup-co"]) == ["rollup-drift"]
+        assert reconcile_rollups(db, ["rollup-drift"]) == []
+    finally:
+        db.close()
+
+    assert client.get("/api/v1/pages/rollup-drift/engagement").json() == expected
+    assert client.get("/api/v1/pages/rollup-drift/engagement?days=7").json()["engagement"]["total_likes"] == 4
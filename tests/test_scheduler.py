@@ -0,0 +1,22 @@
+import heapq
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.scheduler import build_refresh_queue
+
+
+def test_refresh_queue_prioritises_hot_pages_before_they_go_stale():
+    now = datetime.utcnow()
+    soft_ttl = timedelta(seconds=settings.page_soft_ttl)
+    pages = [
+        ("hot-nearly-stale", now - soft_ttl * 0.9),
+        ("cold-stale", now - soft_ttl * 1.5),
+        ("cold-nearly-stale", now - soft_ttl * 0.9),
+        ("hot-fresh", now - soft_ttl * 0.1),
+    ]
+    scores = {"hot-nearly-stale": 20.0, "hot-fresh": 50.0}
+
+    queue = build_refresh_queue(pages, scores, now)
+    order = [heapq.heappop(queue)[1] for _ in range(len(queue))]
+
+    assert order == ["hot-nearly-stale", "cold-stale"]
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+import pytest
+from pydantic import ValidationError
+
+from app.config import Settings, settings
+from app.database import SessionLocal
+from app.models.post import Post
+from app.scrapers.linkedin_scraper import LinkedInScraper
+from app.services.post_service import PostService
+from app.services.scoring import WEIGHTS_KEY, rescore_flight, rescore_if_outdated
+
+from page_data import mock_page_data
+
+
+def scrape_with_posts(monkeypatch, posts):
+    def scrape_page(self, page_id, stored_hash=None):
+        data = mock_page_data(self, page_id)
+        data["posts"] = [dict(post, id=f"{page_id}-{post['id']}", comments=[]) for post in posts]
+        return data
+
+    monkeypatch.setattr(LinkedInScraper, "scrape_page", scrape_page)
+
+
+def days_ago(n):
+    return (datetime.utcnow() - timedelta(days=n)).isoformat()
+
+
+def test_top_posts_by_stored_score(client, monkeypatch):
+    scrape_with_posts(monkeypatch, [
+        {"id": "likes", "like_count": 9_000_000, "comment_count": 0, "share_count": 0, "posted_at": days_ago(1)},
+        {"id": "shares", "like_count": 0, "comment_count": 0, "share_count": 4_000_000, "posted_at": days_ago(2)},
+        {"id": "old", "like_count": 50_000_000, "comment_count": 0, "share_count": 0, "posted_at": days_ago(100)},
+    ])
+    client.get("/api/v1/pages/score-a")
+    scrape_with_posts(monkeypatch, [
+        {"id": "comments", "like_count": 0, "comment_count": 5_000_000, "share_count": 0, "posted_at": days_ago(3)},
+    ])
+    client.get("/api/v1/pages/score-b")
+
+    top = client.get("/api/v1/pages/score-a/top-posts").json()["top_posts"]
+    assert [post["id"] for post in top] == ["score-a-shares", "score-a-likes"]
+    assert top[0]["engagement_score"] == 12_000_000
+
+    everywhere = client.get("/api/v1/posts/top?limit=3").json()
+    assert [post["id"] for post in everywhere["top_posts"]] == ["score-a-shares", "score-b-comments", "score-a-likes"]
+    assert client.get("/api/v2/posts/top?limit=3").json() == everywhere
+    yearly = client.get("/api/v1/posts/top?limit=1&days=365").json()["top_posts"]
+    assert [post["id"] for post in yearly] == ["score-a-old"]
+
+    db = SessionLocal()
+    try:
+        # One page per query: later pages are only asked for posts beating the heap
+        merged = PostService(db).get_top_posts_all_pages(limit=3, pages_per_query=1)
+        assert [post.id for post in merged] == [post["id"] for post in everywhere["top_posts"]]
+    finally:
+        db.close()
+
+
+def test_scores_follow_weight_changes(client, monkeypatch):
+    scrape_with_posts(monkeypatch, [
+        {"id": "p", "like_count": 10, "comment_count": 1, "share_count": 1, "posted_at": days_ago(1)},
+    ])
+    client.get("/api/v1/pages/score-weights")
+
+    def score():
+        db = SessionLocal()
+        try:
+            return db.get(Post, "score-weights-p").engagement_score
+        finally:
+            db.close()
+
+    db = SessionLocal()
+    try:
+        rescore_if_outdated(db)
+        assert score() == 15
+        assert rescore_if_outdated(db) is None
+
+        monkeypatch.setattr(settings, "engagement_share_weight", 10.0)
+        assert rescore_if_outdated(db) > 0
+        assert score() == 22
+
+        monkeypatch.undo()
+        assert rescore_if_outdated(db) > 0
+        assert score() == 15
+    finally:
+        db.close()
+
+
+def test_only_one_process_rescores(client, monkeypatch):
+    scrape_with_posts(monkeypatch, [
+        {"id": "p", "like_count": 10, "comment_count": 1, "share_count": 1, "posted_at": days_ago(1)},
+    ])
+    client.get("/api/v1/pages/score-lease")
+    monkeypatch.setattr(settings, "engagement_like_weight", 5.0)
+
+    db = SessionLocal()
+    try:
+        with rescore_flight.try_lead(WEIGHTS_KEY) as leader:
+            assert leader
+            assert rescore_if_outdated(db) is None  # another worker holds the lease
+        assert rescore_if_outdated(db) > 0
+        assert db.get(Post, "score-lease-p").engagement_score == 55
+    finally:
+        db.close()
+
+
+def test_negative_weights_are_rejected():
+    with pytest.raises(ValidationError):
+        Settings(engagement_share_weight=-1)
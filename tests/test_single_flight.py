@@ -0,0 +1,53 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.scrapers.linkedin_scraper import LinkedInScraper
+from app.services.single_flight import SingleFlight
+
+from page_data import mock_page_data
+
+
+def test_only_one_concurrent_caller_leads():
+    flight = SingleFlight("test-flight")
+    leaders = []
+
+    def call():
+        with flight.lead("acme") as leader:
+            if leader:
+                leaders.append(threading.get_ident())
+                time.sleep(0.2)
+        return leader
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        results = list(pool.map(lambda _: call(), range(5)))
+
+    assert results.count(True) == 1
+    assert len(leaders) == 1
+
+
+def test_concurrent_requests_share_one_scrape(monkeypatch):
+    from app.database import SessionLocal
+    from app.services.page_service import PageService
+
+    calls = []
+
+    def slow_scrape(self, page_id, stored_hash=None):
+        calls.append(page_id)
+        time.sleep(0.3)
+        return mock_page_data(self, page_id)
+
+    monkeypatch.setattr(LinkedInScraper, "scrape_page", slow_scrape)
+
+    def request():
+        db = SessionLocal()
+        try:
+            return PageService(db).get_or_scrape_page("burst-company").id
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        page_ids = list(pool.map(lambda _: request(), range(6)))
+
+    assert page_ids == ["burst-company"] * 6
+    assert calls == ["burst-company"]
@@ -0,0 +1,96 @@
+from datetime import datetime, time, timedelta
+
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateTable
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.app_state import AppState
+from app.models.snapshot import PageSnapshot
+from app.scrapers.linkedin_scraper import LinkedInScraper
+from app.services.snapshots import COMPACTED_KEY, compact_snapshots, record_snapshot
+
+from page_data import mock_page_data
+
+
+def scrape_with_followers(monkeypatch, followers):
+    def scrape_page(self, page_id, stored_hash=None):
+        data = mock_page_data(self, page_id)
+        data["total_followers"] = followers
+        data["posts"] = [{"id": f"{page_id}-post", "like_count": followers // 100, "comments": []}]
+        return data
+
+    monkeypatch.setattr(LinkedInScraper, "scrape_page", scrape_page)
+
+
+def test_every_refresh_adds_a_snapshot_to_the_trends(client, monkeypatch):
+    scrape_with_followers(monkeypatch, 1000)
+    client.get("/api/v1/pages/trend-co")
+    scrape_with_followers(monkeypatch, 1500)
+    client.get("/api/v1/pages/trend-co?refresh=true")
+
+    trends = client.get("/api/v1/pages/trend-co/trends?days=7").json()
+    assert [point["followers"] for point in trends["points"]] == [1000, 1500]
+    assert trends["growth"]["followers"]["change"] == 500
+    assert trends["growth"]["followers"]["change_pct"] == 50.0
+    assert (trends["growth"]["likes"]["start"], trends["growth"]["likes"]["end"]) == (10, 15)
+    assert trends["growth"]["posts"]["change"] == 0
+    assert client.get("/api/v2/pages/trend-co/trends?days=7").json() == trends
+    assert client.get("/api/v1/pages/no-such-page/trends").status_code == 404
+
+
+def test_compaction_keeps_the_last_snapshot_of_each_old_day(client, monkeypatch):
+    scrape_with_followers(monkeypatch, 10)
+    client.get("/api/v1/pages/compact-co")
+    today = datetime.utcnow().date()
+
+    def at(days_ago, hour):
+        return datetime.combine(today - timedelta(days=days_ago), time(hour))
+
+    old_day = [at(90, 8), at(90, 14), at(90, 20)]
+    kept = [at(89, 9), at(5, 8), at(5, 9)]
+
+    db = SessionLocal()
+    try:
+        db.query(AppState).filter(AppState.key == COMPACTED_KEY).delete()
+        for taken_at in old_day + kept + [at(800, 8)]:
+            record_snapshot(db, "compact-co", taken_at)
+        db.commit()
+
+        monkeypatch.setattr(settings, "snapshot_keep_days", 700)
+        assert compact_snapshots(db) == {"merged": 2, "expired": 1}
+
+        remaining = [row.taken_at for row in db.query(PageSnapshot.taken_at).filter(
+            PageSnapshot.page_id == "compact-co", PageSnapshot.taken_at < at(0, 0)
+        ).order_by(PageSnapshot.taken_at)]
+        assert remaining == [old_day[-1]] + kept
+        # Days already compacted are not read again
+        record_snapshot(db, "compact-co", at(90, 21))
+        db.commit()
+        assert compact_snapshots(db) == {"merged": 0, "expired": 0}
+    finally:
+        db.query(AppState).filter(AppState.key == COMPACTED_KEY).delete()
+        db.commit()
+        db.close()
+
+
+def test_same_page_saved_twice_in_one_second(client, monkeypatch):
+    assert "taken_at DATETIME(6)" in str(CreateTable(PageSnapshot.__table__).compile(dialect=mysql.dialect()))
+
+    scrape_with_followers(monkeypatch, 200)
+    client.get("/api/v1/pages/twice-co")
+    # What two saves within a second look like once MySQL rounds to seconds
+    taken_at = datetime.utcnow().replace(microsecond=0)
+    db = SessionLocal()
+    try:
+        record_snapshot(db, "twice-co", taken_at)
+        db.commit()
+        scrape_with_followers(monkeypatch, 300)
+        client.get("/api/v1/pages/twice-co?refresh=true")
+        record_snapshot(db, "twice-co", taken_at)
+        db.commit()
+        assert db.query(PageSnapshot.followers).filter(
+            PageSnapshot.page_id == "twice-co", PageSnapshot.taken_at == taken_at
+        ).all() == [(300,)]
+    finally:
+        db.close()